@@ -0,0 +1,78 @@
+"""
+instances.py
+Generator instance cutting stock sintetis yang deterministik (seeded).
+
+Jenis instance:
+- "uniform" : gaya CUTGEN (Gau & Wäscher): panjang part uniform di [v1*L, v2*L],
+              demand uniform 1..max_demand, satu panjang stock L.
+- "triplet" : gaya Falkenauer: tiap triplet berisi 3 part yang totalnya tepat L,
+              sehingga solusi optimal = jumlah triplet (tanpa waste).
+- "8sw"     : meniru test_data/8SW_*.csv: panjang part 500..5600 (mayoritas
+              2600..5000), quantity kebanyakan 2 dengan sedikit 4/6/14,
+              satu stock 5800 dengan stok 1000.
+
+Semua panjang sudah dalam integer (unit_scale = 1), sama seperti hasil csv_repository.
+"""
+
+import random
+from core.entities import Parts, Stock
+
+INSTANCE_KINDS = ("uniform", "triplet", "8sw")
+
+
+def generate_instance(kind, n_parts, seed=0):
+    """Return (required_parts_aggregated, stocks_aggregated) untuk jenis `kind`."""
+    rng = random.Random(seed)
+    if kind == "uniform":
+        return _uniform(rng, n_parts)
+    if kind == "triplet":
+        return _triplet(rng, n_parts)
+    if kind == "8sw":
+        return _eight_sw(rng, n_parts)
+    raise ValueError(f"Unknown instance kind: {kind!r} (choose from {INSTANCE_KINDS})")
+
+
+def _uniform(rng, n_parts, stock_length=1000, v1=0.1, v2=0.5, max_demand=20):
+    lengths = set()
+    while len(lengths) < n_parts:
+        lengths.add(rng.randint(int(v1 * stock_length), int(v2 * stock_length)))
+    parts = [Parts(f"U{i:03d}", length, rng.randint(1, max_demand))
+             for i, length in enumerate(sorted(lengths, reverse=True))]
+    return parts, [Stock(stock_length, 1000)]
+
+
+def _triplet(rng, n_triplets, stock_length=1000):
+    # part pertama 380..490, kedua 250..(sisa-250), ketiga menutup sisa tepat L
+    quantities = {}
+    for _ in range(n_triplets):
+        a = rng.randint(380, 490)
+        b = rng.randint(250, min(stock_length - a - 250, 490))
+        c = stock_length - a - b
+        for length in (a, b, c):
+            quantities[length] = quantities.get(length, 0) + 1
+    parts = [Parts(f"T{i:03d}", length, qty)
+             for i, (length, qty) in enumerate(sorted(quantities.items(), reverse=True))]
+    return parts, [Stock(stock_length, 1000)]
+
+
+def _eight_sw(rng, n_parts, stock_length=5800):
+    lengths = set()
+    while len(lengths) < n_parts:
+        if rng.random() < 0.75:
+            lengths.add(rng.randint(2600, 5000))
+        else:
+            lengths.add(rng.randint(500, 5600))
+    quantity_choices = [2] * 43 + [6] * 4 + [1] * 2 + [4] * 2 + [3, 14]
+    parts = [Parts(f"L{i:03d}_ST", length, rng.choice(quantity_choices))
+             for i, length in enumerate(sorted(lengths, reverse=True))]
+    return parts, [Stock(stock_length, 1000)]
+
+
+# Instance yang dipakai suite benchmark: nama -> (kind, n_parts, seed).
+# Ukurannya dijaga kecil supaya suite tetap jalan dalam hitungan detik di CPU biasa.
+BENCHMARK_INSTANCES = {
+    "uniform_20": ("uniform", 20, 1),
+    "uniform_40": ("uniform", 40, 2),
+    "triplet_20": ("triplet", 20, 3),
+    "8sw_53": ("8sw", 53, 4),
+}
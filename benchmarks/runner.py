@@ -0,0 +1,276 @@
+"""
+runner.py
+Jalankan suite benchmark ColumnGeneration, tulis hasil JSON, bandingkan dengan baseline.
+
+    python -m benchmarks.runner                     # jalankan + bandingkan dengan baseline.json
+    python -m benchmarks.runner --update-baseline   # simpan hasil sebagai baseline baru
+
+Metric per instance:
+- wall_time        : total strategy.optimize (detik)
+- lp_iterations    : jumlah solve RMP (LP relax)
+- pricing_calls    : jumlah pricing knapsack fase LP (= lp_iterations + mispricings dual smoothing)
+- master_time      : total waktu solve RMP
+- pricing_time     : total waktu knapsack pricing
+- integer_time     : total waktu integer master (CBC), integer_attempts = jumlah solve
+- peak_memory_mb   : puncak alokasi Python (tracemalloc, run terpisah; proses CBC tidak terhitung)
+- lp_objective / integer_objective / gap_rel : bound LP vs hasil integer (dalam cost = panjang stock)
+- bars             : jumlah batang stock yang dipakai
+- dp_capacity      : kapasitas tabel DP pricing setelah capacity compression (ukuran DP efektif)
+
+Memori input (`--entity-memory`): MB per juta baris parts untuk list dataclass
+(tanpa / dengan __slots__) vs PartTable kolom, diukur dengan tracemalloc.
+
+Waktu di-normalisasi dengan `calibration` (waktu workload tetap di mesin yang sama),
+supaya baseline yang direkam di mesin lain tetap bisa dibandingkan.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+from benchmarks.instances import BENCHMARK_INSTANCES, generate_instance
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, "baseline.json")
+RESULTS_PATH = os.path.join(BENCHMARK_DIR, "results", "latest.json")
+
+DEFAULT_THRESHOLD = 0.5      # regresi bila > 50% lebih buruk dari baseline
+MIN_TIME_DELTA = 0.05        # selisih waktu di bawah ini (detik) dianggap noise
+MIN_MEMORY_DELTA_MB = 1.0
+
+TIME_METRICS = ("wall_time", "master_time", "pricing_time", "integer_time")
+
+
+def _default_strategy():
+    from core.optimizer_strategy import ColumnGeneration
+    return ColumnGeneration()
+
+
+def calibration_time(repeats=3):
+    """Waktu (detik, minimum dari beberapa ulangan) untuk workload DP Python yang tetap."""
+    from core.optimizer_strategy.knapsack import build_knapsack_table_python
+    weights = [97 + 13 * i for i in range(30)]
+    values = [w * 1.01 for w in weights]
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        build_knapsack_table_python(values, weights, 6000)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def entity_memory_mb(n_rows=1_000_000, n_types=5000):
+    """
+    Memori resident (MB, tracemalloc) untuk n_rows baris parts per representasi, dibangun
+    dari kolom yang sama (seperti hasil load_required_parts_columns), termasuk object
+    string part_type per baris untuk list dataclass.
+    """
+    import dataclasses
+    import numpy as np
+    from core.entities import Parts, PartTable
+    # Parts versi lama (@dataclass biasa, dengan __dict__ per object)
+    DictParts = dataclasses.make_dataclass("DictParts", [("part_type", str), ("length", int), ("quantity", int)])
+
+    i = np.arange(n_rows)
+    lengths, quantities = 1000 + i % 4000, 1 + i % 7
+    part_types = [f"P{k:05d}" for k in (i % n_types).tolist()]
+
+    builders = {
+        "dataclass": lambda: [DictParts(t, int(length), int(q)) for t, length, q
+                              in zip(part_types, lengths.tolist(), quantities.tolist())],
+        "dataclass_slots": lambda: [Parts(t, int(length), int(q)) for t, length, q
+                                    in zip(part_types, lengths.tolist(), quantities.tolist())],
+        # kolom angka disalin di dalam pengukuran (array loader menjadi milik tabel)
+        "part_table": lambda: PartTable.from_columns(part_types, lengths.copy(), quantities.copy()),
+    }
+    scale = 1_000_000 / n_rows
+    results = {}
+    for name, build in builders.items():
+        tracemalloc.start()
+        try:
+            data = build()
+            results[name] = tracemalloc.get_traced_memory()[0] / 1e6 * scale
+        finally:
+            tracemalloc.stop()
+        del data
+    # list part_type dibuat di luar pengukuran, jadi string per baris list dataclass tidak terhitung:
+    # tambahkan supaya sebanding dengan hasil loader (tabel hanya menyimpan type unik)
+    strings = sum(sys.getsizeof(t) for t in part_types) + sys.getsizeof(part_types)
+    for name in ("dataclass", "dataclass_slots"):
+        results[name] += strings / 1e6 * scale
+    return results
+
+
+def run_instance(name, strategy_factory=_default_strategy, measure_memory=True):
+    """Solve satu instance dari BENCHMARK_INSTANCES; return dict metric."""
+    kind, n_parts, seed = BENCHMARK_INSTANCES[name]
+    parts, stocks = generate_instance(kind, n_parts, seed)
+
+    strategy = strategy_factory()
+    t0 = time.perf_counter()
+    patterns, x_values, x_int = strategy.optimize(parts, stocks)
+    wall_time = time.perf_counter() - t0
+    stats = dict(getattr(strategy, "last_stats", {}))
+
+    peak_memory_mb = None
+    if measure_memory:
+        # run kedua di bawah tracemalloc (overhead tracemalloc tidak boleh masuk ke timing)
+        tracemalloc.start()
+        try:
+            strategy_factory().optimize(parts, stocks)
+            peak_memory_mb = tracemalloc.get_traced_memory()[1] / 1e6
+        finally:
+            tracemalloc.stop()
+
+    lp_objective = stats.get("lp_objective")
+    integer_objective = stats.get("integer_objective")
+    gap_rel = None
+    if lp_objective and integer_objective is not None:
+        gap_rel = (integer_objective - lp_objective) / lp_objective
+
+    return {
+        "kind": kind,
+        "n_parts": len(parts),
+        "demand": sum(p.quantity for p in parts),
+        "wall_time": wall_time,
+        "lp_iterations": stats.get("lp_iterations"),
+        "pricing_calls": stats.get("pricing_calls"),
+        "mispricings": stats.get("mispricings"),
+        "master_time": stats.get("master_time"),
+        "pricing_time": stats.get("pricing_time"),
+        "integer_attempts": stats.get("integer_attempts"),
+        "integer_time": stats.get("integer_time"),
+        "peak_memory_mb": peak_memory_mb,
+        "columns": stats.get("columns", len(patterns)),
+        "lp_objective": lp_objective,
+        "integer_objective": integer_objective,
+        "gap_rel": gap_rel,
+        "bars": int(sum(x_int)) if x_int else None,
+        "dp_capacity": stats.get("dp_capacity"),
+    }
+
+
+def run_suite(names=None, strategy_factory=_default_strategy, measure_memory=True):
+    names = list(names or BENCHMARK_INSTANCES)
+    return {
+        "calibration": calibration_time(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "instances": {name: run_instance(name, strategy_factory, measure_memory) for name in names},
+    }
+
+
+def write_results(results, path=RESULTS_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    return path
+
+
+def load_baseline(path=BASELINE_PATH):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except OSError:
+        return None
+
+
+def compare_to_baseline(results, baseline, threshold=DEFAULT_THRESHOLD, timing=True):
+    """
+    Return list pesan regresi (kosong = lolos).
+    - waktu  : dibandingkan setelah dinormalisasi dengan calibration
+    - kualitas (integer_objective) : tidak boleh lebih buruk dari baseline sama sekali
+    - lp_iterations, peak_memory_mb : toleransi `threshold`
+    timing=False: hanya metric deterministik (integer_objective, lp_iterations); waktu dan
+    memori bergantung beban mesin.
+    Instance yang tidak ada di baseline dilewati.
+    """
+    speed = results["calibration"] / baseline["calibration"]  # >1: mesin ini lebih lambat
+    regressions = []
+    for name, current in results["instances"].items():
+        base = baseline["instances"].get(name)
+        if base is None:
+            continue
+
+        for metric in TIME_METRICS if timing else ():
+            if current.get(metric) is None or base.get(metric) is None:
+                continue
+            allowed = base[metric] * speed
+            if current[metric] > allowed * (1 + threshold) and current[metric] - allowed > MIN_TIME_DELTA:
+                regressions.append(f"{name}.{metric}: {current[metric]:.3f}s vs baseline "
+                                   f"{allowed:.3f}s (machine-adjusted)")
+
+        if base.get("integer_objective") is not None:
+            if current.get("integer_objective") is None:
+                regressions.append(f"{name}.integer_objective: no integer solution")
+            elif current["integer_objective"] > base["integer_objective"] + 1e-6:
+                regressions.append(f"{name}.integer_objective: {current['integer_objective']:g} "
+                                   f"vs baseline {base['integer_objective']:g}")
+
+        if current.get("lp_iterations") and base.get("lp_iterations"):
+            if current["lp_iterations"] > base["lp_iterations"] * (1 + threshold):
+                regressions.append(f"{name}.lp_iterations: {current['lp_iterations']} "
+                                   f"vs baseline {base['lp_iterations']}")
+
+        if timing and current.get("peak_memory_mb") and base.get("peak_memory_mb"):
+            if (current["peak_memory_mb"] > base["peak_memory_mb"] * (1 + threshold)
+                    and current["peak_memory_mb"] - base["peak_memory_mb"] > MIN_MEMORY_DELTA_MB):
+                regressions.append(f"{name}.peak_memory_mb: {current['peak_memory_mb']:.1f} "
+                                   f"vs baseline {base['peak_memory_mb']:.1f}")
+    return regressions
+
+
+def format_table(results):
+    lines = [f"{'instance':<12} {'wall':>7} {'iters':>5} {'master':>7} {'pricing':>7} "
+             f"{'cbc':>7} {'mem MB':>7} {'bars':>5} {'gap':>7}"]
+    for name, r in results["instances"].items():
+        gap = "-" if r["gap_rel"] is None else f"{100 * r['gap_rel']:.2f}%"
+        mem = "-" if r["peak_memory_mb"] is None else f"{r['peak_memory_mb']:.1f}"
+        lines.append(f"{name:<12} {r['wall_time']:7.3f} {r['lp_iterations']:5d} {r['master_time']:7.3f} "
+                     f"{r['pricing_time']:7.3f} {r['integer_time']:7.3f} {mem:>7} {r['bars']:>5} {gap:>7}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.runner")
+    parser.add_argument("--output", default=RESULTS_PATH)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--entity-memory", action="store_true",
+                        help="measure MB per million part rows (dataclass vs PartTable) and exit")
+    parser.add_argument("instances", nargs="*", help=f"subset of {sorted(BENCHMARK_INSTANCES)}")
+    args = parser.parse_args(argv)
+
+    if args.entity_memory:
+        for name, mb in entity_memory_mb().items():
+            print(f"{name:<16} {mb:8.1f} MB / 1M rows")
+        return 0
+
+    results = run_suite(args.instances or None, measure_memory=not args.no_memory)
+    write_results(results, args.output)
+    print(format_table(results))
+    print(f"results: {args.output}")
+
+    if args.update_baseline:
+        write_results(results, args.baseline)
+        print(f"baseline updated: {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print("no baseline found; run with --update-baseline to create one")
+        return 0
+    regressions = compare_to_baseline(results, baseline, args.threshold)
+    for message in regressions:
+        print("REGRESSION", message)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+import os
+import pytest
+from benchmarks.instances import generate_instance, INSTANCE_KINDS, BENCHMARK_INSTANCES
+from benchmarks.runner import (
+    run_suite, write_results, load_baseline, compare_to_baseline, DEFAULT_THRESHOLD,
+    entity_memory_mb,
+)
+
+# Perbandingan waktu / memori dengan baseline hanya bila diminta (bergantung beban mesin):
+#   CLS_BENCH_TIMING=1 python -m pytest benchmarks
+# Hasil ditulis ke benchmarks/results/latest.json hanya dengan CLS_BENCH_WRITE=1 (default tmp).
+BENCH_TIMING = os.environ.get("CLS_BENCH_TIMING") == "1"
+
+
+@pytest.fixture(scope="module")
+def suite_results(tmp_path_factory):
+    results = run_suite()
+    if os.environ.get("CLS_BENCH_WRITE") == "1":
+        write_results(results)
+    else:
+        write_results(results, str(tmp_path_factory.mktemp("benchmarks") / "latest.json"))
+    return results
+
+@pytest.mark.parametrize("kind", INSTANCE_KINDS)
+def test_generator_is_deterministic(kind):
+    assert generate_instance(kind, 10, seed=7) == generate_instance(kind, 10, seed=7)
+    assert generate_instance(kind, 10, seed=7) != generate_instance(kind, 10, seed=8)
+
+def test_triplet_instance_has_zero_waste_optimum():
+    parts, stocks = generate_instance("triplet", 10, seed=1)
+    assert sum(p.length * p.quantity for p in parts) == 10 * stocks[0].length
+
+def test_suite_records_all_metrics(suite_results):
+    assert set(suite_results["instances"]) == set(BENCHMARK_INSTANCES)
+    for name, r in suite_results["instances"].items():
+        for metric in ("wall_time", "lp_iterations", "pricing_time", "integer_time",
+                       "peak_memory_mb", "gap_rel", "bars"):
+            assert r[metric] is not None, f"{name}.{metric}"
+        assert r["gap_rel"] >= -1e-9
+    # triplet: bound LP = jumlah triplet, integer optimal juga
+    assert suite_results["instances"]["triplet_20"]["bars"] == 20
+
+def test_no_regression_against_baseline(suite_results):
+    baseline = load_baseline()
+    if baseline is None:
+        pytest.skip("no benchmarks/baseline.json (python -m benchmarks.runner --update-baseline)")
+    threshold = float(os.environ.get("CLS_BENCH_THRESHOLD", DEFAULT_THRESHOLD))
+    regressions = compare_to_baseline(suite_results, baseline, threshold, timing=BENCH_TIMING)
+    assert not regressions, "\n".join(regressions)
+
+def test_compare_flags_slower_and_worse_results(suite_results):
+    slower = {
+        "calibration": suite_results["calibration"],
+        "instances": {
+            name: dict(r, wall_time=r["wall_time"] * 3 + 1, integer_objective=r["integer_objective"] + 1)
+            for name, r in suite_results["instances"].items()
+        },
+    }
+    regressions = compare_to_baseline(slower, suite_results)
+    assert any("wall_time" in m for m in regressions)
+    assert any("integer_objective" in m for m in regressions)
+    assert compare_to_baseline(suite_results, suite_results) == []
+    # tanpa timing: waktu lebih lambat tidak dihitung regresi, kualitas tetap
+    untimed = compare_to_baseline(slower, suite_results, timing=False)
+    assert untimed and all("integer_objective" in m for m in untimed)
+
+
+def test_part_table_is_much_smaller_than_dataclass_list():
+    memory = entity_memory_mb(n_rows=100_000, n_types=500)
+    assert memory["part_table"] < memory["dataclass_slots"] / 4 < memory["dataclass"] / 4
@@ -2,23 +2,69 @@
 cad_generator.py
 Generate DXF drawings with company title block and layer standards.
 Automatically finds template in core/templates/template.dxf
+
+Template yang sudah di-parse disimpan per process (key: path + mtime + size) dalam bentuk
+pickle; tiap CADGenerator mendapat salinan sendiri lewat pickle.loads (~4x lebih cepat dari
+ezdxf.readfile; ezdxf tidak punya Drawing.copy).
+
+Plan hasil optimizer digambar dengan add_patterns: satu BLOCK per pattern unik (batang,
+potongan, label, sisa) dan satu INSERT per batang, bukan geometri yang diulang per batang.
+Plan besar: generate_plan_sheets membagi batang ke beberapa sheet (per panjang stock /
+maks. N batang), tiap sheet satu file DXF yang digambar paralel di process pool, plus
+manifest JSON daftar sheet.
 """
 
+import json
+import os
+import pickle
+import threading
 from pathlib import Path
 from datetime import datetime
 import ezdxf
 
+_TEMPLATE_CACHE = {}  # (path absolut, mtime_ns, size) -> pickle Drawing
+_TEMPLATE_LOCK = threading.Lock()
+
+# layer untuk gambar plan: nama -> ACI color
+PLAN_LAYERS = {"STOCK": 7, "PARTS": 3, "TEXT": 2, "WASTE": 1}
+
+
+def load_template(template_path):
+    """Drawing baru dari template; parse file hanya sekali per versi file (path + mtime)."""
+    path = os.path.abspath(template_path)
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    with _TEMPLATE_LOCK:
+        data = _TEMPLATE_CACHE.get(key)
+    if data is None:
+        doc = ezdxf.readfile(path)
+        try:
+            data = pickle.dumps(doc, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return doc  # drawing tidak bisa di-pickle: tanpa cache
+        with _TEMPLATE_LOCK:
+            # versi lama file yang sama tidak dipakai lagi
+            for old in [k for k in _TEMPLATE_CACHE if k[0] == path]:
+                del _TEMPLATE_CACHE[old]
+            _TEMPLATE_CACHE[key] = data
+        return doc
+    return pickle.loads(data)
+
+
+def clear_template_cache():
+    with _TEMPLATE_LOCK:
+        _TEMPLATE_CACHE.clear()
+
 
 class CADGenerator:
     # otomatis temukan template relatif terhadap file ini
     TEMPLATE_PATH = Path(__file__).parent / "templates" / "cutting_list_drawing.dxf"
 
     def __init__(self, template_path: str = None):
-        """Load company DXF template with title block and layers."""
+        """Load company DXF template with title block and layers (cached per process)."""
         self.template_path = template_path or str(self.TEMPLATE_PATH)
-        self.doc = ezdxf.readfile(self.template_path)
+        self.doc = load_template(self.template_path)
         self.msp = self.doc.modelspace()
-        print(f"Loaded template from: {self.template_path}")
 
     def add_cutting_layout(self, cutting_list, start=(0, 0), spacing=50):
         """Add cutting rectangles and labels to modelspace."""
@@ -36,7 +82,7 @@ class CADGenerator:
             self.msp.add_text(
                 f"{part['id']} ({length}x{width})",
                 dxfattribs={"height": 20, "layer": "TEXT"}
-            ).set_pos((x0 + 10, y0 + width / 2))
+            ).set_placement((x0 + 10, y0 + width / 2))
             y0 += width + spacing
 
     def add_sheet_layout(self, sheet_name: str, project_name: str):
@@ -50,18 +96,17 @@ class CADGenerator:
         layout.add_text(
             f"Project: {project_name}",
             dxfattribs={"height": 5, "layer": "TITLE"}
-        ).set_pos((10, 10))
+        ).set_placement((10, 10))
 
         layout.add_text(
             f"Date: {datetime.now().strftime('%Y-%m-%d')}",
             dxfattribs={"height": 5, "layer": "TITLE"}
-        ).set_pos((10, 20))
+        ).set_placement((10, 20))
 
         # Add viewport to show part of modelspace (optional)
         layout.add_viewport(
             center=(150, 100),
-            width=180,
-            height=120,
+            size=(180, 120),
             view_center_point=(80, 60),
             view_height=250,
         )
@@ -74,6 +119,184 @@ class CADGenerator:
                 if tag in attrs:
                     att.dxf.text = str(attrs[tag])
 
+    def _ensure_layers(self):
+        for name, color in PLAN_LAYERS.items():
+            if name not in self.doc.layers:
+                self.doc.layers.add(name, color=color)
+
+    def define_pattern_block(self, name, stock_length, cuts, bar_height=100, text_height=20):
+        """
+        BLOCK untuk satu pattern: outline batang, satu persegi + label per potongan, area sisa,
+        cuts: list (label, length) sesuai urutan potong.
+        """
+        block = self.doc.blocks.new(name=name)
+        block.add_lwpolyline([(0, 0), (stock_length, 0), (stock_length, bar_height), (0, bar_height)],
+                             close=True, dxfattribs={"layer": "STOCK"})
+        x = 0
+        for label, length in cuts:
+            block.add_lwpolyline([(x, 0), (x + length, 0), (x + length, bar_height), (x, bar_height)],
+                                 close=True, dxfattribs={"layer": "PARTS"})
+            block.add_text(f"{label} ({length:g})",
+                           dxfattribs={"height": text_height, "layer": "TEXT"}).set_placement((x + 10, bar_height / 2))
+            x += length
+        if stock_length - x > 0:
+            block.add_line((x, 0), (stock_length, bar_height), dxfattribs={"layer": "WASTE"})
+        return block
+
+    def add_patterns(self, patterns, x_values, required_parts_aggregated, unit_scale=1, start=(0, 0),
+                     bar_height=100, spacing=50, block_prefix="PATTERN"):
+        """
+        Gambar plan optimizer: satu BLOCK per pattern dengan x > 0, lalu satu INSERT per batang
+        (disusun ke bawah, dikelompokkan per pattern). Panjang dibagi unit_scale (hasil
+        csv_repository). x pecahan dibulatkan ke atas. Return jumlah INSERT.
+        """
+        rows = plan_pattern_rows(patterns, x_values, required_parts_aggregated, unit_scale)
+        return self.add_pattern_rows(rows, start, bar_height, spacing, block_prefix)
+
+    def add_pattern_rows(self, rows, start=(0, 0), bar_height=100, spacing=50, block_prefix="PATTERN"):
+        """Seperti add_patterns, dari rows plan_pattern_rows (bisa sebagian plan, mis. satu sheet)."""
+        self._ensure_layers()
+        x0, y = start
+        placed = 0
+        for row in rows:
+            name = f"{block_prefix}_{row['pattern_id']}"
+            if name not in self.doc.blocks:
+                self.define_pattern_block(name, row["stock_length"], row["cuts"], bar_height)
+            for _ in range(row["bars"]):
+                self.msp.add_blockref(name, (x0, y))
+                y -= bar_height + spacing
+                placed += 1
+        return placed
+
     def save(self, output_path: str):
         """Save generated DXF file."""
         Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        self.doc.saveas(output_path)
+
+
+def plan_pattern_rows(patterns, x_values, required_parts_aggregated, unit_scale=1):
+    """Pattern aktif sebagai dict biasa (lihat CutPlan.pattern_rows); bars = x dibulatkan ke atas."""
+    from core.plan_export import CutPlan
+    return CutPlan(patterns, x_values, required_parts_aggregated).pattern_rows(unit_scale)
+
+
+def generate_plan_drawing(patterns, x_values, required_parts_aggregated, output_path, unit_scale=1,
+                          template_path=None, project_name=None):
+    """Bridge optimizer → DXF: template (cached) + add_patterns + save; return CADGenerator."""
+    cad = CADGenerator(template_path)
+    cad.add_patterns(patterns, x_values, required_parts_aggregated, unit_scale=unit_scale)
+    if project_name:
+        cad.add_sheet_layout("Cutting Plan", project_name)
+    cad.save(output_path)
+    return cad
+
+
+# ---------------------------
+# Plan besar: satu DXF per sheet
+# ---------------------------
+DEFAULT_BARS_PER_SHEET = 50
+SHEET_MANIFEST = "sheets.json"
+
+
+def paginate_plan(rows, bars_per_sheet=DEFAULT_BARS_PER_SHEET, by_stock_length=True):
+    """
+    Bagi rows (plan_pattern_rows) menjadi sheet berisi maks. bars_per_sheet batang
+    (None = tanpa batas). by_stock_length: satu sheet hanya berisi satu panjang stock
+    (stock terpanjang dulu). Pattern yang batangnya lebih dari sisa sheet dipecah ke
+    sheet berikutnya. Return list dict: stock_length (None bila campuran), rows.
+    """
+    if bars_per_sheet is not None and bars_per_sheet < 1:
+        raise ValueError("bars_per_sheet must be >= 1 (or None)")
+    rows = [row for row in rows if row["bars"] > 0]
+    if by_stock_length:
+        rows = sorted(rows, key=lambda row: -row["stock_length"])  # stabil: urutan pattern tetap
+
+    sheets = []
+    current, count, group = [], 0, None
+
+    def close():
+        if current:
+            lengths = {row["stock_length"] for row in current}
+            sheets.append({"stock_length": lengths.pop() if len(lengths) == 1 else None, "rows": list(current)})
+
+    for row in rows:
+        if by_stock_length and row["stock_length"] != group:
+            close()
+            current, count, group = [], 0, row["stock_length"]
+        remaining = row["bars"]
+        while remaining:
+            if bars_per_sheet is not None and count == bars_per_sheet:
+                close()
+                current, count = [], 0
+            take = remaining if bars_per_sheet is None else min(remaining, bars_per_sheet - count)
+            current.append(dict(row, bars=take))
+            count += take
+            remaining -= take
+    close()
+    return sheets
+
+
+def _render_sheet(template_path, rows, output_path, sheet_name, project_name):
+    """Worker: template (cached per process) + rows satu sheet → DXF; return jumlah batang."""
+    cad = CADGenerator(template_path)
+    placed = cad.add_pattern_rows(rows)
+    if project_name:
+        cad.add_sheet_layout(sheet_name, project_name)
+    cad.save(output_path)
+    return placed
+
+
+def generate_plan_sheets(patterns, x_values, required_parts_aggregated, output_folder, unit_scale=1,
+                         bars_per_sheet=DEFAULT_BARS_PER_SHEET, by_stock_length=True, workers=None,
+                         template_path=None, project_name=None):
+    """
+    Plan besar → satu DXF per sheet (sheet_001.dxf, ...) di output_folder, digambar paralel
+    di process pool (workers default os.cpu_count(); 1 = tanpa pool), plus manifest
+    SHEET_MANIFEST (JSON) berisi daftar sheet: file, stock_length, bars, first_bar/last_bar
+    (nomor batang global), patterns [{pattern_id, bars}]. Return dict manifest.
+    """
+    template_path = os.path.abspath(template_path or CADGenerator.TEMPLATE_PATH)
+    rows = plan_pattern_rows(patterns, x_values, required_parts_aggregated, unit_scale)
+    sheets = paginate_plan(rows, bars_per_sheet, by_stock_length)
+    os.makedirs(output_folder, exist_ok=True)
+
+    jobs = []
+    for n, sheet in enumerate(sheets, start=1):
+        file_name = f"sheet_{n:03d}.dxf"
+        jobs.append((template_path, sheet["rows"], os.path.join(output_folder, file_name),
+                     f"Sheet {n} of {len(sheets)}", project_name))
+        sheet["file"] = file_name
+
+    workers = min(workers or os.cpu_count() or 1, max(1, len(jobs)))
+    if workers == 1:
+        placed = [_render_sheet(*job) for job in jobs]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        load_template(template_path)  # parse sekali di parent; worker hasil fork mewarisi cache
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            placed = list(executor.map(_render_sheet, *zip(*jobs)))
+
+    manifest = {
+        "project": project_name,
+        "template": template_path,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "bars_per_sheet": bars_per_sheet,
+        "by_stock_length": by_stock_length,
+        "total_bars": sum(placed),
+        "sheets": [],
+    }
+    first = 1
+    for n, (sheet, bars) in enumerate(zip(sheets, placed), start=1):
+        manifest["sheets"].append({
+            "sheet": n,
+            "file": sheet["file"],
+            "stock_length": sheet["stock_length"],
+            "bars": bars,
+            "first_bar": first,
+            "last_bar": first + bars - 1,
+            "patterns": [{"pattern_id": row["pattern_id"], "bars": row["bars"]} for row in sheet["rows"]],
+        })
+        first += bars
+    with open(os.path.join(output_folder, SHEET_MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
@@ -0,0 +1,112 @@
+"""
+cli.py
+Entry point headless untuk scripting / server:
+
+    python -m core solve parts.csv stocks.csv --out output_dir
+
+Modul ini sengaja tidak meng-import tkinter, dan pandas / numpy / pulp baru
+di-import di dalam command saat benar-benar dipakai, supaya startup tetap cepat
+(cek dengan: python -X importtime -m core --help).
+"""
+
+import argparse
+import os
+import sys
+import time
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m core", description="Cutting List Solver (headless)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    solve = subparsers.add_parser("solve", help="optimize a cutting list and export the result CSVs")
+    solve.add_argument("parts_csv", help="required parts CSV (part_type,length,quantity)")
+    solve.add_argument("stocks_csv", help="stocks CSV (length,quantity)")
+    solve.add_argument("--out", default="output", help="output folder (default: output)")
+    solve.add_argument("--strategy", choices=("column-generation", "ffd", "portfolio"),
+                       default="column-generation",
+                       help="ffd: Modified First Fit Decreasing for very large orders (no LP); "
+                            "portfolio: race several strategies in parallel within --time-limit")
+    solve.add_argument("--pricing-engine", choices=("numpy", "python"), default="numpy")
+    solve.add_argument("--master-backend", choices=("auto", "highs", "cbc"), default="auto")
+    solve.add_argument("--columns-per-iteration", type=int, default=1)
+    solve.add_argument("--time-limit", type=float, default=None,
+                       help="wall-clock budget in seconds; returns the best plan found and its gap")
+    solve.add_argument("--integer-mode", choices=("mip", "rounding"), default="mip",
+                       help="integer phase: CBC (mip) or the fast residual-rounding heuristic")
+    solve.add_argument("--export-format", choices=("csv", "csv.gz", "parquet", "arrow"), default="csv",
+                       help="format of cut_trace_detail (parquet/arrow need pyarrow)")
+    solve.add_argument("--cache-dir", default=None, help="SolutionCache folder (disabled if omitted)")
+    solve.add_argument("--verbose", action="store_true", help="show solver iteration log")
+    solve.add_argument("--trace", default=None, help="write the solver event stream to this JSONL file")
+    solve.set_defaults(func=cmd_solve)
+    return parser
+
+
+def cmd_solve(args):
+    started = time.perf_counter()
+    from core.csv_repository import load_required_parts_table, load_stocks_table
+    from core.utils import descale_value
+
+    required_parts, unit_scale = load_required_parts_table(args.parts_csv)
+    stocks = load_stocks_table(args.stocks_csv, unit_scale)
+    loaded = time.perf_counter()
+
+    from core.optimizer_service import OptimizerService
+    from core.optimizer_strategy import ColumnGeneration, ModifiedFirstFitDecreasing, Portfolio
+
+    cache = None
+    if args.cache_dir:
+        from core.solution_cache import SolutionCache
+        cache = SolutionCache(args.cache_dir)
+
+    if args.strategy == "ffd":
+        strategy = ModifiedFirstFitDecreasing()
+    elif args.strategy == "portfolio":
+        strategy = Portfolio(time_limit=args.time_limit)
+    else:
+        strategy = ColumnGeneration(pricing_engine=args.pricing_engine,
+                                    master_backend=args.master_backend,
+                                    columns_per_iteration=args.columns_per_iteration,
+                                    time_limit=args.time_limit,
+                                    integer_mode=args.integer_mode)
+    service = OptimizerService(strategy, cache=cache)
+
+    from core.telemetry import Telemetry, ConsoleReporter, EventRecorder
+    telemetry = Telemetry()
+    if args.verbose:
+        telemetry.subscribe(ConsoleReporter(stream=sys.stderr))
+    recorder = telemetry.subscribe(EventRecorder()) if args.trace else None
+
+    patterns, x_values, x_int = service.solve(required_parts, stocks, unit_scale,
+                                              progress_callback=telemetry if telemetry.subscribers else None)
+    if recorder is not None:
+        recorder.to_jsonl(args.trace)
+    solved = time.perf_counter()
+
+    service.export(patterns, x_values, x_int, required_parts, args.out, trace_format=args.export_format)
+    exported = time.perf_counter()
+
+    # Ringkasan: jumlah batang per panjang stock + total waste
+    x_used = x_int if x_int else x_values
+    bars = {}
+    total_waste = 0
+    for p, x in zip(patterns, x_used):
+        if x:
+            bars[p["stock_length"]] = bars.get(p["stock_length"], 0) + x
+            total_waste += x * p["waste"]
+    for stock_length in sorted(bars):
+        print(f"stock {descale_value(stock_length, unit_scale):g}: {bars[stock_length]:g} bars")
+    print(f"total waste: {descale_value(total_waste, unit_scale):g}")
+    stats = getattr(strategy, "last_stats", None)  # tidak ada bila hasil dari cache
+    if stats and stats.get("gap_rel") is not None:
+        print(f"gap to lower bound: {100 * stats['gap_rel']:.2f}% ({stats['stop_reason']})")
+    print(f"output: {os.path.abspath(args.out)}")
+    print(f"time: load {loaded - started:.3f}s | solve {solved - loaded:.3f}s | "
+          f"export {exported - solved:.3f}s", file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -1,7 +1,8 @@
 import csv
 import math
 from collections import defaultdict
-import pulp
+import numpy as np
+from core.plan_export import CutPlan, DEFAULT_CHUNK_ROWS, write_cut_trace
 
 # def _get_length(x):
 #     """Helper: accept either object with .length or numeric"""
@@ -211,36 +212,41 @@ import pulp
 #     }
 
 
-def export_pattern_summary(self, patterns, x_values, required_parts_aggregated, output_folder="output"):
-    part_types = [p.part_type for p in required_parts_aggregated]
-    part_lengths = [p.length for p in required_parts_aggregated]
+def export_pattern_summary(self, patterns, x_values, required_parts_aggregated, output_folder="output",
+                           trace_format="csv", chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Tulis pattern_summary.csv dan cut_trace_detail (format lihat core.plan_export.TRACE_FORMATS;
+    default CSV dengan layout lama). Return dict nama -> path file.
+    """
+    plan = CutPlan(patterns, x_values, required_parts_aggregated)
+    part_types = plan.part_types
+    part_lengths = plan.part_lengths
+    pool = plan.pool
+    matrix = pool.matrix
+    stock_lengths = pool.pattern_stock_lengths
+    waste = pool.waste
+    int_parts, frac_parts = plan.int_parts, plan.frac_parts
 
     summary_path = f"{output_folder}/pattern_summary.csv"
     with open(summary_path, "w", newline="") as f:
         writer = csv.writer(f)
         writer.writerow(["pattern_id", "stock_length", "cuts_detail", "leftover", "count"])
 
-        for j, p in enumerate(patterns):
-            x_val = pulp.value(x_values[j])
-            if x_val is None or x_val <= 1e-8:
-                continue
-
-            int_part = int(math.floor(x_val))
-            frac_part = x_val - int_part
-
-            cuts_desc = []
-            for idx, qty in enumerate(p["pattern"]):
-                if qty > 0:
-                    cuts_desc.append(f"{qty}×{part_types[idx]} ({part_lengths[idx]})")
-            cuts_str = " + ".join(cuts_desc)
+        for j in plan.active:
+            int_part = int(int_parts[j])
+            frac_part = float(frac_parts[j])
+            cuts_str = " + ".join(
+                f"{matrix[j, idx]}×{part_types[idx]} ({part_lengths[idx]})"
+                for idx in np.flatnonzero(matrix[j])
+            )
 
             # --- tulis bagian integer ---
             if int_part > 0:
                 writer.writerow([
                     f"P{j+1}",
-                    p["stock_length"],
+                    stock_lengths[j],
                     cuts_str,
-                    p["waste"],
+                    waste[j],
                     int_part
                 ])
 
@@ -248,53 +254,12 @@ def export_pattern_summary(self, patterns, x_values, required_parts_aggregated,
             if frac_part > 1e-6:
                 writer.writerow([
                     f"P{j+1}_frac",
-                    p["stock_length"],
+                    stock_lengths[j],
                     cuts_str,
-                    p["waste"],
+                    waste[j],
                     round(frac_part, 3)
                 ])
 
-    # === CUT TRACE DETAIL ===
-    detail_path = f"{output_folder}/cut_trace_detail.csv"
-    with open(detail_path, "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["pattern_id", "instance_id", "stock_source", "stock_length", "part_type", "cut_length", "leftover"])
-
-        for j, p in enumerate(patterns):
-            x_val = pulp.value(x_values[j])
-            if x_val is None or x_val <= 1e-8:
-                continue
-
-            int_part = int(math.floor(x_val))
-            frac_part = x_val - int_part
-            pattern_id = f"P{j+1}"
-
-            # --- tulis bagian integer ---
-            for inst in range(int_part):
-                instance_id = f"{pattern_id}_{inst+1}"
-                for idx, qty in enumerate(p["pattern"]):
-                    for _ in range(qty):
-                        writer.writerow([
-                            pattern_id,
-                            instance_id,
-                            "main" if p["stock_index"] == 0 else f"stock_{p['stock_index']}",
-                            p["stock_length"],
-                            part_types[idx],
-                            part_lengths[idx],
-                            p["waste"] if _ == qty - 1 else 0
-                        ])
-
-            # --- tulis bagian fractional ---
-            if frac_part > 1e-6:
-                instance_id = f"{pattern_id}_frac"
-                for idx, qty in enumerate(p["pattern"]):
-                    if qty > 0:
-                        writer.writerow([
-                            f"{pattern_id}_frac",
-                            instance_id,
-                            "main" if p["stock_index"] == 0 else f"stock_{p['stock_index']}",
-                            p["stock_length"],
-                            part_types[idx],
-                            part_lengths[idx],
-                            p["waste"]
-                        ])
\ No newline at end of file
+    # === CUT TRACE DETAIL === (bulk, lihat core/plan_export.py)
+    detail_path = write_cut_trace(plan, output_folder, trace_format, chunk_rows)
+    return {"pattern_summary": summary_path, "cut_trace_detail": detail_path}
@@ -1,68 +1,168 @@
-import pandas as pd
-import pulp
-from core.entities import Part, Parts, Stock
-from core.utils import detect_unit_scale, scale_value, descale_value
-from collections import defaultdict
-
-def load_required_parts(filename: str):
-    df = pd.read_csv(filename)
-    normalized_parts = []
-    unit_scale = 1
+import csv
+import os
+from core.entities import Part, Parts, Stock, PartTable, StockTable
+from core.utils import descale_value
+
+# File CSV lebih kecil dari ini dibaca dengan modul csv bawaan (tanpa import pandas,
+# yang sendirian memakan ~0.4 s startup); file besar tetap lewat pandas.
+SMALL_CSV_BYTES = 256 * 1024
+
+
+def _use_pandas(filename: str, engine: str) -> bool:
+    if engine not in ("auto", "pandas", "csv"):
+        raise ValueError(f"Unknown engine: {engine!r} (choose from 'auto', 'pandas', 'csv')")
+    if engine == "auto":
+        return os.path.getsize(filename) >= SMALL_CSV_BYTES
+    return engine == "pandas"
+
+
+def _iter_column_chunks(filename: str, columns, engine: str, chunksize=None):
+    """
+    Baca CSV sekali, yield dict kolom -> list/array string per chunk.
+    Semua kolom dibaca sebagai string; konversi angka dilakukan per kolom (vektor)
+    oleh _decimal_places / _scaled_lengths, bukan per baris.
+    chunksize=None → satu chunk berisi seluruh file.
+    """
+    if _use_pandas(filename, engine):
+        import pandas as pd
+        reader = pd.read_csv(filename, usecols=list(columns), dtype=str, keep_default_na=False,
+                             chunksize=chunksize)
+        for df in ([reader] if chunksize is None else reader):
+            yield {c: df[c].to_numpy(dtype=str) for c in columns}
+        return
+
+    with open(filename, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        positions = [header.index(c) for c in columns]
+        rows = []
+        for row in reader:
+            rows.append(row)
+            if chunksize is not None and len(rows) >= chunksize:
+                yield {c: [r[i] for r in rows] for c, i in zip(columns, positions)}
+                rows = []
+        if rows or chunksize is None:
+            yield {c: [r[i] for r in rows] for c, i in zip(columns, positions)}
+
+
+def _decimal_places(lengths):
+    """
+    Jumlah desimal tiap nilai length (array string), setara detect_unit_scale(str(float(v))):
+    trailing zero diabaikan ("2.500" -> 1), dan return juga apakah kolom ini float
+    (pandas membaca kolom dengan '.' sebagai float, sehingga "1.0" tetap 1 desimal).
+    """
+    import numpy as np
+    lengths = np.char.strip(np.asarray(lengths, dtype=str))
+    _, dot, fraction = np.char.partition(lengths, ".").T
+    places = np.char.str_len(np.char.rstrip(fraction, "0"))
+    return places, bool((dot != "").any())
+
+
+def _floats(values):
+    import numpy as np
+    return np.char.strip(np.asarray(values, dtype=str)).astype(np.float64)
+
 
-    # Deteksi skala terbesar dari semua input
-    for _, row in df.iterrows():
-        unit_scale = max(unit_scale, detect_unit_scale(str(row["length"])))
-    
-    # Load required parts dengan skala yang sudah ditentukan (normalisasi)
-    for _, row in df.iterrows():
-        length_normalized = scale_value(float(row["length"]), unit_scale)
-        normalized_parts.extend([Part(part_type=row["part_type"], length=length_normalized)] * int(row["quantity"]))
+def _scaled_lengths(lengths, unit_scale: int):
+    """Vektor scale_value: round(float(length) * unit_scale) → int64."""
+    import numpy as np
+    return np.rint(_floats(lengths) * unit_scale).astype(np.int64)
 
+
+def _quantities(quantities):
+    import numpy as np
+    # int(float(q)) seperti int(row["quantity"]) versi lama
+    return _floats(quantities).astype(np.int64)
+
+
+def load_required_parts_columns(filename: str, engine: str = "auto", chunksize=None):
+    """
+    Loader kolom: satu kali baca, semua konversi vektor per kolom.
+    Return (part_types, lengths, quantities, unit_scale):
+    - part_types : list str
+    - lengths    : np.ndarray int64, sudah di-scale dengan unit_scale
+    - quantities : np.ndarray int64 (tetap teragregasi, tidak di-expand per unit)
+    chunksize: baca file per N baris (untuk BOM hasil ekspor yang sangat besar);
+    tiap chunk langsung diringkas ke array kecil, unit_scale ditentukan di akhir.
+    """
+    import numpy as np
+    part_types, lengths, quantities = [], [], []
+    max_places, is_float = 0, False
+    for chunk in _iter_column_chunks(filename, ("part_type", "length", "quantity"), engine, chunksize):
+        if len(chunk["length"]) == 0:
+            continue
+        places, chunk_is_float = _decimal_places(chunk["length"])
+        max_places = max(max_places, int(places.max()))
+        is_float = is_float or chunk_is_float
+        part_types.extend(str(t) for t in chunk["part_type"])
+        # simpan float64 (8 byte/baris) supaya bisa di-scale setelah skala final diketahui
+        lengths.append(_floats(chunk["length"]))
+        quantities.append(_quantities(chunk["quantity"]))
+
+    if not lengths:
+        return [], np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), 1
+
+    # Deteksi skala terbesar dari semua input (kolom float minimal 1 desimal, seperti str(float))
+    unit_scale = 10 ** max(max_places, 1 if is_float else 0)
+    scaled = np.rint(np.concatenate(lengths) * unit_scale).astype(np.int64)
+    return part_types, scaled, np.concatenate(quantities), unit_scale
+
+
+def load_stocks_columns(filename: str, unit_scale: int, engine: str = "auto", chunksize=None):
+    """Loader kolom untuk stock: return (lengths, quantities) np.ndarray int64 (ter-scale)."""
+    import numpy as np
+    lengths, quantities = [], []
+    for chunk in _iter_column_chunks(filename, ("length", "quantity"), engine, chunksize):
+        lengths.append(_scaled_lengths(chunk["length"], unit_scale))
+        quantities.append(_quantities(chunk["quantity"]))
+    if not lengths:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate(lengths), np.concatenate(quantities)
+
+
+def load_required_parts(filename: str, engine: str = "auto", chunksize=None):
+    """Satu Part per unit quantity (format lama). Untuk list besar pakai versi aggregated."""
+    part_types, lengths, quantities, unit_scale = load_required_parts_columns(filename, engine, chunksize)
+    normalized_parts = []
+    for part_type, length, quantity in zip(part_types, lengths.tolist(), quantities.tolist()):
+        normalized_parts.extend([Part(part_type=part_type, length=length)] * quantity)
     return normalized_parts, unit_scale
 
-def load_required_parts_aggreageted(filename: str):
-    df = pd.read_csv(filename)
-    normalized_parts_aggregated = []
-    unit_scale = 1
-
-    # Deteksi skala terbesar dari semua input
-    for _, row in df.iterrows():
-        unit_scale = max(unit_scale, detect_unit_scale(str(row["length"])))
-    
-    # Load required parts dengan skala yang sudah ditentukan (normalisasi)
-    for _, row in df.iterrows():
-        length_normalized = scale_value(float(row["length"]), unit_scale)
-        normalized_parts_aggregated.extend([Parts(
-            part_type = row["part_type"], 
-            length = length_normalized,
-            quantity = int(row["quantity"])
-            )])
+def load_required_parts_table(filename: str, engine: str = "auto", chunksize=None):
+    """Seperti load_required_parts_aggreageted, tapi return (PartTable, unit_scale) tanpa object per baris."""
+    part_types, lengths, quantities, unit_scale = load_required_parts_columns(filename, engine, chunksize)
+    return PartTable.from_columns(part_types, lengths, quantities), unit_scale
 
+def load_required_parts_aggreageted(filename: str, engine: str = "auto", chunksize=None):
+    part_types, lengths, quantities, unit_scale = load_required_parts_columns(filename, engine, chunksize)
+    normalized_parts_aggregated = [
+        Parts(part_type=part_type, length=length, quantity=quantity)
+        for part_type, length, quantity in zip(part_types, lengths.tolist(), quantities.tolist())
+    ]
     return normalized_parts_aggregated, unit_scale
 
-def load_stocks(filename: str, unit_scale: int):
-    df = pd.read_csv(filename)  
+def load_stocks(filename: str, unit_scale: int, engine: str = "auto", chunksize=None):
+    """Satu Stock (quantity=1) per unit (format lama). Untuk list besar pakai versi aggregated."""
+    lengths, quantities = load_stocks_columns(filename, unit_scale, engine, chunksize)
     normalized_stocks = []
-
-    for _, row in df.iterrows():
-        normalized_stocks.extend([Stock(
-            length = scale_value(float(row["length"]), unit_scale),
-            quantity = 1,
-        )] * int(row["quantity"]))
+    for length, quantity in zip(lengths.tolist(), quantities.tolist()):
+        normalized_stocks.extend([Stock(length=length, quantity=1)] * quantity)
     return normalized_stocks
 
-def load_stocks_aggregated(filename: str, unit_scale: int):
-    df = pd.read_csv(filename)  
-    normalized_stocks_aggregated = []
+def load_stocks_table(filename: str, unit_scale: int, engine: str = "auto", chunksize=None):
+    """Seperti load_stocks_aggregated, return StockTable."""
+    lengths, quantities = load_stocks_columns(filename, unit_scale, engine, chunksize)
+    return StockTable(lengths, quantities)
 
-    for _, row in df.iterrows():
-        normalized_stocks_aggregated.extend([Stock(
-            length = scale_value(float(row["length"]), unit_scale),
-            quantity = int(row["quantity"]),
-        )])
-    return normalized_stocks_aggregated
+def load_stocks_aggregated(filename: str, unit_scale: int, engine: str = "auto", chunksize=None):
+    lengths, quantities = load_stocks_columns(filename, unit_scale, engine, chunksize)
+    return [Stock(length=length, quantity=quantity)
+            for length, quantity in zip(lengths.tolist(), quantities.tolist())]
 
 def save_result(result, filename: str, unit_scale: int):
+    import pandas as pd
     rows = []
     for i, bar in enumerate(result):
         used = sum(p.length for p in bar)
@@ -1,17 +1,190 @@
+"""
+entities.py
+Data input solver: dataclass per baris (Part / Parts / Stock) dan versi kolom
+(PartTable / StockTable) untuk BOM besar.
+
+Tabel menyimpan satu array NumPy per kolom (bukan satu object Python per baris),
+read-only, hashable dan murah di-pickle ke worker process. Tabel tetap berperilaku
+seperti list dataclass (len, iterasi, table[i]), sehingga caller lama tetap jalan;
+solver membaca kolomnya langsung lewat as_part_table / as_stock_table.
+"""
+
 from dataclasses import dataclass
+import numpy as np
+
+UNLIMITED = -1  # StockTable.quantity untuk stock tanpa batas (Stock.quantity None)
 
-@dataclass
+
+@dataclass(slots=True)
 class Part:
     part_type: str
     length: int # dalam satuan scaled integer (normalize)
 
-@dataclass
+@dataclass(slots=True)
 class Parts:
     part_type: str
     length: int # dalam satuan scaled integer (normalize)
     quantity: int
 
-@dataclass
+@dataclass(slots=True)
 class Stock:
     length: int # dalam satuan scaled integer (normalize)
-    quantity: int
\ No newline at end of file
+    quantity: int
+
+
+def _column(values, dtype):
+    # view read-only: array milik caller tidak ikut terkunci
+    if dtype is not None and np.issubdtype(dtype, np.integer):
+        raw = np.asarray(values)
+        if raw.dtype.kind in "fc" and not np.all(raw == np.floor(raw)):
+            # jangan dipotong diam-diam: panjang harus sudah scaled integer (lihat csv_repository)
+            raise ValueError("integer column got non-integral values (scale lengths to integers first)")
+    array = np.asarray(values, dtype=dtype).view()
+    array.flags.writeable = False
+    return array
+
+
+class PartTable:
+    """
+    Parts teragregasi sebagai kolom:
+    - types     : part_type unik (di-intern, urutan kemunculan pertama)
+    - type_code : int32, index ke types per baris
+    - length    : int64 (scaled integer), quantity : int64
+    table[i] → Parts; table[slice / index array / mask] → PartTable.
+    """
+    __slots__ = ("types", "type_code", "length", "quantity", "_hash")
+
+    def __init__(self, types, type_code, length, quantity):
+        self.types = _column(types, str)
+        self.type_code = _column(type_code, np.int32)
+        self.length = _column(length, np.int64)
+        self.quantity = _column(quantity, np.int64)
+        self._hash = None
+        if not len(self.type_code) == len(self.length) == len(self.quantity):
+            raise ValueError("PartTable columns must have the same length")
+
+    @classmethod
+    def from_columns(cls, part_types, lengths, quantities):
+        part_types = np.asarray(part_types, dtype=str)
+        if len(part_types) == 0:
+            return cls([], [], lengths, quantities)
+        unique, first, inverse = np.unique(part_types, return_index=True, return_inverse=True)
+        order = np.argsort(first)
+        rank = np.empty(len(order), dtype=np.int32)
+        rank[order] = np.arange(len(order), dtype=np.int32)
+        return cls(unique[order], rank[inverse], lengths, quantities)
+
+    @classmethod
+    def from_parts(cls, parts):
+        """Adapter dari list Parts (atau object dengan part_type, length, quantity)."""
+        return cls.from_columns([str(p.part_type) for p in parts], [p.length for p in parts],
+                                [p.quantity for p in parts])
+
+    def part_types(self):
+        """part_type per baris (list str)."""
+        return self.types[self.type_code].tolist()
+
+    def to_parts(self):
+        return [Parts(t, length, q) for t, length, q
+                in zip(self.part_types(), self.length.tolist(), self.quantity.tolist())]
+
+    @property
+    def nbytes(self):
+        return self.types.nbytes + self.type_code.nbytes + self.length.nbytes + self.quantity.nbytes
+
+    def __len__(self):
+        return len(self.length)
+
+    def __iter__(self):
+        return iter(self.to_parts())
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return Parts(str(self.types[self.type_code[index]]), int(self.length[index]),
+                         int(self.quantity[index]))
+        return PartTable(self.types, self.type_code[index], self.length[index], self.quantity[index])
+
+    def __eq__(self, other):
+        if not isinstance(other, PartTable):
+            return NotImplemented
+        return (len(self) == len(other) and self.part_types() == other.part_types()
+                and np.array_equal(self.length, other.length) and np.array_equal(self.quantity, other.quantity))
+
+    def __hash__(self):
+        if self._hash is None:
+            # cukup kolom angka (tabel yang sama pasti sama di sini); part_type ikut dicek di __eq__
+            self._hash = hash((self.length.tobytes(), self.quantity.tobytes()))
+        return self._hash
+
+    def __reduce__(self):
+        return PartTable, (self.types, self.type_code, self.length, self.quantity)
+
+    def __repr__(self):
+        return f"PartTable({len(self)} rows, {len(self.types)} part types)"
+
+
+class StockTable:
+    """
+    Stock teragregasi sebagai kolom: length int64, quantity int64 (UNLIMITED = tanpa batas),
+    cost (default = length, seperti cost stock di solver). table[i] → Stock.
+    """
+    __slots__ = ("length", "quantity", "cost", "_hash")
+
+    def __init__(self, length, quantity, cost=None):
+        self.length = _column(length, np.int64)
+        self.quantity = _column([UNLIMITED if q is None else q for q in quantity], np.int64)
+        self.cost = self.length if cost is None else _column(cost, None)
+        self._hash = None
+        if not len(self.length) == len(self.quantity) == len(self.cost):
+            raise ValueError("StockTable columns must have the same length")
+
+    @classmethod
+    def from_stocks(cls, stocks):
+        """Adapter dari list Stock (quantity None = tanpa batas)."""
+        return cls([s.length for s in stocks], [s.quantity for s in stocks])
+
+    def limits(self):
+        """quantity per stock sebagai list (None = tanpa batas), format stock_limits solver."""
+        return [None if q == UNLIMITED else q for q in self.quantity.tolist()]
+
+    def to_stocks(self):
+        return [Stock(length, q) for length, q in zip(self.length.tolist(), self.limits())]
+
+    def __len__(self):
+        return len(self.length)
+
+    def __iter__(self):
+        return iter(self.to_stocks())
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            q = int(self.quantity[index])
+            return Stock(int(self.length[index]), None if q == UNLIMITED else q)
+        return StockTable(self.length[index], self.quantity[index], self.cost[index])
+
+    def __eq__(self, other):
+        if not isinstance(other, StockTable):
+            return NotImplemented
+        return all(np.array_equal(a, b) for a, b in ((self.length, other.length),
+                                                    (self.quantity, other.quantity),
+                                                    (self.cost, other.cost)))
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash((self.length.tobytes(), self.quantity.tobytes(), self.cost.tobytes()))
+        return self._hash
+
+    def __reduce__(self):
+        return StockTable, (self.length, self.quantity, self.cost)
+
+    def __repr__(self):
+        return f"StockTable({len(self)} rows)"
+
+
+def as_part_table(parts):
+    """PartTable apa adanya, list Parts → PartTable (adapter untuk caller lama)."""
+    return parts if isinstance(parts, PartTable) else PartTable.from_parts(parts)
+
+
+def as_stock_table(stocks):
+    return stocks if isinstance(stocks, StockTable) else StockTable.from_stocks(stocks)
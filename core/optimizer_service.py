@@ -1,46 +1,273 @@
-from core.optimizer_strategy import ColumnGeneration
+import os
+import traceback
+from dataclasses import dataclass, replace
+import numpy as np
+from core.optimizer_strategy import ColumnGeneration, Portfolio
+from core.optimizer_strategy.column_generation import INTEGER_MODES
 # from core.compatible_export import aggregate_and_export_from_trivial
 from core.compatible_export import export_pattern_summary
-from pprint import pprint
+from core.optimizer_strategy.pattern_pool import PatternPool
+from core.entities import as_part_table, as_stock_table
+
+
+@dataclass
+class BatchJob:
+    required_parts: list
+    stocks: list
+    unit_scale: int = 1
+    output_folder: str = None  # default: <output_root>/<name>
+    name: str = None
+
+    @classmethod
+    def from_csv(cls, parts_csv, stocks_csv, output_folder=None, name=None):
+        """Load satu job dari pasangan CSV (cutting list + stock)."""
+        from core.csv_repository import load_required_parts_table, load_stocks_table
+        required_parts, unit_scale = load_required_parts_table(parts_csv)
+        stocks = load_stocks_table(stocks_csv, unit_scale)
+        return cls(required_parts, stocks, unit_scale, output_folder,
+                   name or os.path.splitext(os.path.basename(parts_csv))[0])
+
+
+@dataclass
+class BatchResult:
+    name: str
+    output_folder: str
+    patterns: object = None
+    x_values: list = None
+    x_int: list = None
+    error: str = None  # traceback bila job gagal
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def _run_batch_job(strategy, cache, job):
+    """Dijalankan di worker process: satu job, kegagalan tidak merusak job lain."""
+    try:
+        service = OptimizerService(strategy, cache=cache)
+        patterns, x_values, x_int = service.solve(job.required_parts, job.stocks, job.unit_scale)
+        service.export(patterns, x_values, x_int, job.required_parts, job.output_folder)
+        return BatchResult(job.name, job.output_folder, patterns, x_values, x_int)
+    except Exception:
+        return BatchResult(job.name, job.output_folder, error=traceback.format_exc())
+
+
+EXPORT_MODES = ("none", "sync", "background")
+
 
 class OptimizerService:
-    def __init__(self, strategy=None):
+    def __init__(self, strategy=None, cache=None, integer_mode=None, export_mode="sync"):
+        """
+        cache: SolutionCache opsional; bila ada, problem yang identik (termasuk yang
+        urutan barisnya berbeda) langsung memakai hasil tersimpan tanpa solve ulang.
+        integer_mode: "mip" (CBC) atau "rounding" (heuristik cepat tanpa CBC, untuk
+        pemakaian interaktif); None = pakai setting strategy.
+        export_mode: tahap export di run() (default, bisa di-override per panggilan)
+        - "none"       : tidak menulis file
+        - "sync"       : tulis sebelum run() return
+        - "background" : diserahkan ke satu writer thread; run() langsung return,
+                         tunggu dengan flush_exports() / close()
+        """
         self.strategy = strategy or ColumnGeneration()
+        self.cache = cache
+        if export_mode not in EXPORT_MODES:
+            raise ValueError(f"Unknown export_mode: {export_mode!r} (choose from {EXPORT_MODES})")
+        self.export_mode = export_mode
+        self._export_executor = None
+        self._pending_exports = []
+        self.last_export = None  # hasil export terakhir (dict path) atau Future bila background
+        self.last_solution = None  # (patterns, x_values, x_int) dari run() terakhir
+        if integer_mode is not None:
+            self.set_integer_mode(integer_mode)
     
     def set_strategy(self, strategy):
         self.strategy = strategy
-     
-    def run(self, required_parts, stocks):
-        # Jalankan optimasi
-        results = self.strategy.optimize(required_parts, stocks)
 
-        # Sesuaikan jumlah nilai yang direturn
-        # Bisa (patterns, x_values, x_int) atau (patterns, x_int)
-        if len(results) == 3:
+    def set_portfolio(self, strategies=None, time_limit=None):
+        """
+        Mode portfolio: beberapa strategy dijalankan paralel (process terpisah), plan feasible
+        dengan total cost stock terkecil dipakai; strategy lain dibatalkan saat time_limit
+        habis atau salah satu hasil terbukti optimal. strategies=None → default_portfolio().
+        """
+        self.strategy = Portfolio(strategies, time_limit=time_limit)
+        return self.strategy
+
+    def set_integer_mode(self, integer_mode):
+        """Pilih fase integer strategy: "mip" atau "rounding" (lihat ColumnGeneration)."""
+        if not hasattr(self.strategy, "integer_mode"):
+            raise ValueError(f"{type(self.strategy).__name__} has no integer phase to configure")
+        if integer_mode not in INTEGER_MODES:
+            raise ValueError(f"Unknown integer_mode: {integer_mode!r} (choose from {INTEGER_MODES})")
+        self.strategy.integer_mode = integer_mode
+
+    def solve(self, required_parts, stocks, unit_scale=1, progress_callback=None, cancel_event=None):
+        """
+        Jalankan strategy (atau ambil dari cache); return (patterns, x_values, x_int).
+        progress_callback / cancel_event diteruskan ke strategy.optimize (lihat OptimizerStrategy).
+        """
+        # Cek cache dulu
+        results = None
+        if self.cache is not None:
+            results = self.cache.get(required_parts, stocks, unit_scale, self.strategy)
+
+        if results is None:
+            # Jalankan optimasi
+            results = self.strategy.optimize(required_parts, stocks,
+                                             progress_callback=progress_callback,
+                                             cancel_event=cancel_event)
+
+            # Sesuaikan jumlah nilai yang direturn
+            # Bisa (patterns, x_values, x_int) atau (patterns, x_int)
+            if len(results) != 3:
+                patterns, x_int = results
+                results = (patterns, None, x_int)  # fallback
+
+            # plan infeasible / kosong tidak di-cache (kalau tidak, di-replay untuk request yang sama)
             patterns, x_values, x_int = results
-        else:
-            patterns, x_int = results
-            x_values = None  # fallback
+            x_used = x_int if x_int is not None and len(x_int) else x_values
+            if self.cache is not None and self.covers_demand(patterns, x_used, required_parts):
+                self.cache.put(required_parts, stocks, unit_scale, self.strategy, *results)
+
+        return results
 
+    @staticmethod
+    def covers_demand(patterns, x, required_parts):
+        """True bila plan x (x_int, atau x_values) menghasilkan minimal quantity tiap part."""
+        if x is None or len(x) == 0:
+            return False
+        parts = as_part_table(required_parts)
+        pool = PatternPool.from_patterns(patterns, parts.length.tolist())
+        x = np.asarray(x[:len(pool)], dtype=float)
+        produced = x @ pool.matrix[:len(x)]
+        return bool(np.all(produced >= parts.quantity - 1e-6))
+
+    def export(self, patterns, x_values, x_int, required_parts, output_folder="output", trace_format="csv"):
+        """
+        Tulis pattern_summary.csv + cut_trace_detail ke output_folder (dibuat bila belum ada).
+        trace_format: format cut_trace_detail ("csv", "csv.gz", "parquet", "arrow"; lihat core.plan_export).
+        """
+        os.makedirs(output_folder, exist_ok=True)
         # Tentukan hasil yang digunakan
         x_used = x_int if x_int else x_values
 
         # Ekspor summary pattern
-        res2 = export_pattern_summary(
+        return export_pattern_summary(
             self,          # <- kalau fungsi export tidak butuh class ini, hapus 'self'
             patterns,
             x_used,
-            required_parts
+            required_parts,
+            output_folder=output_folder,
+            trace_format=trace_format,
         )
+     
+    def run(self, required_parts, stocks, unit_scale=1, output_folder="output",
+            progress_callback=None, cancel_event=None, export_mode=None, trace_format="csv"):
+        """
+        Solve + tahap export (export_mode None = self.export_mode). Return patterns;
+        (patterns, x_values, x_int) lengkap ada di self.last_solution.
+        Dengan "background", hasil export (atau error-nya) diambil lewat flush_exports();
+        self.last_export berisi Future job tersebut.
+        """
+        export_mode = export_mode or self.export_mode
+        if export_mode not in EXPORT_MODES:
+            raise ValueError(f"Unknown export_mode: {export_mode!r} (choose from {EXPORT_MODES})")
+        patterns, x_values, x_int = self.solve(required_parts, stocks, unit_scale,
+                                               progress_callback, cancel_event)
+        self.last_solution = (patterns, x_values, x_int)
 
-        # Debug print
-        print("\n=== Patterns ===")
-        pprint(patterns)
-        print("\n=== X used ===")
-        pprint(x_used)
-        print("\n=== X values (LP) ===")
-        pprint(x_values)
+        # Ekspor summary pattern
+        if export_mode == "sync":
+            self.last_export = self.export(patterns, x_values, x_int, required_parts, output_folder,
+                                           trace_format)
+        elif export_mode == "background":
+            self.last_export = self.export_async(patterns, x_values, x_int, required_parts, output_folder,
+                                                 trace_format)
 
         # return patterns, x_used
         return patterns
+
+    def export_async(self, patterns, x_values, x_int, required_parts, output_folder="output",
+                     trace_format="csv"):
+        """Antrikan export ke writer thread (satu thread, urutan job dijaga); return Future."""
+        if self._export_executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._export_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="export-writer")
+        future = self._export_executor.submit(self.export, patterns, x_values, x_int, required_parts,
+                                              output_folder, trace_format)
+        self._pending_exports.append(future)
+        return future
+
+    def flush_exports(self, timeout=None):
+        """
+        Tunggu semua export background yang sudah diantrikan; return list hasil (dict path)
+        sesuai urutan submit. Export yang gagal: exception pertamanya dilempar di sini
+        (setelah semua job selesai), bukan hilang di thread.
+        """
+        pending, self._pending_exports = self._pending_exports, []
+        from concurrent.futures import wait
+        wait(pending, timeout=timeout)
+        not_done = [f for f in pending if not f.done()]
+        if not_done:
+            self._pending_exports = not_done + self._pending_exports
+            raise TimeoutError(f"{len(not_done)} export(s) still running")
+        for future in pending:
+            if future.exception() is not None:
+                raise future.exception()
+        return [future.result() for future in pending]
+
+    def close(self):
+        """flush_exports() lalu hentikan writer thread."""
+        try:
+            return self.flush_exports()
+        finally:
+            if self._export_executor is not None:
+                self._export_executor.shutdown(wait=True)
+                self._export_executor = None
+
+    def run_batch(self, jobs, workers=None, output_root="output"):
+        """
+        Solve banyak cutting list independen secara paralel di process pool.
+        - jobs        : list BatchJob (atau tuple (required_parts, stocks))
+        - workers     : jumlah process (default os.cpu_count())
+        - output_root : folder induk untuk job tanpa output_folder (<output_root>/<name>,
+                        diberi suffix _2, _3, ... bila nama job sama, mis. CSV senama di folder lain)
+        Return list BatchResult dengan urutan sama seperti jobs; job yang gagal
+        punya .error (traceback) dan tidak menghentikan job lain.
+        Tiap job ditulis ke output_folder miliknya sendiri. BatchJob milik caller tidak diubah.
+        """
+        jobs = [job if isinstance(job, BatchJob) else BatchJob(*job) for job in jobs]
+        used = {os.path.normpath(job.output_folder) for job in jobs if job.output_folder is not None}
+        prepared = []
+        for n, job in enumerate(jobs):
+            name = job.name or f"job_{n+1}"
+            output_folder = job.output_folder
+            if output_folder is None:
+                output_folder = base = os.path.join(output_root, name)
+                suffix = 2
+                while os.path.normpath(output_folder) in used:
+                    output_folder = f"{base}_{suffix}"
+                    suffix += 1
+                used.add(os.path.normpath(output_folder))
+            # tabel kolom: dikirim ke worker sebagai beberapa array, bukan object per baris
+            prepared.append(replace(job, name=name, output_folder=output_folder,
+                                    required_parts=as_part_table(job.required_parts),
+                                    stocks=as_stock_table(job.stocks)))
+        jobs = prepared
+        if not jobs:
+            return []
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        workers = min(workers or os.cpu_count() or 1, len(jobs))
+        results = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_run_batch_job, self.strategy, self.cache, job) for job in jobs]
+            for job, future in zip(jobs, futures):
+                try:
+                    results.append(future.result())
+                except Exception:
+                    # mis. worker mati / job tidak bisa di-pickle
+                    results.append(BatchResult(job.name, job.output_folder, error=traceback.format_exc()))
+        return results
     
@@ -0,0 +1,4 @@
+from core.optimizer_strategy.optimizer_strategy import OptimizerStrategy, OptimizationCancelled
+from core.optimizer_strategy.column_generation import ColumnGeneration
+from core.optimizer_strategy.modified_first_fit_decreasing import ModifiedFirstFitDecreasing
+from core.optimizer_strategy.portfolio import Portfolio
@@ -0,0 +1,24 @@
+"""
+bounds.py
+Helper cost / lower bound yang dipakai bersama strategy (ColumnGeneration, FFD) tanpa
+ikut mengimpor solver LP.
+"""
+
+import math
+
+
+def cost_granularity(stock_costs):
+    """gcd cost stock (integer): setiap cost solusi integer adalah kelipatannya."""
+    unit = 0
+    for cost in stock_costs:
+        if float(cost) != int(cost):
+            return None
+        unit = math.gcd(unit, int(cost))
+    return unit or None
+
+
+def round_up_cost(value, cost_unit):
+    """ceil(value) dalam satuan cost_unit (toleransi numerik LP 1e-6 relatif)."""
+    if cost_unit is None:
+        return value
+    return cost_unit * math.ceil(value / cost_unit - 1e-6)
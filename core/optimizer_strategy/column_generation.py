@@ -0,0 +1,827 @@
+import math
+import os
+import re
+import tempfile
+import time
+import numpy as np
+import pulp
+from core.optimizer_strategy.optimizer_strategy import OptimizerStrategy, OptimizationCancelled
+from core.optimizer_strategy.knapsack import (
+    KNAPSACK_ENGINES, CapacityCompression, solve_bounded_knapsack, solve_unbounded_knapsack, solve_unbounded_knapsack_multi
+)
+from core.optimizer_strategy.restricted_master import RestrictedMaster, MASTER_BACKENDS
+from core.optimizer_strategy.pattern_pool import PatternPool
+from core.optimizer_strategy.bounds import cost_granularity, round_up_cost
+from core.entities import as_part_table, as_stock_table
+from core.telemetry import Telemetry
+
+PRICING_MODES = ("shared", "per_stock")
+INTEGER_MODES = ("mip", "rounding")
+SMOOTHING_ALPHA_START = 0.5   # alpha awal dual_smoothing="auto"
+SMOOTHING_ALPHA_MAX = 0.8
+SMOOTHING_ALPHA_STEP = 0.1
+
+
+class ColumnGeneration(OptimizerStrategy):
+    def __init__(self, pricing_engine="numpy", master_backend="auto", pricing_mode="shared",
+                 columns_per_iteration=1, time_limit=None, bound_stop=False,
+                 integer_time_limit=None, integer_gap_rel=None, integer_mode="mip",
+                 compress_capacity=True, dual_smoothing=None):
+        """
+        pricing_engine: engine untuk knapsack subproblem (lihat KNAPSACK_ENGINES)
+        - "numpy"  : sweep per item dengan array NumPy (default, cepat)
+        - "python" : DP murni Python (referensi / benchmark)
+        master_backend: backend RestrictedMaster ("auto", "highs", "cbc")
+        - "auto" memakai HiGHS (warm start) bila highspy terpasang, selain itu CBC
+        pricing_mode: "shared" (satu DP untuk semua panjang stock) atau "per_stock"
+        columns_per_iteration: maksimum pattern baru yang ditambahkan per iterasi LP
+        time_limit: batas waktu total optimize (detik, None = tanpa batas). Bila habis,
+        column generation berhenti dan integer master memakai sisa waktu; hasil terbaik
+        yang ada dikembalikan dan gap-nya dicatat di last_stats / event "done".
+        bound_stop: hentikan column generation begitu ceil(lower bound Farley) = ceil(objective RMP);
+        bila integer master belum mencapai ceil(LP), column generation dilanjutkan sampai optimal
+        integer_time_limit: batas waktu per solve integer master (detik); bila habis, incumbent
+        terbaik dipakai (minimal solusi LP yang dibulatkan, dipakai juga sebagai warm start CBC)
+        integer_gap_rel: CBC berhenti bila gap relatif incumbent vs bound <= nilai ini
+        integer_mode: cara mendapatkan solusi integer dari LP
+        - "mip"      : integer master dengan CBC (default, kualitas terbaik)
+        - "rounding" : heuristik residual rounding tanpa CBC (lihat residual_rounding);
+                       jauh lebih cepat, bila gagal tetap jatuh ke CBC
+        compress_capacity: DP pricing di atas kapasitas yang dinormalisasi (gcd panjang part,
+        floor ke panjang terpakai terbesar yang mungkin; lihat CapacityCompression). Hasil
+        identik, DP lebih kecil bila unit panjang sangat halus; False = DP sepanjang stock.
+        dual_smoothing: stabilisasi duals untuk pricing (Wentges smoothing) supaya tail-off
+        column generation lebih pendek; LP optimal tetap terjamin (lihat smoothed_pricing)
+        - "auto" : alpha diatur otomatis tiap iterasi dari arah subgradient
+        - float  : alpha tetap di [0, 1)
+        - None   : tanpa smoothing, pricing langsung di duals RMP (default; duals smoothing lebih
+                   padat sehingga tiap DP pricing lebih mahal, untung hanya bila tail-off panjang)
+        """
+        if pricing_engine not in KNAPSACK_ENGINES:
+            raise ValueError(f"Unknown pricing_engine: {pricing_engine!r} "
+                             f"(choose from {sorted(KNAPSACK_ENGINES)})")
+        if master_backend not in MASTER_BACKENDS:
+            raise ValueError(f"Unknown master_backend: {master_backend!r} "
+                             f"(choose from {MASTER_BACKENDS})")
+        if pricing_mode not in PRICING_MODES:
+            raise ValueError(f"Unknown pricing_mode: {pricing_mode!r} "
+                             f"(choose from {PRICING_MODES})")
+        self.pricing_engine = pricing_engine
+        self.master_backend = master_backend
+        if columns_per_iteration < 1:
+            raise ValueError("columns_per_iteration must be >= 1")
+        self.pricing_mode = pricing_mode
+        self.columns_per_iteration = columns_per_iteration
+        if time_limit is not None and time_limit <= 0:
+            raise ValueError("time_limit must be > 0 (or None)")
+        self.time_limit = time_limit
+        self.bound_stop = bound_stop
+        if integer_time_limit is not None and integer_time_limit <= 0:
+            raise ValueError("integer_time_limit must be > 0 (or None)")
+        self.integer_time_limit = integer_time_limit
+        self.integer_gap_rel = integer_gap_rel
+        if integer_mode not in INTEGER_MODES:
+            raise ValueError(f"Unknown integer_mode: {integer_mode!r} "
+                             f"(choose from {INTEGER_MODES})")
+        self.integer_mode = integer_mode
+        self.compress_capacity = compress_capacity
+        if dual_smoothing not in (None, "auto") and not (isinstance(dual_smoothing, (int, float))
+                                                         and 0 <= dual_smoothing < 1):
+            raise ValueError("dual_smoothing must be 'auto', a float in [0, 1) or None")
+        self.dual_smoothing = dual_smoothing
+
+    def get_params(self):
+        return {
+            "pricing_engine": self.pricing_engine,
+            "master_backend": self.master_backend,
+            "pricing_mode": self.pricing_mode,
+            "columns_per_iteration": self.columns_per_iteration,
+            "time_limit": self.time_limit,
+            "bound_stop": self.bound_stop,
+            "integer_time_limit": self.integer_time_limit,
+            "integer_gap_rel": self.integer_gap_rel,
+            "integer_mode": self.integer_mode,
+            "compress_capacity": self.compress_capacity,
+            "dual_smoothing": self.dual_smoothing,
+        }
+
+    def optimize(self, required_parts_aggregated, stocks_aggregated,
+                 progress_callback=None, cancel_event=None):
+        """
+        Column Generation + Integer Recovery with Feasibility Correction
+        ---------------------------------------------------------------
+        Tahapan:
+        1. Generate trivial patterns.
+        2. Jalankan column generation (LP relax) sampai optimal, atau sampai lower bound
+           Farley (dibulatkan ke atas ke kelipatan cost batang) sama dengan objective RMP.
+        3. Jalankan integer master; CBC berhenti begitu mencapai ceil(LP bound).
+           Dengan integer_mode="rounding": residual rounding tanpa CBC (CBC hanya bila gagal).
+        - Jika infeasible → hasilkan pattern baru berdasarkan duals dari LP terakhir.
+        - Ulangi sampai feasible atau tidak ada pattern baru yang berguna.
+
+        progress_callback(dict) menerima event stream core.telemetry (tanpa callback
+        tidak ada output sama sekali; untuk log console pakai telemetry.ConsoleReporter).
+        cancel_event (threading.Event) dicek di antara iterasi; bila di-set →
+        OptimizationCancelled. Solve CBC yang sedang berjalan tidak diinterupsi.
+
+        Statistik per fase (waktu dalam detik) disimpan di self.last_stats:
+        lp_iterations, master_time, pricing_time, integer_attempts, integer_time,
+        lp_objective, integer_objective, columns, lower_bound, gap_abs, gap_rel, stop_reason,
+        integer_bound (bound CBC untuk kolom yang ada), integer_mode (mode yang menghasilkan solusi),
+        dp_capacity / dp_capacity_raw (kapasitas tabel DP pricing dengan / tanpa compress_capacity),
+        capacity_unit (gcd panjang part), pricing_calls (jumlah pricing fase LP), mispricings
+        (pricing di titik smoothing yang tidak menghasilkan kolom improving), smoothing_alpha
+        (alpha terakhir).
+        """
+        started = time.perf_counter()
+        deadline = None if self.time_limit is None else started + self.time_limit
+        telemetry = Telemetry([progress_callback])
+        stats = self.last_stats = {
+            "lp_iterations": 0, "master_time": 0.0, "pricing_time": 0.0,
+            "integer_attempts": 0, "integer_time": 0.0,
+            "lp_objective": None, "integer_objective": None, "columns": 0,
+            "lower_bound": None, "gap_abs": None, "gap_rel": None, "stop_reason": None,
+            "integer_bound": None, "integer_mode": None,
+            "dp_capacity": None, "dp_capacity_raw": None, "capacity_unit": 1,
+            "pricing_calls": 0, "mispricings": 0, "smoothing_alpha": None,
+        }
+
+        def check_cancel():
+            if cancel_event is not None and cancel_event.is_set():
+                raise OptimizationCancelled("Optimization cancelled")
+
+        def time_left():
+            return None if deadline is None else deadline - time.perf_counter()
+
+        # list Parts / Stock (caller lama) → tabel kolom
+        required_parts_aggregated = as_part_table(required_parts_aggregated)
+        stocks_aggregated = as_stock_table(stocks_aggregated)
+
+        # =====================================================
+        # 1️⃣ Generate trivial patterns
+        # =====================================================
+        patterns = self.generate_trivial_patterns(required_parts_aggregated, stocks_aggregated)
+        if not patterns:
+            raise ValueError("No trivial patterns (check item vs stock lengths).")
+
+        # =====================================================
+        # 2️⃣ Data dasar
+        # =====================================================
+        TOL = 1e-8
+        MAX_LP_ITERS = 200
+        MAX_INT_ITERS = 10  # batas tambahan pattern integer
+        MIN_INT_TIME = 1.0  # waktu minimum CBC bila time_limit sudah habis di fase LP
+
+        part_lengths = required_parts_aggregated.length.tolist()
+        demands = required_parts_aggregated.quantity.tolist()
+        stock_lengths = stocks_aggregated.length.tolist()
+        stock_limits = stocks_aggregated.limits()
+        stock_costs = stocks_aggregated.cost.tolist()
+
+        # Cost solusi integer selalu kelipatan gcd(cost stock) → bound bisa dibulatkan ke atas
+        cost_unit = self.cost_granularity(stock_costs)
+
+        stats["dp_capacity_raw"] = stats["dp_capacity"] = max(stock_lengths)
+        if self.compress_capacity:
+            compression = self.capacity_compression(part_lengths, stock_lengths)
+            stats["dp_capacity"], stats["capacity_unit"] = compression.capacity, compression.unit
+
+        telemetry.emit("start", parts=len(part_lengths), stocks=len(stock_lengths), columns=len(patterns),
+                       dp_capacity=stats["dp_capacity"], dp_capacity_raw=stats["dp_capacity_raw"])
+
+        # =====================================================
+        # 3️⃣ Column generation (LP relax)
+        # =====================================================
+        # RMP dibangun sekali; tiap iterasi hanya menambah kolom baru lalu re-solve
+        master = RestrictedMaster(demands, stock_limits, stock_costs, backend=self.master_backend)
+        master.add_pool(patterns)
+
+        lower_bound = 0.0
+        # Wentges: stability center = duals feasible (duals / theta) dengan Farley bound terbaik sejauh ini
+        center = None
+        alpha = SMOOTHING_ALPHA_START if self.dual_smoothing == "auto" else (self.dual_smoothing or 0.0)
+
+        def column_generation(bound_stop=True):
+            """Iterasi LP sampai optimal / bound / time limit; bisa dilanjutkan (master persisten)."""
+            nonlocal lower_bound, center, alpha
+            while stats["lp_iterations"] < MAX_LP_ITERS:
+                check_cancel()
+
+                # --- Solve LP (warm start dari basis sebelumnya bila backend mendukung) ---
+                t0 = time.perf_counter()
+                obj = master.solve()
+                master_time = time.perf_counter() - t0
+                stats["master_time"] += master_time
+                stats["lp_iterations"] += 1
+                stats["lp_objective"] = obj
+
+                # --- Duals (for subproblem) ---
+                duals = master.duals
+                self.last_duals = duals
+
+                # --- Knapsack subproblem (column generation), di duals yang di-smoothing ---
+                t0 = time.perf_counter()
+                new_patterns, bound, point, mispricings = self.smoothed_pricing(
+                    duals, center, alpha, part_lengths, demands, stock_lengths, stock_costs,
+                    tol=TOL, max_columns=self.columns_per_iteration, existing=patterns)
+                pricing_time = time.perf_counter() - t0
+                stats["pricing_time"] += pricing_time
+                stats["pricing_calls"] += mispricings + 1
+                stats["mispricings"] += mispricings
+
+                # --- Lower bound Farley dari nilai pricing (titik terbaik jadi stability center) ---
+                if bound > lower_bound or center is None:
+                    lower_bound, center = max(lower_bound, bound), point
+                if self.dual_smoothing == "auto" and not mispricings and new_patterns:
+                    alpha = self.adjust_smoothing_alpha(alpha, duals, point, demands, new_patterns[0],
+                                                        obj / stock_costs[new_patterns[0]["stock_index"]])
+                stats["smoothing_alpha"] = alpha
+
+                added = []
+                for new_pattern in new_patterns:
+                    if patterns.add(new_pattern["stock_index"], new_pattern["pattern"]) is not None:
+                        master.add_column(new_pattern["stock_index"], new_pattern["pattern"])
+                        added.append(new_pattern)
+
+                telemetry.emit("lp_iteration", iteration=stats["lp_iterations"], objective=obj,
+                               lower_bound=lower_bound, master_time=master_time, pricing_time=pricing_time,
+                               columns_added=len(added), alpha=alpha, mispricings=mispricings,
+                               best_reduced_cost=self._reduced_cost(new_patterns[0], duals, stock_costs)
+                               if new_patterns else None,
+                               columns=len(patterns), patterns=added)
+
+                if not new_patterns:
+                    lower_bound = obj
+                    return "optimal"
+                if bound_stop and self.round_up_cost(lower_bound, cost_unit) >= self.round_up_cost(obj, cost_unit):
+                    # kolom baru tidak bisa lagi menurunkan ceil(LP bound)
+                    return "bound"
+                if deadline is not None and time_left() <= 0:
+                    return "time_limit"
+            return "max_iterations"
+
+        def finish_lp(stop_reason):
+            # LP selesai (kolom yang ditambah setelah solve terakhir bernilai 0)
+            x_values = master.x_values + [0.0] * (len(patterns) - len(master.x_values))
+            stats["columns"] = len(patterns)
+            stats["stop_reason"] = stop_reason
+            stats["lower_bound"] = self.round_up_cost(lower_bound, cost_unit)
+            telemetry.emit("lp_done", iterations=stats["lp_iterations"], objective=stats["lp_objective"],
+                           lower_bound=lower_bound, integer_target=stats["lower_bound"],
+                           columns=len(patterns), converged=stop_reason in ("optimal", "bound"),
+                           reason=stop_reason)
+            return x_values
+
+        stop_reason = column_generation(bound_stop=self.bound_stop)
+        x_values = finish_lp(stop_reason)
+
+        # =====================================================
+        # 4️⃣ Integer phase (feasibility repair)
+        # =====================================================
+        # CBC boleh berhenti bila incumbent - bound < satu cost_unit: tidak ada solusi
+        # integer (kelipatan cost_unit) yang lebih murah lagi, jadi ceil(LP) sudah tercapai
+        gap_abs = None if cost_unit is None else cost_unit * (1 - 1e-6)
+        best = None  # (objective, x_int) incumbent terbaik; pool hanya bertambah, jadi tetap valid
+        x_int = [0] * len(patterns)
+
+        if self.integer_mode == "rounding":
+            check_cancel()
+            telemetry.emit("integer_attempt", attempt=1, columns=len(patterns))
+            n_columns = len(patterns)
+            t0 = time.perf_counter()
+            x_heuristic = self.residual_rounding(patterns, x_values, part_lengths, demands, stock_lengths,
+                                                 stock_limits, stock_costs, duals=self.last_duals)
+            integer_time = time.perf_counter() - t0
+            # pattern baru dari heuristik juga masuk RMP (pool dan master tetap sinkron)
+            master.add_pool(patterns, start=n_columns)
+            stats["integer_time"] += integer_time
+            stats["columns"] = len(patterns)
+            feasible = x_heuristic is not None
+            objective = float(x_heuristic @ patterns.costs(stock_costs)) if feasible else None
+            telemetry.emit("integer_result", attempt=1, status="Heuristic" if feasible else "Infeasible",
+                           feasible=feasible, objective=objective, bound=None, integer_time=integer_time,
+                           columns_added=len(patterns) - n_columns)
+            if feasible:
+                best = (objective, [int(v) for v in x_heuristic])
+                stats["integer_mode"] = "rounding"
+
+        # mode "rounding" yang berhasil tidak memanggil CBC sama sekali
+        for int_iter in range(MAX_INT_ITERS if best is None else 0):
+            check_cancel()
+            remaining = time_left()
+            if remaining is not None and remaining <= 0 and int_iter > 0:
+                break
+            telemetry.emit("integer_attempt", attempt=int_iter + 1, columns=len(patterns))
+            budget = self.integer_time_limit
+            if remaining is not None:
+                # time_limit habis tetap memberi CBC MIN_INT_TIME (timeLimit negatif → "Infeasible")
+                budget = max(remaining, MIN_INT_TIME)
+                if self.integer_time_limit is not None:
+                    budget = min(budget, self.integer_time_limit)
+            t0 = time.perf_counter()
+            x_int, status = self.solve_integer_master(
+                patterns, part_lengths, demands, stock_lengths, stock_limits, stock_costs,
+                use_active_only=False, x_lp=x_values, solver_msg=False,
+                time_limit=budget, gap_abs=gap_abs, gap_rel=self.integer_gap_rel, warm_start=True,
+            )
+            integer_time = time.perf_counter() - t0
+            stats["integer_time"] += integer_time
+            stats["integer_attempts"] += 1
+            stats["columns"] = len(patterns)
+
+            if status in ("Optimal", "Integer Feasible", "Optimal Solution Found"):
+                objective = float(np.asarray(x_int) @ patterns.costs(stock_costs))
+                stats["integer_bound"] = self.last_integer_bound
+                telemetry.emit("integer_result", attempt=int_iter + 1, status=status, feasible=True,
+                               objective=objective, bound=self.last_integer_bound,
+                               integer_time=integer_time, columns_added=0)
+                if best is None or objective < best[0]:
+                    best = (objective, x_int)
+                    stats["integer_mode"] = "mip"
+                if (stop_reason == "bound" and objective > stats["lower_bound"]
+                        and (deadline is None or time_left() > 0)):
+                    # ceil(LP) belum tercapai dengan kolom yang ada: lanjutkan CG sampai optimal,
+                    # integer master di-solve ulang hanya bila ada kolom baru
+                    n_columns = len(patterns)
+                    stop_reason = column_generation(bound_stop=False)
+                    x_values = finish_lp(stop_reason)
+                    if len(patterns) > n_columns:
+                        continue
+                break
+
+            # --- Infeasible: generate new column from duals again ---
+            new_patterns = self.price_patterns(self.last_duals, part_lengths, stock_lengths, stock_costs,
+                                               tol=TOL, max_columns=self.columns_per_iteration,
+                                               existing=patterns)
+            for new_pattern in new_patterns:
+                if patterns.add(new_pattern["stock_index"], new_pattern["pattern"]) is not None:
+                    master.add_column(new_pattern["stock_index"], new_pattern["pattern"])
+            telemetry.emit("integer_result", attempt=int_iter + 1, status=status, feasible=False,
+                           objective=None, integer_time=integer_time, columns_added=len(new_patterns))
+            if not new_patterns:
+                # No more improving pattern found, terminating
+                break
+
+        x_values = x_values + [0.0] * (len(patterns) - len(x_values))
+        if best is None:
+            telemetry.emit("done", status="infeasible", lp_objective=stats["lp_objective"],
+                           integer_objective=None, lower_bound=stats["lower_bound"], gap_abs=None,
+                           gap_rel=None, elapsed_total=time.perf_counter() - started)
+            return patterns, x_values, x_int
+
+        objective, x_int = best
+        x_int = list(x_int) + [0] * (len(patterns) - len(x_int))
+        stats["integer_objective"] = objective
+        stats["gap_abs"] = max(0.0, objective - stats["lower_bound"])
+        stats["gap_rel"] = stats["gap_abs"] / stats["lower_bound"] if stats["lower_bound"] else 0.0
+        telemetry.emit("done", status="feasible", lp_objective=stats["lp_objective"],
+                       integer_objective=objective, lower_bound=stats["lower_bound"],
+                       gap_abs=stats["gap_abs"], gap_rel=stats["gap_rel"],
+                       elapsed_total=time.perf_counter() - started)
+        return patterns, x_values, x_int
+
+    @staticmethod
+    def rounded_incumbent(pool, x_lp, demands, stock_limits):
+        """
+        Solusi integer feasible dari LP: ceil(x_lp) selalu memenuhi demand (A >= 0),
+        lalu unit yang berlebih dibuang (pattern dengan waste terbesar dulu).
+        Return np.ndarray int64 per pattern, atau None bila melanggar stock limit.
+        """
+        x = np.zeros(len(pool), dtype=np.int64)
+        x_lp = np.asarray(x_lp[:len(pool)], dtype=float)
+        x[:len(x_lp)] = np.ceil(np.maximum(x_lp, 0.0) - 1e-9)
+        x = ColumnGeneration._drop_surplus(pool, x, demands)
+        if x is None:
+            return None
+
+        bars_per_stock = np.bincount(pool.stock_index, weights=x, minlength=len(stock_limits))
+        for k, limit in enumerate(stock_limits):
+            if limit is not None and bars_per_stock[k] > limit:
+                return None
+        return x
+
+    @staticmethod
+    def _drop_surplus(pool, x, demands):
+        """Buang unit pattern yang tidak dibutuhkan demand (waste terbesar dulu); None bila x tidak feasible."""
+        matrix = pool.matrix.astype(np.int64)
+        demands = np.asarray(demands, dtype=np.int64)
+        surplus = x @ matrix - demands
+        if np.any(surplus < 0):
+            return None
+
+        for j in np.argsort(-pool.waste, kind="stable"):
+            if x[j] == 0:
+                continue
+            used = matrix[j] > 0
+            removable = min(int(x[j]), int(np.min(surplus[used] // matrix[j, used]))) if used.any() else int(x[j])
+            if removable > 0:
+                x[j] -= removable
+                surplus -= removable * matrix[j]
+        return x
+
+    def residual_rounding(self, pool, x_lp, part_lengths, demands, stock_lengths, stock_limits,
+                          stock_costs, duals=None, passes=3):
+        """
+        Heuristik primal pengganti integer master (tanpa CBC):
+        1. x = floor(x_lp); sisa demand r = d - A x.
+        2. Pattern yang ada dibulatkan ke atas (bagian pecahan terbesar dulu) selama
+           pattern itu tidak menghasilkan part berlebih (a_j <= r) dan stock masih ada.
+        3. Sisa r ditutup dengan bounded knapsack (batas item = r) per stock: pilih stock
+           dengan value/cost terbaik, pakai pattern itu sebanyak mungkin, ulangi sampai r = 0.
+           Value item = duals LP; tiap pass berikutnya value dikoreksi dengan cost per
+           panjang dari pattern yang dipakai (sequential value correction), hasil terbaik diambil.
+        Pattern baru dimasukkan ke `pool`. Return np.ndarray int64 per pattern di pool,
+        atau None bila sisa demand tidak bisa ditutup (stock habis / part tidak muat).
+        """
+        part_lengths = np.asarray(part_lengths, dtype=np.int64)
+        demands = np.asarray(demands, dtype=np.int64)
+        costs = np.asarray(stock_costs, dtype=float)
+        limits = np.array([np.inf if limit is None else limit for limit in stock_limits], dtype=float)
+        matrix = pool.matrix.astype(np.int64)
+        n_base = len(pool)
+
+        x_lp = np.maximum(np.asarray(x_lp[:n_base], dtype=float), 0.0)
+        x_base = np.zeros(n_base, dtype=np.int64)
+        x_base[:len(x_lp)] = np.floor(x_lp + 1e-9)
+        fraction = np.zeros(n_base)
+        fraction[:len(x_lp)] = x_lp - x_base[:len(x_lp)]
+        residual = np.maximum(demands - x_base @ matrix, 0)
+        available = limits - np.bincount(pool.stock_index, weights=x_base, minlength=len(limits))
+
+        for j in np.argsort(-fraction, kind="stable"):
+            if fraction[j] <= 1e-9 or not residual.any():
+                break
+            k = int(pool.stock_index[j])
+            if available[k] >= 1 and np.all(matrix[j] <= residual):
+                x_base[j] += 1
+                residual -= matrix[j]
+                available[k] -= 1
+
+        # nilai awal: duals LP; part dengan dual 0 tetap diberi nilai kecil (sebanding panjang)
+        unit_cost = float(np.min(costs / np.asarray(stock_lengths, dtype=float)))
+        values = part_lengths * unit_cost * 1e-3
+        if duals is not None:
+            values = np.maximum(np.asarray(duals, dtype=float), values)
+
+        best = None
+        for _ in range(passes):
+            cover = self._cover_residual(residual.copy(), available.copy(), values, part_lengths,
+                                         stock_lengths, costs)
+            if cover is None:
+                return None
+            cost = sum(costs[k] * m for k, _, m in cover)
+            if best is None or cost < best[0]:
+                best = (cost, cover)
+            if not cover:
+                break
+            # koreksi value: cost per panjang pattern yang menampung item (waste ikut dibebankan)
+            corrected = values.copy()
+            for k, counts, _ in cover:
+                used = counts > 0
+                share = costs[k] / float(counts @ part_lengths)
+                corrected[used] = 0.5 * values[used] + 0.5 * part_lengths[used] * share
+            values = corrected
+
+        x = np.zeros(len(pool) + len(best[1]), dtype=np.int64)
+        x[:n_base] = x_base
+        for k, counts, m in best[1]:
+            j = pool.find(k, counts)
+            if j is None:
+                j = pool.add(k, counts)
+            x[j] += m
+        x = x[:len(pool)]
+        return self._drop_surplus(pool, x, demands)
+
+    @staticmethod
+    def _cover_residual(residual, available, values, part_lengths, stock_lengths, costs):
+        """Greedy bounded knapsack untuk residual; return list (stock_index, counts, multiplicity) atau None."""
+        # DP di atas panjang / gcd (exact, lihat CapacityCompression)
+        compression = CapacityCompression(part_lengths, stock_lengths, reachable=False)
+        cover = []
+        while residual.any():
+            best = None
+            for k, Lk in enumerate(stock_lengths):
+                if available[k] < 1:
+                    continue
+                value, counts = solve_bounded_knapsack(values, compression.weights, residual,
+                                                       compression.capacities[k])
+                if value > 0 and (best is None or value / costs[k] > best[0]):
+                    best = (value / costs[k], k, np.asarray(counts, dtype=np.int64))
+            if best is None:
+                return None
+            _, k, counts = best
+            used = counts > 0
+            multiplicity = int(min(available[k], np.min(residual[used] // counts[used])))
+            residual -= multiplicity * counts
+            available[k] -= multiplicity
+            cover.append((k, counts, multiplicity))
+        return cover
+
+    # ---------------------------
+    # Bound helpers
+    # ---------------------------
+    # helper bersama (core/optimizer_strategy/bounds.py), tetap bisa dipanggil lewat class
+    cost_granularity = staticmethod(cost_granularity)
+    round_up_cost = staticmethod(round_up_cost)
+
+    @staticmethod
+    def farley_bound(duals, demands, stock_costs, pricing_values):
+        """
+        Lower bound LP (Farley) dari duals RMP:
+        theta = max(1, max_k v_k / c_k) dengan v_k = nilai knapsack terbaik stock k,
+        maka duals/theta feasible untuk dual LP lengkap → bound = (duals · demands) / theta.
+        Dual stock limit diabaikan (diset 0), sehingga bound tetap valid walau limit aktif.
+        """
+        if not pricing_values:
+            return 0.0
+        theta = max([1.0] + [v / c for v, c in zip(pricing_values, stock_costs) if c > 0])
+        return float(np.dot(duals, demands)) / theta
+
+    def smoothed_pricing(self, duals, center, alpha, part_lengths, demands, stock_lengths, stock_costs,
+                         tol=1e-8, max_columns=1, existing=None):
+        """
+        Pricing dengan Wentges dual smoothing: pricing di titik alpha * center + (1 - alpha) * duals
+        (center = duals dengan Farley bound terbaik), bukan langsung di duals RMP yang berosilasi.
+        Hanya pattern dengan reduced cost negatif terhadap duals RMP yang dikembalikan.
+        Mis-pricing (tidak ada pattern seperti itu): pricing diulang langsung di duals RMP (alpha 0),
+        jadi hasil kosong tetap membuktikan LP optimal. Di sini pricing jauh lebih mahal dari solve
+        RMP, maka mis-pricing tidak diturunkan bertahap (maks. satu pricing tambahan per iterasi).
+        Return (patterns, Farley bound terbaik, titik dual feasible dengan bound itu, jumlah mis-pricing).
+        """
+        duals = np.asarray(duals, dtype=float)
+        demands = np.asarray(demands, dtype=float)
+        best_bound, best_point = -math.inf, duals
+        mispricings = 0
+        while True:
+            smoothed = center is not None and alpha > 0 and not mispricings
+            point = alpha * center + (1.0 - alpha) * duals if smoothed else duals
+            candidates = self.price_patterns(point, part_lengths, stock_lengths, stock_costs, tol=tol,
+                                             max_columns=max_columns, existing=existing)
+            bound = self.farley_bound(point, demands, stock_costs, self.last_pricing_values)
+            if bound > best_bound:
+                # point / theta: duals feasible dengan nilai = Farley bound (calon stability center)
+                value = float(point @ demands)
+                best_bound, best_point = bound, (point * (bound / value) if value > 0 else point)
+            if not smoothed:
+                return candidates, best_bound, best_point, mispricings
+            improving = [p for p in candidates if self._reduced_cost(p, duals, stock_costs) < -tol]
+            if improving:
+                return improving, best_bound, best_point, mispricings
+            mispricings += 1
+
+    @staticmethod
+    def adjust_smoothing_alpha(alpha, duals, point, demands, pattern, n_bars):
+        """
+        Alpha otomatis (Pessoa et al.): subgradient Lagrangian di titik pricing,
+        g = demands - n_bars * pattern (pattern terbaik, n_bars = perkiraan jumlah batang).
+        Bila g searah duals RMP - titik (sudut lancip), smoothing terlalu kuat → alpha turun;
+        selain itu alpha naik.
+        """
+        subgradient = np.asarray(demands, dtype=float) - n_bars * np.asarray(pattern["pattern"], dtype=float)
+        if float(subgradient @ (np.asarray(duals, dtype=float) - point)) > 0:
+            return max(0.0, alpha - SMOOTHING_ALPHA_STEP)
+        return min(SMOOTHING_ALPHA_MAX, alpha + (1.0 - alpha) * SMOOTHING_ALPHA_STEP)
+
+    @staticmethod
+    def _reduced_cost(pattern, duals, stock_costs):
+        return float(stock_costs[pattern["stock_index"]] - np.dot(duals, pattern["pattern"]))
+
+    # Untuk kemudahan: tambahkan id pada pattern
+    def pattern_id(p): return len(p)
+        
+
+    def generate_trivial_patterns(self, required_parts_aggregated, stocks_aggregated):
+        """Satu pattern per (stock, part): isi stock dengan part itu saja sebanyak mungkin."""
+        part_lengths = as_part_table(required_parts_aggregated).length.tolist()
+        stock_lengths = as_stock_table(stocks_aggregated).length.tolist()
+        trivial_patterns = PatternPool(part_lengths, stock_lengths,
+                                       capacity=len(part_lengths) * len(stock_lengths))
+        if not part_lengths:
+            return trivial_patterns
+
+        # qty[k, i] = berapa part i muat di stock k
+        qty = np.asarray(stock_lengths, dtype=np.int64)[:, None] // np.asarray(part_lengths, dtype=np.int64)[None, :]
+        for stock_index, part_index in zip(*np.nonzero(qty)):
+            pattern = np.zeros(len(part_lengths), dtype=np.int32)
+            pattern[part_index] = qty[stock_index, part_index]
+            trivial_patterns.add(int(stock_index), pattern)
+
+        return trivial_patterns
+    
+    # ---------------------------
+    # Helper: solve unbounded knapsack (maximize value)
+    # returns (best_value, counts_list) where counts_list is int counts per item
+    # unbounded so item can be chosen many times
+    # Dispatch ke engine yang dipilih (lihat core/optimizer_strategy/knapsack.py)
+    # ---------------------------
+
+    def solve_unbounded_knapsack(self, values, weights, capacity):
+        return solve_unbounded_knapsack(values, weights, capacity, engine=self.pricing_engine)
+
+    # ---------------------------
+    # Pricing: cari pattern dengan reduced cost negatif
+    # returns list pattern dict (maks. max_columns, urut reduced cost), kosong bila tidak ada
+    # - "shared"    : satu tabel DP sampai max(stock_lengths), dibaca untuk tiap stock
+    # - "per_stock" : DP terpisah per panjang stock (perilaku lama)
+    # Bila max_columns > 1: pattern terbaik tiap stock dulu, lalu pattern lain dengan
+    # reduced cost negatif yang direkonstruksi dari breakpoint tabel DP yang sama.
+    # existing: PatternPool opsional; pattern yang sudah ada di pool dilewati.
+    # ---------------------------
+
+    def capacity_compression(self, part_lengths, stock_lengths):
+        """CapacityCompression untuk pricing; dihitung sekali per problem (bukan per iterasi)."""
+        key = (tuple(part_lengths), tuple(stock_lengths))
+        cached = getattr(self, "_capacity_compression", None)
+        if cached is None or cached[0] != key:
+            cached = self._capacity_compression = (key, CapacityCompression(part_lengths, stock_lengths))
+        return cached[1]
+
+    def price_patterns(self, duals, part_lengths, stock_lengths, stock_costs, tol=1e-8, max_columns=1,
+                       existing=None):
+        engine = KNAPSACK_ENGINES[self.pricing_engine]
+        weights, capacities = part_lengths, stock_lengths
+        if self.compress_capacity:
+            compression = self.capacity_compression(part_lengths, stock_lengths)
+            weights, capacities = compression.weights, compression.capacities
+        if self.pricing_mode == "shared":
+            shared_table = engine(duals, weights, max(capacities))
+            tables = [shared_table] * len(capacities)
+        else:
+            tables = [engine(duals, weights, c) for c in capacities]
+
+        def make_pattern(k, counts):
+            Lk = stock_lengths[k]
+            return {
+                "stock_index": k,
+                "stock_length": Lk,
+                "pattern": tuple(counts),
+                "waste": Lk - sum(c*w for c, w in zip(counts, part_lengths))
+            }
+
+        # pattern terbaik per panjang stock (nilainya disimpan untuk lower bound Farley)
+        primary = []
+        self.last_pricing_values = []
+        for k, capacity in enumerate(capacities):
+            best_val, counts = tables[k].solve(capacity)
+            self.last_pricing_values.append(best_val)
+            reduced_cost = stock_costs[k] - best_val
+            if reduced_cost < -tol:
+                if existing is not None and existing.find(k, counts) is not None:
+                    continue
+                primary.append((reduced_cost, make_pattern(k, counts)))
+        primary.sort(key=lambda item: item[0])
+
+        # pattern tambahan dari tabel DP (kapasitas lebih kecil yang masih improving)
+        extras = []
+        if max_columns > len(primary):
+            seen = {(p["stock_index"], p["pattern"]) for _, p in primary}
+            for k, capacity in enumerate(capacities):
+                table = tables[k]
+                for c in table.breakpoints(capacity):
+                    reduced_cost = stock_costs[k] - table.best_value(c)
+                    if reduced_cost >= -tol:
+                        break
+                    key = (k, tuple(table.counts(c)))
+                    if key in seen or (existing is not None and existing.find(*key) is not None):
+                        continue
+                    seen.add(key)
+                    extras.append((reduced_cost, make_pattern(k, key[1])))
+                    if len(extras) >= max_columns:
+                        break
+            extras.sort(key=lambda item: item[0])
+
+        return [p for _, p in (primary + extras)[:max_columns]]
+
+    def solve_integer_master(self, patterns, part_lengths, demands,
+                         stock_lengths, stock_limits, stock_costs,
+                         use_active_only=False, x_lp=None, keep_only_positive_lp=True,
+                         solver_msg=False, time_limit=None, gap_abs=None, gap_rel=None,
+                         warm_start=False):
+        """
+        Solve integer master using provided patterns (PatternPool or list of dict).
+        parameters:
+        - patterns: PatternPool, atau list of pattern dicts (must have 'pattern' tuple and 'stock_index','stock_length')
+        - part_lengths: list[int]
+        - demands: list[int]
+        - stock_lengths, stock_limits, stock_costs: lists
+        - use_active_only: if True, include only patterns where x_lp > 0 (requires x_lp passed)
+        - x_lp: list of LP solution values (same order as patterns) - used if use_active_only True
+        - keep_only_positive_lp: when use_active_only True, whether to include patterns with x_lp > tol
+        - time_limit: CBC time limit in seconds (None = no limit)
+        - gap_abs: CBC stops once incumbent - best bound <= gap_abs (cost units)
+        - gap_rel: CBC stops once (incumbent - best bound) / incumbent <= gap_rel
+        - warm_start: seed CBC with the rounded-up LP solution (see rounded_incumbent); requires x_lp
+        returns:
+        - x_int: list of integer counts per pattern (same order as patterns; 0 for excluded)
+        - status: pulp status string; "Integer Feasible" when CBC stopped (time limit)
+          with an incumbent that is not proven optimal. If CBC finds nothing within the
+          time limit, the warm-start incumbent is returned with status "Integer Feasible".
+        The best bound reported by CBC (None if unknown) is stored in self.last_integer_bound.
+        """
+        pool = PatternPool.from_patterns(patterns, part_lengths, stock_lengths)
+        n_patterns = len(pool)
+
+        # select patterns to include
+        include_mask = np.ones(n_patterns, dtype=bool)
+        if use_active_only:
+            if x_lp is None:
+                raise ValueError("x_lp must be provided when use_active_only=True")
+            tol = 1e-9
+            if keep_only_positive_lp:
+                include_mask = np.asarray(x_lp[:n_patterns], dtype=float) > tol
+
+        # build ILP
+        prob = pulp.LpProblem("Integer_Master", pulp.LpMinimize)
+        x_vars = [pulp.LpVariable(f"X_int_{j}", lowBound=0, cat="Integer") if include_mask[j] else None
+                  for j in range(n_patterns)]
+        included = np.flatnonzero(include_mask)
+
+        # objective
+        costs = pool.costs(stock_costs)
+        prob += pulp.LpAffineExpression([(x_vars[j], float(costs[j])) for j in included])
+
+        # demand constraints: hanya entry non-zero dari kolom part i
+        matrix = pool.matrix
+        for i in range(len(part_lengths)):
+            column = matrix[:, i]
+            rows = included[column[included] > 0]
+            prob += pulp.LpAffineExpression([(x_vars[j], int(column[j])) for j in rows]) >= demands[i], f"dem_int_{i}"
+
+        # stock limits constraints (if finite)
+        stock_index = pool.stock_index
+        for k in range(len(stock_lengths)):
+            if stock_limits[k] is None:
+                continue
+            rows = included[stock_index[included] == k]
+            prob += pulp.LpAffineExpression([(x_vars[j], 1) for j in rows]) <= stock_limits[k], f"stock_limit_int_{k}"
+
+        # warm start: incumbent dari LP yang dibulatkan ke atas
+        incumbent = None
+        if warm_start and x_lp is not None:
+            incumbent = self.rounded_incumbent(pool, x_lp, demands, stock_limits)
+            if incumbent is not None and np.any(incumbent[~include_mask] > 0):
+                incumbent = None  # pattern incumbent tidak ikut di model (use_active_only)
+            if incumbent is not None:
+                for j in included:
+                    x_vars[j].setInitialValue(int(incumbent[j]))
+
+        # solve ILP (CBC default)
+        status, bound = _solve_cbc(prob, msg=solver_msg, time_limit=time_limit, gap_abs=gap_abs,
+                                   gap_rel=gap_rel, warm_start=incumbent is not None)
+        self.last_integer_bound = bound
+
+        x_int = [0] * n_patterns
+        if status not in ("Optimal", "Integer Feasible", "Optimal Solution Found"):
+            if incumbent is not None and (status == "Not Solved" or time_limit is not None):
+                # waktu habis sebelum CBC menemukan / membuktikan solusi (status apa pun setelah
+                # solve dengan time limit): incumbent warm start yang feasible tidak dibuang
+                return [int(v) for v in incumbent], "Integer Feasible"
+            # return zeros but include status so caller can handle
+            return x_int, status
+
+        for j in included:
+            x_int[j] = int(round(pulp.value(x_vars[j])))
+
+        return x_int, status
+
+
+class _KeptFilesCBC(pulp.PULP_CBC_CMD):
+    """PULP_CBC_CMD yang, dengan keepFiles=True, menaruh file model di tmpDir (bukan cwd)."""
+
+    def create_tmp_files(self, name, *args):
+        if self.keepFiles:
+            name = os.path.join(self.tmpDir, name)
+        return super().create_tmp_files(name, *args)
+
+
+def _solve_cbc(prob, msg=False, time_limit=None, gap_abs=None, gap_rel=None, warm_start=False):
+    """
+    Solve dengan PULP_CBC_CMD; return (status, best_bound).
+    best_bound dibaca dari log CBC ("Lower bound:"); bila optimal = objective.
+    Di Windows, warmStart (-mips) hanya jalan dengan keepFiles=True, jadi file model
+    ditulis ke folder sementara milik sendiri (lewat tmpDir; prob tidak diubah).
+    """
+    with tempfile.TemporaryDirectory(prefix="cls-cbc-") as tmp_dir:
+        keep_files = warm_start and os.name == "nt"
+        log_path = None if msg else os.path.join(tmp_dir, "cbc.log")
+        solver = _KeptFilesCBC(msg=msg, timeLimit=time_limit, gapAbs=gap_abs, gapRel=gap_rel,
+                               warmStart=warm_start, keepFiles=keep_files, logPath=log_path)
+        solver.tmpDir = tmp_dir
+        prob.solve(solver)
+
+        status = pulp.LpStatus[prob.status]
+        if status == "Optimal" and prob.sol_status == pulp.LpSolutionIntegerFeasible:
+            status = "Integer Feasible"
+
+        bound = None
+        if log_path is not None and os.path.exists(log_path):
+            with open(log_path, "r", errors="replace") as f:
+                match = re.search(r"^Lower bound:\s*(\S+)", f.read(), re.MULTILINE)
+            if match:
+                try:
+                    bound = float(match.group(1))
+                except ValueError:
+                    pass
+        if bound is None and status == "Optimal":
+            bound = pulp.value(prob.objective)
+    return status, bound
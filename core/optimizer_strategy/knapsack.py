@@ -0,0 +1,219 @@
+"""
+knapsack.py
+Engine untuk unbounded knapsack (pricing subproblem column generation).
+
+Setiap engine membangun satu KnapsackTable sampai kapasitas tertentu. Satu tabel
+sampai max(capacity) sudah memuat jawaban untuk semua kapasitas yang lebih kecil,
+jadi beberapa panjang stock bisa dibaca dari tabel yang sama.
+
+Kontrak single-capacity tetap sama:
+    solve_unbounded_knapsack(values, weights, capacity) -> (best_value, counts)
+- best_value : nilai maksimum untuk total berat <= capacity
+- counts     : list[int] jumlah tiap item (bisa dipilih berkali-kali)
+
+Ukuran DP = kapasitas, jadi skala unit yang besar (mis. panjang 3 desimal → x1000)
+membuat DP besar juga. CapacityCompression memperkecil kapasitas secara exact
+sebelum DP (gcd berat + floor ke berat terbesar yang bisa dibentuk).
+"""
+
+import math
+import numpy as np
+
+
+class KnapsackTable:
+    """
+    Hasil DP sampai `capacity`.
+    - best[c]   : nilai terbaik untuk total berat <= c
+    - anchor[c] : cap tempat rekonstruksi dimulai untuk kapasitas c (None = c sendiri)
+    - choice[c] : item terakhir yang dipakai untuk mencapai dp[c] (-1 = kosong)
+    """
+
+    def __init__(self, weights, capacity, best, choice, anchor=None):
+        self.weights = [int(w) for w in weights]
+        self.capacity = capacity
+        self.best = best
+        self.choice = choice
+        self.anchor = anchor
+
+    def best_value(self, capacity):
+        return float(self.best[capacity])
+
+    def counts(self, capacity):
+        counts = [0] * len(self.weights)
+        c = capacity if self.anchor is None else int(self.anchor[capacity])
+        while c > 0 and self.choice[c] != -1:
+            i = int(self.choice[c])
+            counts[i] += 1
+            c -= self.weights[i]
+        return counts
+
+    def solve(self, capacity):
+        """(best_value, counts) untuk satu kapasitas <= self.capacity."""
+        return self.best_value(capacity), self.counts(capacity)
+
+    def breakpoints(self, capacity):
+        """
+        Kapasitas c <= capacity tempat best[c] naik (best[c] > best[c-1]), urut menurun.
+        Tiap breakpoint direkonstruksi menjadi packing yang berbeda, jadi ini sumber
+        pattern alternatif (selain pattern terbaik di `capacity`) dari tabel yang sama.
+        """
+        best = np.asarray(self.best[:capacity + 1], dtype=float)
+        rising = np.flatnonzero(np.diff(best) > 1e-12) + 1
+        return rising[::-1].tolist()
+
+
+class CapacityCompression:
+    """
+    Normalisasi exact berat/kapasitas (integer) sebelum DP:
+    1. unit = gcd(berat > 0); berat // unit dan kapasitas // unit (total berat packing
+       selalu kelipatan unit, jadi packing yang muat tidak berubah).
+    2. reachable=True: kapasitas di-floor ke total berat terbesar <= kapasitas yang bisa
+       dibentuk dari berat (unbounded); tidak ada packing dengan berat di antaranya.
+    Tabel DP dengan weights/capacities hasil normalisasi memberi nilai dan packing
+    (termasuk tie-break rekonstruksi) yang sama dengan DP asli; ukuran DP = capacity + 1
+    (raw_capacity + 1 tanpa normalisasi).
+    """
+
+    def __init__(self, weights, capacities, reachable=True):
+        weights = [int(w) for w in weights]
+        capacities = [int(c) for c in capacities]
+        self.unit = math.gcd(*(w for w in weights if w > 0)) or 1
+        self.weights = [w // self.unit for w in weights]
+        self.capacities = [c // self.unit for c in capacities]
+        if reachable and self.capacities:
+            self.capacities = reachable_floor(self.weights, self.capacities)
+        self.raw_capacity = max(capacities, default=0)
+        self.capacity = max(self.capacities, default=0)
+
+
+def reachable_floor(weights, capacities):
+    """Per kapasitas: total berat terbesar <= kapasitas dari kombinasi unbounded weights."""
+    capacity = max(capacities)
+    reach = np.zeros(capacity + 1, dtype=bool)
+    reach[0] = True
+    for w in sorted({int(w) for w in weights if 0 < w <= capacity}):
+        # sama seperti sweep build_knapsack_table_numpy: baris selebar w, OR kumulatif per kolom
+        rows = -(-(capacity + 1) // w)
+        padded = np.zeros(rows * w, dtype=bool)
+        padded[:capacity + 1] = reach
+        reach = np.logical_or.accumulate(padded.reshape(rows, w), axis=0).ravel()[:capacity + 1]
+    reachable = np.flatnonzero(reach)
+    return reachable[np.searchsorted(reachable, capacities, side="right") - 1].tolist()
+
+
+def build_knapsack_table_python(values, weights, capacity):
+    """DP murni Python, capacity-major. Time O(n * capacity)."""
+    n = len(values)
+    # dp[v] = max value achievable with capacity v
+    dp = [-1e9] * (capacity + 1)
+    dp[0] = 0
+    # keep choice to reconstruct counts
+    prev_choice = [-1] * (capacity + 1)
+    for cap in range(1, capacity+1):
+        for i in range(n):
+            w = weights[i]
+            if w <= cap:
+                val = dp[cap - w] + values[i]
+                if val > dp[cap]:
+                    dp[cap] = val
+                    prev_choice[cap] = i
+    # dp di atas adalah "exact fill", jadi untuk tiap kapasitas simpan cap <= kapasitas
+    # dengan dp terbaik (prefix argmax, ambil yang pertama bila seri)
+    best = [0.0] * (capacity + 1)
+    anchor = [0] * (capacity + 1)
+    best_cap = 0
+    for cap in range(capacity + 1):
+        if dp[cap] > dp[best_cap]:
+            best_cap = cap
+        best[cap] = dp[best_cap]
+        anchor[cap] = best_cap
+    return KnapsackTable(weights, capacity, best, prev_choice, anchor)
+
+
+def build_knapsack_table_numpy(values, weights, capacity):
+    """
+    DP item-major di atas array NumPy. Time O(n * capacity) tapi hanya n operasi vektor.
+
+    dp[c] = nilai terbaik dengan total berat <= c (dp awal = 0 di semua cap).
+    Untuk item (w, v), update unbounded-nya:
+        dp_new[c] = max_t dp[c - t*w] + t*v
+    Dengan menyusun dp per baris selebar w (c = t*w + r), ini menjadi running max
+    sepanjang kolom dari (dp - t*v), lalu ditambah kembali t*v.
+    """
+    n = len(values)
+    dp = np.zeros(capacity + 1)
+    choice = np.full(capacity + 1, -1, dtype=np.int64)
+
+    for i in range(n):
+        w = int(weights[i])
+        v = float(values[i])
+        # item dengan value <= 0 tidak pernah memperbaiki dp (strict >)
+        if w <= 0 or w > capacity or v <= 0:
+            continue
+        rows = -(-(capacity + 1) // w)
+        padded = np.full(rows * w, -np.inf)
+        padded[:capacity + 1] = dp
+        grid = padded.reshape(rows, w)
+        offset = (np.arange(rows) * v)[:, None]
+        swept = (np.maximum.accumulate(grid - offset, axis=0) + offset).ravel()[:capacity + 1]
+        # toleransi kecil supaya noise floating point tidak dianggap perbaikan
+        better = swept > dp + 1e-9 * max(1.0, v)
+        dp[better] = swept[better]
+        choice[better] = i
+
+    return KnapsackTable(weights, capacity, dp, choice)
+
+
+KNAPSACK_ENGINES = {
+    "python": build_knapsack_table_python,
+    "numpy": build_knapsack_table_numpy,
+}
+
+
+def solve_unbounded_knapsack(values, weights, capacity, engine="numpy"):
+    return KNAPSACK_ENGINES[engine](values, weights, capacity).solve(capacity)
+
+
+def solve_unbounded_knapsack_multi(values, weights, capacities, engine="numpy"):
+    """Satu tabel DP sampai max(capacities); return list (best_value, counts) per kapasitas."""
+    if not capacities:
+        return []
+    table = KNAPSACK_ENGINES[engine](values, weights, max(capacities))
+    return [table.solve(c) for c in capacities]
+
+
+def solve_bounded_knapsack(values, weights, bounds, capacity):
+    """
+    Bounded knapsack: item i boleh dipilih maksimal bounds[i] kali.
+    Dipakai heuristik residual rounding (batas = sisa demand), bukan pricing.
+    0/1 DP dengan binary splitting (1, 2, 4, ... unit per potongan), satu sweep NumPy
+    per potongan; rekonstruksi dari mask `taken` per potongan.
+    Return (best_value, counts) seperti solve_unbounded_knapsack.
+    """
+    dp = np.zeros(capacity + 1)
+    pieces = []  # (item, unit, berat potongan, mask kapasitas tempat potongan dipakai)
+    for i, (v, w, b) in enumerate(zip(values, weights, bounds)):
+        v, w, b = float(v), int(w), int(b)
+        if w <= 0 or w > capacity or v <= 0 or b <= 0:
+            continue
+        b = min(b, capacity // w)
+        size = 1
+        while b > 0:
+            unit = min(size, b)
+            b -= unit
+            size *= 2
+            piece_weight = w * unit
+            candidate = dp[:capacity + 1 - piece_weight] + v * unit
+            better = candidate > dp[piece_weight:] + 1e-9 * max(1.0, v)
+            taken = np.zeros(capacity + 1, dtype=bool)
+            taken[piece_weight:] = better
+            dp[piece_weight:][better] = candidate[better]
+            pieces.append((i, unit, piece_weight, taken))
+
+    counts = [0] * len(weights)
+    c = capacity
+    for i, unit, piece_weight, taken in reversed(pieces):
+        if taken[c]:
+            counts[i] += unit
+            c -= piece_weight
+    return float(dp[capacity]), counts
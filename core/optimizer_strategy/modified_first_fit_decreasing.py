@@ -1,18 +1,207 @@
-from core.optimizer_strategy import optimizer_strategy
-from core.entities import Parts, Part, Stock
-
-class modified_first_fit_decreasing(optimizer_strategy):
-    def optimize(self, required_parts, available_stocks):
-        results = []
-
-    def sort_decreasing(self, required_parts):
-        required_parts_sorted = sorted(required_parts, key=lambda x: x['length'], reverse=True)
-        return required_parts_sorted
-
-    def itemize_parts(self, required_parts):
-        required_parts_itemize = []
-        for row in required_parts:
-            required_parts_itemize.extend(
-                [Part(part_type=row["part_type"], length=row['length'])] * int(row["quantity"]))
-        return required_parts_itemize
-    
+"""
+modified_first_fit_decreasing.py
+Heuristik First Fit Decreasing untuk order item-level yang sangat besar (100k+ potong),
+di mana column generation terlalu lambat.
+
+- Part diurutkan dari yang terpanjang; tiap part masuk ke batang terbuka PERTAMA
+  (urutan dibuka) yang sisanya cukup. Sisa batang terbuka disimpan di segment tree
+  (max per node), jadi mencari batang pertama yang muat = O(log n), bukan scan linear.
+- Quantity tidak di-expand per unit: batang yang ditemukan langsung diisi
+  min(quantity, sisa // length) potong (hasilnya identik dengan FFD per unit).
+- Multi panjang stock dengan quantity terbatas: batang baru dibuka dari stock terpanjang
+  yang masih tersedia; "modified": setelah packing, tiap batang dipindah ke stock
+  terpendek yang masih cukup (batang paling penuh dulu), sehingga cost/waste turun.
+
+Return sama dengan ColumnGeneration: (PatternPool, x_values, x_int), satu pattern per
+isi batang yang unik, x_int = jumlah batang dengan isi tersebut.
+"""
+
+import math
+import time
+import numpy as np
+from core.optimizer_strategy.optimizer_strategy import OptimizerStrategy, OptimizationCancelled
+from core.optimizer_strategy.pattern_pool import PatternPool
+from core.optimizer_strategy.bounds import cost_granularity, round_up_cost
+from core.telemetry import Telemetry
+from core.entities import as_part_table, as_stock_table
+
+
+class ResidualTree:
+    """Segment tree max atas sisa panjang batang terbuka (index = urutan batang dibuka)."""
+
+    def __init__(self, capacity=1024):
+        size = 1
+        while size < max(1, capacity):
+            size *= 2
+        self.size = size
+        self.tree = [-1] * (2 * size)  # -1: slot batang belum dibuka
+        self.count = 0
+
+    def open(self, residual):
+        """Buka batang baru di slot berikutnya; return index batang."""
+        if self.count == self.size:
+            self._grow()
+        b = self.count
+        self.count += 1
+        self.update(b, residual)
+        return b
+
+    def _grow(self):
+        # kapasitas x2: leaf lama disalin, node internal dibangun ulang (amortized O(1) per batang)
+        leaves = self.tree[self.size:]
+        self.size *= 2
+        tree = self.tree = [-1] * (2 * self.size)
+        tree[self.size:self.size + len(leaves)] = leaves
+        for i in range(self.size - 1, 0, -1):
+            tree[i] = max(tree[2 * i], tree[2 * i + 1])
+
+    def update(self, b, residual):
+        tree = self.tree
+        i = b + self.size
+        tree[i] = residual
+        i //= 2
+        while i:
+            left, right = tree[2 * i], tree[2 * i + 1]
+            value = left if left >= right else right
+            if tree[i] == value:
+                break  # ancestor tidak berubah
+            tree[i] = value
+            i //= 2
+
+    def first_fit(self, length):
+        """Index batang pertama dengan sisa >= length, atau None."""
+        tree = self.tree
+        if tree[1] < length:
+            return None
+        i = 1
+        while i < self.size:
+            i = 2 * i if tree[2 * i] >= length else 2 * i + 1
+        return i - self.size
+
+    def residual(self, b):
+        return self.tree[b + self.size]
+
+
+class ModifiedFirstFitDecreasing(OptimizerStrategy):
+    CANCEL_CHECK_EVERY = 256  # part type per cek cancel_event / event progress
+
+    def optimize(self, required_parts_aggregated, stocks_aggregated,
+                 progress_callback=None, cancel_event=None):
+        """
+        progress_callback menerima event telemetry "start", "ffd_progress" (placed, parts,
+        bars) dan "done" (field sama dengan ColumnGeneration, lower bound = panjang total).
+        Statistik di self.last_stats: bars, pack_time, integer_objective, lower_bound,
+        gap_abs, gap_rel, stop_reason.
+        """
+        started = time.perf_counter()
+        telemetry = Telemetry([progress_callback])
+        parts, stocks = as_part_table(required_parts_aggregated), as_stock_table(stocks_aggregated)
+        part_lengths = parts.length.tolist()
+        demands = parts.quantity.tolist()
+        stock_lengths = stocks.length.tolist()
+        stock_limits = stocks.limits()
+        stock_costs = stocks.cost.tolist()
+        telemetry.emit("start", parts=len(part_lengths), stocks=len(stock_lengths), columns=0)
+
+        if any(q > 0 and length > max(stock_lengths, default=0)
+               for length, q in zip(part_lengths, demands)):
+            raise ValueError("Some parts are longer than every stock length.")
+
+        # stock untuk membuka batang baru: terpanjang dulu
+        open_order = sorted(range(len(stock_lengths)), key=lambda k: -stock_lengths[k])
+        available = [math.inf if limit is None else int(limit) for limit in stock_limits]
+
+        tree = ResidualTree()
+        bar_stock = []     # stock_index per batang
+        bar_contents = []  # list [(part_index, qty)] per batang
+
+        order = sorted(range(len(part_lengths)), key=lambda i: -part_lengths[i])
+        for n, i in enumerate(order):
+            if n % self.CANCEL_CHECK_EVERY == 0:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise OptimizationCancelled("Optimization cancelled")
+                telemetry.emit("ffd_progress", placed=n, parts=len(order), bars=tree.count)
+
+            length, remaining = part_lengths[i], demands[i]
+            if length <= 0:
+                continue
+            while remaining > 0:
+                b = tree.first_fit(length)
+                if b is None:
+                    b = self._open_bar(tree, length, open_order, available, stock_lengths, bar_stock)
+                    bar_contents.append([])
+                residual = tree.residual(b)
+                qty = min(remaining, residual // length)
+                bar_contents[b].append((i, qty))
+                tree.update(b, residual - qty * length)
+                remaining -= qty
+
+        used = [stock_lengths[k] - tree.residual(b) for b, k in enumerate(bar_stock)]
+        bar_stock = self._downsize(used, bar_stock, stock_lengths, stock_limits)
+
+        # batang dengan isi identik → satu pattern dengan count (isi per part type berurutan,
+        # jadi tuple isi batang sudah kanonik)
+        bar_counts = {}
+        for k, contents in zip(bar_stock, bar_contents):
+            key = (k, tuple(contents))
+            bar_counts[key] = bar_counts.get(key, 0) + 1
+        pool = PatternPool(part_lengths, stock_lengths, capacity=max(1, len(bar_counts)))
+        x_int = []
+        for (k, contents), count in bar_counts.items():
+            pattern = np.zeros(len(part_lengths), dtype=np.int32)
+            for i, qty in contents:
+                pattern[i] += qty
+            pool.add(k, pattern, unique=False)
+            x_int.append(count)
+        x_values = [float(x) for x in x_int]
+
+        objective = float(np.asarray(x_int) @ pool.costs(stock_costs)) if len(pool) else 0.0
+        lower_bound = self.lower_bound(part_lengths, demands, stock_lengths, stock_costs)
+        gap_abs = max(0.0, objective - lower_bound)
+        self.last_stats = {
+            "bars": len(bar_stock), "pack_time": time.perf_counter() - started,
+            "integer_objective": objective, "lower_bound": lower_bound, "gap_abs": gap_abs,
+            "gap_rel": gap_abs / lower_bound if lower_bound else 0.0, "stop_reason": "heuristic",
+            "columns": len(pool),
+        }
+        telemetry.emit("done", status="feasible", lp_objective=None, integer_objective=objective,
+                       lower_bound=lower_bound, gap_abs=gap_abs, gap_rel=self.last_stats["gap_rel"],
+                       elapsed_total=time.perf_counter() - started)
+        return pool, x_values, x_int
+
+    @staticmethod
+    def _open_bar(tree, length, open_order, available, stock_lengths, bar_stock):
+        for k in open_order:
+            if available[k] >= 1 and stock_lengths[k] >= length:
+                available[k] -= 1
+                bar_stock.append(k)
+                return tree.open(stock_lengths[k])
+        raise ValueError("Stock quantity exhausted before all parts were placed.")
+
+    @staticmethod
+    def _downsize(used, bar_stock, stock_lengths, stock_limits):
+        """
+        Pindahkan tiap batang ke stock terpendek yang cukup untuk panjang terpakainya.
+        Batang paling penuh dipilih dulu; karena semua stock yang muat untuk batang ini juga
+        muat untuk batang berikutnya (lebih pendek), assignment awal tetap feasible.
+        """
+        remaining = [math.inf if limit is None else int(limit) for limit in stock_limits]
+        by_length = sorted(range(len(stock_lengths)), key=lambda k: stock_lengths[k])
+        new_stock = list(bar_stock)
+        for b in sorted(range(len(used)), key=lambda b: -used[b]):
+            for k in by_length:
+                if stock_lengths[k] >= used[b] and remaining[k] >= 1:
+                    remaining[k] -= 1
+                    new_stock[b] = k
+                    break
+        return new_stock
+
+    @staticmethod
+    def lower_bound(part_lengths, demands, stock_lengths, stock_costs):
+        """
+        Cost minimum bila part bisa disambung: panjang total x cost per panjang termurah,
+        dibulatkan ke atas ke kelipatan gcd(cost stock) seperti bound ColumnGeneration.
+        """
+        total = float(np.dot(part_lengths, demands)) if part_lengths else 0.0
+        rate = min((c / L for c, L in zip(stock_costs, stock_lengths) if L > 0), default=0.0)
+        return float(round_up_cost(total * rate, cost_granularity(stock_costs)))
@@ -1,6 +1,21 @@
 from abc import ABC, abstractmethod
 
-class optimizer_strategy(ABC):
+
+class OptimizationCancelled(Exception):
+    """Dilempar strategy saat cancel_event di-set (dicek di antara iterasi)."""
+
+
+class OptimizerStrategy(ABC):
     @abstractmethod
-    def optimize(self, required_parts, available_stocks):
-        pass
\ No newline at end of file
+    def optimize(self, required_parts_aggregated, stocks_aggregated,
+                 progress_callback=None, cancel_event=None):
+        """
+        progress_callback: callable(dict) opsional, dipanggil tiap iterasi (dari thread solver)
+        cancel_event     : threading.Event opsional; bila di-set, strategy berhenti di
+                           batas iterasi berikutnya dengan OptimizationCancelled
+        """
+        pass
+
+    def get_params(self):
+        """Parameter yang mempengaruhi hasil (dipakai untuk key SolutionCache)."""
+        return {}
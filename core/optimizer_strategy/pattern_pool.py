@@ -0,0 +1,158 @@
+"""
+pattern_pool.py
+Penyimpanan pattern yang ringkas untuk column generation.
+
+Pattern disimpan sebagai matrix int (satu baris per pattern, satu kolom per part)
+dengan array paralel stock_index dan waste, plus hash index untuk deteksi duplikat O(1).
+Assembly constraint, hitung waste dan ekspor bisa memakai operasi array.
+
+Untuk kompatibilitas, PatternPool tetap berperilaku seperti list pattern dict:
+    pool[j] -> {"stock_index", "stock_length", "pattern", "waste"}
+"""
+
+import numpy as np
+
+
+class PatternPool:
+    def __init__(self, part_lengths, stock_lengths, capacity=64):
+        self.part_lengths = np.asarray(part_lengths, dtype=np.int64)
+        self.stock_lengths = np.asarray(stock_lengths, dtype=np.int64)
+        n_parts = len(self.part_lengths)
+        capacity = max(1, capacity)
+        self._matrix = np.zeros((capacity, n_parts), dtype=np.int32)
+        self._stock_index = np.zeros(capacity, dtype=np.int32)
+        self._waste = np.zeros(capacity, dtype=np.int64)
+        self._size = 0
+        self._index = {}  # (stock_index, hash pattern) -> j (atau list j bila hash bentrok)
+
+    @classmethod
+    def from_patterns(cls, patterns, part_lengths, stock_lengths=None):
+        """
+        Bangun pool dari PatternPool lain atau list pattern dict (adapter).
+        stock_lengths boleh None; akan diambil dari field 'stock_length' tiap pattern.
+        """
+        if isinstance(patterns, cls):
+            return patterns
+        if stock_lengths is None:
+            n_stocks = max((p["stock_index"] for p in patterns), default=-1) + 1
+            stock_lengths = [0] * n_stocks
+            for p in patterns:
+                stock_lengths[p["stock_index"]] = p["stock_length"]
+        pool = cls(part_lengths, stock_lengths, capacity=len(patterns))
+        # index j harus tetap sama dengan list asal (x_values sejajar), jadi duplikat tetap disimpan
+        for p in patterns:
+            pool.add(p["stock_index"], p["pattern"], unique=False)
+        return pool
+
+    # ---------------------------
+    # Tambah / cari pattern
+    # ---------------------------
+    def _key(self, stock_index, counts):
+        # simpan hash saja (bukan bytes pattern) supaya index tetap kecil; bentrok dicek ke matrix
+        return int(stock_index), hash(counts.tobytes())
+
+    def _lookup(self, key, counts):
+        entry = self._index.get(key)
+        if entry is None:
+            return None
+        for j in (entry if isinstance(entry, list) else (entry,)):
+            if np.array_equal(self._matrix[j], counts):
+                return j
+        return None
+
+    def find(self, stock_index, pattern):
+        counts = np.asarray(pattern, dtype=np.int32)
+        return self._lookup(self._key(stock_index, counts), counts)
+
+    def add(self, stock_index, pattern, unique=True):
+        """
+        Tambah pattern; return index j, atau None bila pattern (stock yang sama) sudah ada.
+        unique=False: tetap append duplikat (hash index menunjuk ke kemunculan pertama).
+        """
+        counts = np.asarray(pattern, dtype=np.int32)
+        key = self._key(stock_index, counts)
+        existing = self._lookup(key, counts)
+        if unique and existing is not None:
+            return None
+        if self._size == len(self._stock_index):
+            self._grow()
+        j = self._size
+        self._matrix[j] = counts
+        self._stock_index[j] = stock_index
+        self._waste[j] = self.stock_lengths[stock_index] - counts @ self.part_lengths
+        if existing is None:
+            entry = self._index.get(key)
+            if entry is None:
+                self._index[key] = j
+            elif isinstance(entry, list):
+                entry.append(j)
+            else:
+                self._index[key] = [entry, j]
+        self._size += 1
+        return j
+
+    def _grow(self):
+        capacity = 2 * len(self._stock_index)
+        matrix = np.zeros((capacity, self._matrix.shape[1]), dtype=np.int32)
+        matrix[:self._size] = self._matrix[:self._size]
+        self._matrix = matrix
+        self._stock_index = np.resize(self._stock_index, capacity)
+        self._waste = np.resize(self._waste, capacity)
+
+    # ---------------------------
+    # View array (tanpa copy)
+    # ---------------------------
+    @property
+    def matrix(self):
+        """Matrix (n_patterns x n_parts): matrix[j, i] = jumlah part i di pattern j."""
+        return self._matrix[:self._size]
+
+    @property
+    def stock_index(self):
+        return self._stock_index[:self._size]
+
+    @property
+    def waste(self):
+        return self._waste[:self._size]
+
+    @property
+    def pattern_stock_lengths(self):
+        return self.stock_lengths[self.stock_index]
+
+    def costs(self, stock_costs):
+        """Cost per pattern (stock_costs[stock_index[j]])."""
+        return np.asarray(stock_costs, dtype=float)[self.stock_index]
+
+    # ---------------------------
+    # Adapter ke format list-of-dict
+    # ---------------------------
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, j):
+        if j < 0:
+            j += self._size
+        if not 0 <= j < self._size:
+            raise IndexError("pattern index out of range")
+        stock_index = int(self._stock_index[j])
+        return {
+            "stock_index": stock_index,
+            "stock_length": int(self.stock_lengths[stock_index]),
+            "pattern": tuple(self._matrix[j].tolist()),
+            "waste": int(self._waste[j]),
+        }
+
+    def __iter__(self):
+        for j in range(self._size):
+            yield self[j]
+
+    def __eq__(self, other):
+        if isinstance(other, (PatternPool, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def to_dicts(self):
+        return list(self)
+
+    def __repr__(self):
+        return f"PatternPool({self.to_dicts()!r})"
@@ -0,0 +1,263 @@
+"""
+portfolio.py
+Portfolio: beberapa strategy dijalankan bersamaan (satu process per strategy),
+hasil feasible dengan total cost stock terkecil yang dipakai.
+
+- Berhenti saat semua strategy selesai, time_limit habis, atau salah satu hasil
+  terbukti optimal (cost = lower bound terbaik dari strategy mana pun).
+- Strategy yang kalah dibatalkan lewat cancel event bersama (dicek di batas iterasi,
+  sama seperti cancel GUI); process yang tidak berhenti dalam CANCEL_GRACE detik
+  di-terminate bersama process group-nya (termasuk proses CBC yang sedang solve).
+  Pembersihan ini jalan di thread latar, jadi hasil pemenang langsung dikembalikan; process
+  yang belum dibersihkan saat interpreter exit di-terminate (process group) oleh hook atexit,
+  supaya CBC milik strategy yang kalah tidak tertinggal.
+- Strategy yang punya atribut time_limit (ColumnGeneration) diberi time_limit
+  STRATEGY_TIME_SHARE x budget portfolio, sehingga incumbent terbaiknya masih sempat
+  dikirim sebelum waktu habis.
+"""
+
+import atexit
+import copy
+import multiprocessing
+import multiprocessing.util  # atexit-nya terdaftar lebih dulu → _terminate_live_workers jalan sebelumnya
+import os
+import queue
+import signal
+import threading
+import time
+import traceback
+import numpy as np
+from core.optimizer_strategy.optimizer_strategy import OptimizerStrategy, OptimizationCancelled
+from core.telemetry import Telemetry
+from core.entities import as_part_table, as_stock_table
+
+CANCEL_GRACE = 1.0          # detik menunggu strategy berhenti sendiri sebelum terminate
+STRATEGY_TIME_SHARE = 0.8   # bagian budget portfolio untuk time_limit tiap strategy
+
+_live_workers = set()  # process strategy yang belum di-join reaper (lihat _terminate_live_workers)
+
+
+def _portfolio_worker(index, strategy, required_parts, stocks, cancel_event, results):
+    """Dijalankan di process terpisah; kirim (index, status, payload) ke queue `results`."""
+    if hasattr(os, "setsid"):
+        os.setsid()  # process group sendiri: terminate ikut mematikan CBC yang di-spawn strategy
+
+    def forward(record):
+        results.put((index, "progress", record))
+
+    try:
+        solution = strategy.optimize(required_parts, stocks, progress_callback=forward,
+                                     cancel_event=cancel_event)
+        results.put((index, "ok", (solution, getattr(strategy, "last_stats", None))))
+    except OptimizationCancelled:
+        results.put((index, "cancelled", None))
+    except Exception:
+        results.put((index, "error", traceback.format_exc()))
+
+
+def default_portfolio():
+    """CG exact, CG dengan residual rounding, dan FFD (heuristik cepat)."""
+    from core.optimizer_strategy.column_generation import ColumnGeneration
+    from core.optimizer_strategy.modified_first_fit_decreasing import ModifiedFirstFitDecreasing
+    return [ColumnGeneration(), ColumnGeneration(integer_mode="rounding"), ModifiedFirstFitDecreasing()]
+
+
+class Portfolio(OptimizerStrategy):
+    def __init__(self, strategies=None, time_limit=None, mp_context=None):
+        """
+        strategies: list OptimizerStrategy (default: default_portfolio())
+        time_limit: budget total (detik); None = tunggu semua strategy / sampai optimal
+        mp_context: nama start method multiprocessing (None = default platform)
+        """
+        if time_limit is not None and time_limit <= 0:
+            raise ValueError("time_limit must be > 0 (or None)")
+        self.strategies = list(strategies) if strategies is not None else default_portfolio()
+        if not self.strategies:
+            raise ValueError("Portfolio needs at least one strategy")
+        self.time_limit = time_limit
+        self.mp_context = mp_context
+
+    def get_params(self):
+        return {
+            "strategies": [[type(s).__name__, s.get_params()] for s in self.strategies],
+            "time_limit": self.time_limit,
+        }
+
+    def optimize(self, required_parts_aggregated, stocks_aggregated,
+                 progress_callback=None, cancel_event=None):
+        """
+        Return (patterns, x_values, x_int) dari pemenang.
+        progress_callback menerima event strategy (ditambah field "strategy" = index) dan
+        "portfolio_result" (strategy, name, status, objective, elapsed) per strategy yang selesai.
+        self.last_stats: winner, winner_name, results (per strategy), integer_objective,
+        lower_bound, gap_abs, gap_rel, stop_reason ("all_done" / "optimal" / "time_limit"),
+        serta last_stats strategy pemenang di "winner_stats".
+        """
+        started = time.perf_counter()
+        deadline = None if self.time_limit is None else started + self.time_limit
+        telemetry = Telemetry([progress_callback])
+        # tabel kolom: di-pickle ke tiap process sebagai beberapa array, bukan object per baris
+        required_parts_aggregated = as_part_table(required_parts_aggregated)
+        stocks_aggregated = as_stock_table(stocks_aggregated)
+        stock_costs = stocks_aggregated.cost.tolist()
+
+        context = multiprocessing.get_context(self.mp_context)
+        stop = context.Event()
+        results = context.Queue()
+        processes = []
+        for index, strategy in enumerate(self.strategies):
+            strategy = copy.copy(strategy)
+            if self.time_limit is not None and hasattr(strategy, "time_limit"):
+                budget = STRATEGY_TIME_SHARE * self.time_limit
+                if strategy.time_limit is None or strategy.time_limit > budget:
+                    strategy.time_limit = budget
+            process = context.Process(target=_portfolio_worker, daemon=True,
+                                      args=(index, strategy, required_parts_aggregated,
+                                            stocks_aggregated, stop, results))
+            process.start()
+            _live_workers.add(process)
+            processes.append(process)
+
+        outcomes = [{"strategy": i, "name": type(s).__name__, "status": "running", "objective": None,
+                     "elapsed": None} for i, s in enumerate(self.strategies)]
+        best = None          # (objective, index, solution, stats)
+        lower_bound = None
+        stop_reason = "all_done"
+        pending = set(range(len(processes)))
+        try:
+            while pending:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise OptimizationCancelled("Optimization cancelled")
+                if deadline is not None and time.perf_counter() >= deadline:
+                    stop_reason = "time_limit"
+                    break
+                try:
+                    index, status, payload = results.get(timeout=0.05)
+                except queue.Empty:
+                    # process yang mati tanpa mengirim hasil (mis. crash native)
+                    for i in list(pending):
+                        if not processes[i].is_alive() and processes[i].exitcode not in (None, 0):
+                            pending.discard(i)
+                            outcomes[i]["status"] = "error"
+                    continue
+
+                if status == "progress":
+                    telemetry.emit(payload.pop("event"), strategy=index,
+                                   **{k: v for k, v in payload.items() if k not in ("time", "elapsed")})
+                    continue
+
+                pending.discard(index)
+                outcome = outcomes[index]
+                outcome["status"] = status
+                outcome["elapsed"] = time.perf_counter() - started
+                if status == "ok":
+                    solution, stats = payload
+                    patterns, _, x_int = solution
+                    objective = self._objective(patterns, x_int, stock_costs)
+                    outcome["objective"] = objective
+                    if stats and stats.get("lower_bound") is not None:
+                        lower_bound = max(lower_bound or 0.0, float(stats["lower_bound"]))
+                    if objective is not None and (best is None or objective < best[0]):
+                        best = (objective, index, solution, stats)
+                elif status == "error":
+                    outcome["error"] = payload
+                telemetry.emit("portfolio_result", **outcome)
+
+                if best is not None and lower_bound is not None and best[0] <= lower_bound + 1e-6:
+                    stop_reason = "optimal"
+                    break
+        finally:
+            self.last_reaper = self._shutdown(processes, stop, results)
+
+        for outcome in outcomes:
+            if outcome["status"] == "running":
+                outcome["status"] = "cancelled"
+
+        self.last_stats = {
+            "winner": None, "winner_name": None, "results": outcomes, "integer_objective": None,
+            "lower_bound": lower_bound, "gap_abs": None, "gap_rel": None, "stop_reason": stop_reason,
+            "winner_stats": None,
+        }
+        if best is None:
+            raise RuntimeError("No strategy in the portfolio produced a feasible plan: "
+                               + ", ".join(f"{o['name']}={o['status']}" for o in outcomes))
+
+        objective, index, solution, stats = best
+        self.last_stats.update(winner=index, winner_name=outcomes[index]["name"],
+                               integer_objective=objective, winner_stats=stats)
+        if lower_bound is not None:
+            self.last_stats["gap_abs"] = max(0.0, objective - lower_bound)
+            self.last_stats["gap_rel"] = self.last_stats["gap_abs"] / lower_bound if lower_bound else 0.0
+        telemetry.emit("done", status="feasible", lp_objective=None, integer_objective=objective,
+                       lower_bound=lower_bound, gap_abs=self.last_stats["gap_abs"],
+                       gap_rel=self.last_stats["gap_rel"], winner=outcomes[index]["name"],
+                       elapsed_total=time.perf_counter() - started)
+        return solution
+
+    @staticmethod
+    def _objective(patterns, x_int, stock_costs):
+        """Total cost stock hasil integer; None bila tidak ada solusi (x_int kosong / nol)."""
+        if not x_int or not any(x_int):
+            return None
+        if hasattr(patterns, "costs"):  # PatternPool
+            costs = patterns.costs(stock_costs)
+        else:
+            costs = np.array([stock_costs[p["stock_index"]] for p in patterns], dtype=float)
+        return float(np.asarray(x_int[:len(costs)], dtype=float) @ costs[:len(x_int)])
+
+    @staticmethod
+    def _shutdown(processes, stop, results, wait=False):
+        """
+        Batalkan strategy yang masih jalan: cancel event dulu, terminate bila tidak berhenti
+        dalam CANCEL_GRACE. Default di thread latar (tidak menahan hasil pemenang);
+        return thread-nya (wait=True: tunggu sampai semua process selesai).
+        """
+        stop.set()
+
+        def reap():
+            grace_end = time.perf_counter() + CANCEL_GRACE
+            while any(p.is_alive() for p in processes) and time.perf_counter() < grace_end:
+                # kosongkan queue supaya process tidak tertahan saat flush hasilnya
+                try:
+                    results.get(timeout=0.05)
+                except (queue.Empty, OSError, ValueError):
+                    pass
+            for process in processes:
+                if process.is_alive():
+                    _terminate(process)
+                process.join()
+                _live_workers.discard(process)
+            results.close()
+            results.join_thread()
+
+        reaper = threading.Thread(target=reap, name="portfolio-reaper", daemon=True)
+        reaper.start()
+        if wait:
+            reaper.join()
+        return reaper
+
+
+@atexit.register
+def _terminate_live_workers():
+    """
+    Exit saat reaper masih dalam CANCEL_GRACE (thread daemon ikut mati): atexit multiprocessing
+    hanya men-terminate pid worker, bukan process group-nya, jadi CBC-nya bisa tertinggal.
+    Hook ini (didaftarkan setelah milik multiprocessing, jadi jalan lebih dulu) membunuh group-nya.
+    """
+    for process in list(_live_workers):
+        # juga bila pid worker sudah mati: anggota group-nya (CBC) bisa masih jalan
+        if process.pid is not None:
+            _terminate(process)
+    for process in list(_live_workers):
+        process.join(timeout=CANCEL_GRACE)
+    _live_workers.clear()
+
+
+def _terminate(process):
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+            return
+        except OSError:
+            pass  # process group belum/tidak ada (mis. start method lain)
+    process.terminate()
@@ -0,0 +1,158 @@
+"""
+restricted_master.py
+Restricted Master Problem (RMP) yang persisten untuk column generation.
+
+Model dibangun sekali (constraint demand + stock limit), lalu setiap kolom baru
+cukup ditambahkan ke model yang sudah ada. Dua backend:
+- "highs" : model highspy.Highs hidup terus; addCol + run() melanjutkan dari basis
+            optimal sebelumnya (warm start simplex). Butuh paket `highspy`.
+- "cbc"   : LpProblem PuLP persisten; kolom ditambahkan via addterm lalu di-solve
+            ulang dengan PULP_CBC_CMD (CBC command line tidak bisa menerima basis,
+            tapi model tidak lagi dibangun ulang tiap iterasi).
+"""
+
+import importlib.util
+import numpy as np
+import pulp
+
+highspy = None  # di-import saat backend "highs" benar-benar dipakai (import ~0.1 s)
+
+
+MASTER_BACKENDS = ("auto", "highs", "cbc")
+
+
+def highs_available():
+    return importlib.util.find_spec("highspy") is not None
+
+
+def _import_highspy():
+    global highspy
+    if highspy is None:
+        import highspy as _highspy
+        highspy = _highspy
+    return highspy
+
+
+class RestrictedMaster:
+    def __init__(self, demands, stock_limits, stock_costs, backend="auto", solver_msg=False):
+        if backend not in MASTER_BACKENDS:
+            raise ValueError(f"Unknown master backend: {backend!r} (choose from {MASTER_BACKENDS})")
+        if backend == "auto":
+            backend = "highs" if highs_available() else "cbc"
+        if backend == "highs":
+            if not highs_available():
+                raise ImportError("master backend 'highs' requires the highspy package")
+            _import_highspy()
+
+        self.backend = backend
+        self.demands = list(demands)
+        self.stock_limits = list(stock_limits)
+        self.stock_costs = list(stock_costs)
+        self.solver_msg = solver_msg
+        self.n_columns = 0
+
+        self.objective = None
+        self.duals = None
+        self.x_values = None
+
+        if backend == "highs":
+            self._build_highs()
+        else:
+            self._build_pulp()
+
+    # ---------------------------
+    # Build model kosong (tanpa kolom)
+    # ---------------------------
+    def _build_highs(self):
+        inf = highspy.kHighsInf
+        self.model = highspy.Highs()
+        self.model.setOptionValue("output_flag", bool(self.solver_msg))
+        # row i          : demand_i   (>= d_i)
+        # row m + k      : stock_limit_k (<= U_k)
+        for d in self.demands:
+            self.model.addRow(float(d), inf, 0, [], [])
+        for limit in self.stock_limits:
+            self.model.addRow(-inf, inf if limit is None else float(limit), 0, [], [])
+
+    def _build_pulp(self):
+        self.prob = pulp.LpProblem("RMP", pulp.LpMinimize)
+        self.x_vars = []
+        self.prob += pulp.LpAffineExpression()
+        self.dem_constraints = []
+        for i, d in enumerate(self.demands):
+            c = pulp.LpAffineExpression() >= d
+            self.prob.addConstraint(c, name=f"dem_{i}")
+            self.dem_constraints.append(c)
+        self.limit_constraints = []
+        for k, limit in enumerate(self.stock_limits):
+            if limit is None:
+                self.limit_constraints.append(None)
+                continue
+            c = pulp.LpAffineExpression() <= limit
+            self.prob.addConstraint(c, name=f"stock_limit_{k}")
+            self.limit_constraints.append(c)
+
+    # ---------------------------
+    # Tambah kolom (pattern) ke model yang sudah ada
+    # ---------------------------
+    def add_column(self, stock_index, pattern):
+        """Append satu pattern; return index kolom (j)."""
+        j = self.n_columns
+        cost = self.stock_costs[stock_index]
+        nonzero = np.flatnonzero(pattern)
+        rows = [(int(i), int(pattern[i])) for i in nonzero]
+
+        if self.backend == "highs":
+            indices = [i for i, _ in rows] + [len(self.demands) + stock_index]
+            values = [float(qty) for _, qty in rows] + [1.0]
+            self.model.addCol(float(cost), 0.0, highspy.kHighsInf, len(indices), indices, values)
+        else:
+            x = pulp.LpVariable(f"x_{j}", lowBound=0, cat="Continuous")
+            self.x_vars.append(x)
+            self.prob.objective.addterm(x, cost)
+            for i, qty in rows:
+                _expr(self.dem_constraints[i]).addterm(x, qty)
+            limit_constraint = self.limit_constraints[stock_index]
+            if limit_constraint is not None:
+                _expr(limit_constraint).addterm(x, 1)
+
+        self.n_columns += 1
+        return j
+
+    def add_pool(self, pool, start=0):
+        """Append semua pattern PatternPool mulai dari index `start`."""
+        matrix = pool.matrix
+        stock_index = pool.stock_index
+        for j in range(start, len(pool)):
+            self.add_column(int(stock_index[j]), matrix[j])
+
+    # ---------------------------
+    # Solve (re-solve) LP relaksasi
+    # ---------------------------
+    def solve(self):
+        """Solve RMP; isi self.objective, self.duals (demand rows), self.x_values."""
+        if self.backend == "highs":
+            self.model.run()
+            status = self.model.getModelStatus()
+            if status != highspy.HighsModelStatus.kOptimal:
+                raise RuntimeError(f"LP not optimal. Status: {self.model.modelStatusToString(status)}")
+            solution = self.model.getSolution()
+            m = len(self.demands)
+            self.objective = self.model.getInfo().objective_function_value
+            self.duals = list(solution.row_dual[:m])
+            self.x_values = list(solution.col_value)
+        else:
+            solver = pulp.PULP_CBC_CMD(msg=self.solver_msg)
+            self.prob.solve(solver)
+            status = pulp.LpStatus[self.prob.status]
+            if status not in ("Optimal", "Optimal Solution Found"):
+                raise RuntimeError(f"LP not optimal. Status: {status}")
+            self.objective = pulp.value(self.prob.objective)
+            self.duals = [c.pi for c in self.dem_constraints]
+            self.x_values = [pulp.value(x) for x in self.x_vars]
+        return self.objective
+
+
+def _expr(constraint):
+    # PuLP >= 3 menyimpan ekspresi di constraint.expr; versi lama: constraint adalah ekspresinya
+    return getattr(constraint, "expr", constraint)
@@ -0,0 +1,283 @@
+"""
+plan_export.py
+Export cut plan (detail potongan per batang) secara bulk, bukan satu baris per panggilan csv.writer.
+
+Baris potongan dibangun per pattern sebagai array (template potongan satu batang, lalu
+diulang untuk tiap instance), dan ditulis per blok maks. chunk_rows baris, jadi memori
+tetap terbatas walau plan berisi ratusan ribu batang.
+
+Format cut_trace_detail (TRACE_FORMATS):
+- "csv"     : layout lama (kolom, urutan baris, quoting dan "\\r\\n" sama dengan csv.writer)
+- "csv.gz"  : sama, dikompresi gzip
+- "parquet" : Apache Parquet (butuh pyarrow), ditulis per row group
+- "arrow"   : Arrow IPC file / Feather v2 (butuh pyarrow), ditulis per record batch
+
+Quirk layout lama yang dipertahankan: leftover ditulis pada potongan TERAKHIR tiap part
+type di dalam batang (jadi batang dengan beberapa part type punya beberapa leftover != 0);
+baris "_frac" (x pecahan) hanya satu baris per part type dengan leftover di semua baris.
+"""
+
+import gzip
+import numpy as np
+from core.optimizer_strategy.pattern_pool import PatternPool
+from core.entities import as_part_table
+
+TRACE_COLUMNS = ("pattern_id", "instance_id", "stock_source", "stock_length",
+                 "part_type", "cut_length", "leftover")
+TRACE_FORMATS = {
+    "csv": "cut_trace_detail.csv",
+    "csv.gz": "cut_trace_detail.csv.gz",
+    "parquet": "cut_trace_detail.parquet",
+    "arrow": "cut_trace_detail.arrow",
+}
+DEFAULT_CHUNK_ROWS = 65536
+_CSV_LINE_END = "\r\n"  # csv.writer default
+
+
+def _value(x):
+    """Seperti pulp.value: angka dikembalikan apa adanya, LpVariable lewat .value()."""
+    if x is None or isinstance(x, (int, float, np.number)):
+        return x
+    return x.value()
+
+
+class CutPlan:
+    """Pattern aktif + jumlah instance (integer dan pecahan) dalam bentuk array."""
+
+    def __init__(self, patterns, x_values, required_parts_aggregated):
+        parts = as_part_table(required_parts_aggregated)
+        self.part_types = parts.part_types()
+        self.part_lengths = parts.length.tolist()
+        self.pool = PatternPool.from_patterns(patterns, self.part_lengths)
+        x = np.array([_value(v) or 0.0 for v in x_values[:len(self.pool)]], dtype=float)
+        x = np.concatenate([x, np.zeros(len(self.pool) - len(x))])
+        self.active = np.flatnonzero(x > 1e-8)
+        self.int_parts = np.floor(x).astype(np.int64)
+        self.frac_parts = x - self.int_parts
+
+    def stock_source(self, j):
+        k = self.pool.stock_index[j]
+        return "main" if k == 0 else f"stock_{k}"
+
+    def pieces(self, j):
+        """Potongan satu batang pattern j: (index part per potongan, mask potongan terakhir per part type)."""
+        row = self.pool.matrix[j]
+        used = np.flatnonzero(row)
+        qty = row[used].astype(np.int64)
+        piece_part = np.repeat(used, qty)
+        last = np.zeros(len(piece_part), dtype=bool)
+        last[np.cumsum(qty) - 1] = True
+        return piece_part, last
+
+    def bars(self, j):
+        """Jumlah batang fisik pattern j (x pecahan dibulatkan ke atas)."""
+        return int(self.int_parts[j]) + (1 if self.frac_parts[j] > 1e-6 else 0)
+
+    def pattern_rows(self, unit_scale=1):
+        """
+        Pattern aktif sebagai dict biasa (picklable; untuk gambar DXF dan diagram GUI):
+        pattern_id ("P{j+1}"), stock_length, cuts [(part_type, length)] urut potong,
+        waste, bars. Panjang dibagi unit_scale.
+        """
+        rows = []
+        for j in self.active.tolist():
+            piece_part, _ = self.pieces(j)
+            rows.append({
+                "pattern_id": f"P{j+1}",
+                "stock_length": float(self.pool.pattern_stock_lengths[j]) / unit_scale,
+                "cuts": [(self.part_types[i], self.part_lengths[i] / unit_scale) for i in piece_part.tolist()],
+                "waste": float(self.pool.waste[j]) / unit_scale,
+                "bars": self.bars(j),
+            })
+        return rows
+
+    def n_rows(self):
+        pieces = self.pool.matrix[self.active].sum(axis=1, dtype=np.int64)
+        types = (self.pool.matrix[self.active] > 0).sum(axis=1)
+        has_frac = self.frac_parts[self.active] > 1e-6
+        return int(pieces @ self.int_parts[self.active] + types @ has_frac)
+
+    def _instance_blocks(self, j, n_pieces, chunk_rows):
+        """Range instance (1-based, end eksklusif) per blok <= chunk_rows baris."""
+        per_block = max(1, chunk_rows // max(1, n_pieces))
+        n = int(self.int_parts[j])
+        for start in range(1, n + 1, per_block):
+            yield start, min(n + 1, start + per_block)
+
+
+# ---------------------------
+# Kolom (Parquet / Arrow)
+# ---------------------------
+def iter_cut_trace_arrays(plan, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Yield dict kolom -> np.ndarray int64 (tanpa string), sekitar chunk_rows baris per chunk:
+    - pattern      : index pattern j (pattern_id = f"P{j+1}")
+    - instance     : nomor instance 1.. (0 = baris "_frac")
+    - stock_index, stock_length, part (index part), cut_length, leftover
+    String (pattern_id, instance_id, stock_source, part_type) dibangun oleh writer
+    dari kode ini, sehingga tidak ada array string per baris di Python.
+    """
+    part_lengths = np.asarray(plan.part_lengths, dtype=np.int64)
+    stock_index = plan.pool.stock_index.astype(np.int64)
+    stock_lengths = plan.pool.pattern_stock_lengths.astype(np.int64)
+    waste = plan.pool.waste
+    blocks, rows = [], 0
+
+    def block(j, instance, part_index, leftover):
+        n = len(part_index)
+        return {
+            "pattern": np.full(n, j, dtype=np.int64),
+            "instance": instance,
+            "stock_index": np.full(n, stock_index[j]),
+            "stock_length": np.full(n, stock_lengths[j]),
+            "part": part_index.astype(np.int64),
+            "cut_length": part_lengths[part_index],
+            "leftover": leftover,
+        }
+
+    for j in plan.active:
+        piece_part, last = plan.pieces(j)
+        for start, end in plan._instance_blocks(j, len(piece_part), chunk_rows):
+            instances = end - start
+            instance = np.repeat(np.arange(start, end, dtype=np.int64), len(piece_part))
+            leftover = np.where(np.tile(last, instances), waste[j], 0).astype(np.int64)
+            blocks.append(block(j, instance, np.tile(piece_part, instances), leftover))
+            rows += len(leftover)
+            if rows >= chunk_rows:
+                yield _concat(blocks)
+                blocks, rows = [], 0
+
+        if plan.frac_parts[j] > 1e-6:
+            used = np.flatnonzero(plan.pool.matrix[j])
+            blocks.append(block(j, np.zeros(len(used), dtype=np.int64), used,
+                                np.full(len(used), waste[j], dtype=np.int64)))
+            rows += len(used)
+
+    if blocks:
+        yield _concat(blocks)
+
+
+def _concat(blocks):
+    return {c: np.concatenate([b[c] for b in blocks]) for c in blocks[0]}
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.compute
+    except ImportError as exc:
+        raise ImportError("Parquet/Arrow export requires the pyarrow package "
+                          "(pip install pyarrow), or use trace_format='csv' / 'csv.gz'") from exc
+    return pyarrow
+
+
+def _arrow_schema(pa):
+    return pa.schema([(c, pa.int64() if c in ("stock_length", "cut_length", "leftover") else pa.string())
+                      for c in TRACE_COLUMNS])
+
+
+def _arrow_table(pa, plan, chunk, schema):
+    """Chunk kode int → tabel Arrow dengan kolom TRACE_COLUMNS (string lewat kernel pyarrow.compute)."""
+    pc = pa.compute
+    frac = pa.array(chunk["instance"] == 0)
+    pattern_id = pc.binary_join_element_wise("P", pc.cast(pa.array(chunk["pattern"] + 1), pa.string()), "")
+    pattern_id = pc.if_else(frac, pc.binary_join_element_wise(pattern_id, "_frac", ""), pattern_id)
+    instance_id = pc.if_else(frac, pattern_id, pc.binary_join_element_wise(
+        pattern_id, pc.cast(pa.array(chunk["instance"]), pa.string()), "_"))
+    n_stocks = int(chunk["stock_index"].max()) + 1
+    stock_source = pa.array(["main"] + [f"stock_{k}" for k in range(1, n_stocks)]).take(chunk["stock_index"])
+    part_type = pa.array(plan.part_types, type=pa.string()).take(chunk["part"])
+    columns = [pattern_id, instance_id, stock_source, pa.array(chunk["stock_length"]), part_type,
+               pa.array(chunk["cut_length"]), pa.array(chunk["leftover"])]
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def _write_trace_arrow(path, plan, trace_format, chunk_rows):
+    pa = _import_pyarrow()
+    schema = _arrow_schema(pa)
+    if trace_format == "parquet":
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(path, schema)
+    else:
+        writer = pa.ipc.new_file(path, schema)
+    with writer:
+        wrote = False
+        for chunk in iter_cut_trace_arrays(plan, chunk_rows):
+            writer.write_table(_arrow_table(pa, plan, chunk, schema))
+            wrote = True
+        if not wrote:
+            writer.write_table(schema.empty_table())
+
+
+# ---------------------------
+# CSV (layout lama)
+# ---------------------------
+def _csv_field(value):
+    # QUOTE_MINIMAL seperti csv.writer
+    text = str(value)
+    if any(ch in text for ch in ',"\r\n'):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def iter_cut_trace_csv(plan, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Yield teks CSV (header dulu) per blok <= ~chunk_rows baris.
+    Per pattern, bagian baris setelah instance_id sama untuk semua instance, jadi cukup
+    dibangun sekali lalu digabung dengan str.join per blok instance.
+    """
+    yield ",".join(TRACE_COLUMNS) + _CSV_LINE_END
+    part_types = [_csv_field(t) for t in plan.part_types]
+    stock_lengths = plan.pool.pattern_stock_lengths
+    waste = plan.pool.waste
+    buffer, rows = [], 0
+
+    for j in plan.active:
+        pattern_id = _csv_field(f"P{j+1}")
+        prefix = f"{_csv_field(plan.stock_source(j))},{stock_lengths[j]},"
+        piece_part, last = plan.pieces(j)
+        suffixes = [f"{prefix}{part_types[i]},{plan.part_lengths[i]},{waste[j] if is_last else 0}"
+                    for i, is_last in zip(piece_part.tolist(), last.tolist())]
+        for start, end in plan._instance_blocks(j, len(suffixes), chunk_rows):
+            for instance in range(start, end):
+                head = f"{pattern_id},{pattern_id}_{instance},"
+                buffer.append(head + (_CSV_LINE_END + head).join(suffixes) + _CSV_LINE_END)
+            rows += (end - start) * len(suffixes)
+            if rows >= chunk_rows:
+                yield "".join(buffer)
+                buffer, rows = [], 0
+
+        if plan.frac_parts[j] > 1e-6:
+            frac_id = f"P{j+1}_frac"
+            for i in np.flatnonzero(plan.pool.matrix[j]).tolist():
+                buffer.append(f"{frac_id},{frac_id},{prefix}{part_types[i]},{plan.part_lengths[i]},"
+                              f"{waste[j]}{_CSV_LINE_END}")
+                rows += 1
+
+    if buffer:
+        yield "".join(buffer)
+
+
+def _write_trace_csv(path, plan, trace_format, chunk_rows):
+    if trace_format == "csv.gz":
+        # compresslevel 6: ukuran hampir sama dengan 9, jauh lebih cepat
+        f = gzip.open(path, "wt", encoding="utf-8", newline="", compresslevel=6)
+    else:
+        f = open(path, "w", encoding="utf-8", newline="")
+    with f:
+        for text in iter_cut_trace_csv(plan, chunk_rows):
+            f.write(text)
+
+
+def write_cut_trace(plan, output_folder, trace_format="csv", chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Tulis cut_trace_detail dalam trace_format (lihat TRACE_FORMATS); return path file."""
+    if trace_format not in TRACE_FORMATS:
+        raise ValueError(f"Unknown trace_format: {trace_format!r} (choose from {sorted(TRACE_FORMATS)})")
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows must be >= 1")
+    path = f"{output_folder}/{TRACE_FORMATS[trace_format]}"
+    if trace_format in ("csv", "csv.gz"):
+        _write_trace_csv(path, plan, trace_format, chunk_rows)
+    else:
+        _write_trace_arrow(path, plan, trace_format, chunk_rows)
+    return path
@@ -0,0 +1,159 @@
+"""
+solution_cache.py
+Cache hasil optimasi di disk, dengan key berupa fingerprint kanonik dari problem.
+
+- Key   : sha256 dari problem yang sudah dinormalisasi (parts & stocks diurutkan
+          berdasarkan (length, quantity), unit scale, nama strategy + parameternya).
+          Cutting list yang sama tapi urutan barisnya beda menghasilkan key yang sama.
+- Value : patterns + x_values + x_int dalam urutan kanonik; saat dibaca dipetakan
+          kembali ke urutan parts/stocks milik pemanggil.
+- Eviction LRU berdasarkan mtime file (di-touch setiap hit), dibatasi total ukuran.
+- Aman untuk beberapa proses yang berbagi folder: tulis ke file sementara lalu
+  os.replace (atomic), dan file yang hilang/korup dianggap miss.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import numpy as np
+from core.entities import as_part_table, as_stock_table
+
+CACHE_VERSION = 1
+
+
+class SolutionCache:
+    def __init__(self, directory, max_bytes=64 * 1024 * 1024):
+        self.directory = str(directory)
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    # ---------------------------
+    # Fingerprint kanonik
+    # ---------------------------
+    @staticmethod
+    def canonical_order(required_parts, stocks):
+        """Urutan kanonik index parts & stocks (sorted by (length, quantity), stabil)."""
+        parts, stocks = as_part_table(required_parts), as_stock_table(stocks)
+        part_order = np.lexsort((parts.quantity, parts.length)).tolist()
+        stock_order = np.lexsort((stocks.quantity, stocks.length)).tolist()
+        return part_order, stock_order
+
+    @classmethod
+    def make_key(cls, required_parts, stocks, unit_scale, strategy):
+        parts, stocks = as_part_table(required_parts), as_stock_table(stocks)
+        part_order, stock_order = cls.canonical_order(parts, stocks)
+        instance = {
+            "version": CACHE_VERSION,
+            "parts": np.column_stack((parts.length, parts.quantity))[part_order].tolist(),
+            "stocks": np.column_stack((stocks.length, stocks.quantity))[stock_order].tolist(),
+            "unit_scale": unit_scale,
+            "strategy": type(strategy).__name__,
+            "params": strategy.get_params(),
+        }
+        payload = json.dumps(instance, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    # ---------------------------
+    # Get / Put
+    # ---------------------------
+    def get(self, required_parts, stocks, unit_scale, strategy):
+        """Return (patterns, x_values, x_int) dalam urutan pemanggil, atau None bila miss."""
+        required_parts, stocks = as_part_table(required_parts), as_stock_table(stocks)
+        key = self.make_key(required_parts, stocks, unit_scale, strategy)
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)  # LRU: tandai baru dipakai
+        except OSError:
+            pass
+
+        part_order, stock_order = self.canonical_order(required_parts, stocks)
+        part_lengths = required_parts.length.tolist()
+        stock_lengths = stocks.length.tolist()
+        patterns = []
+        for stock_pos, canon_pattern in entry["patterns"]:
+            pattern = [0] * len(required_parts)
+            for pos, qty in enumerate(canon_pattern):
+                pattern[part_order[pos]] = qty
+            stock_index = stock_order[stock_pos]
+            stock_length = stock_lengths[stock_index]
+            patterns.append({
+                "stock_index": stock_index,
+                "stock_length": stock_length,
+                "pattern": tuple(pattern),
+                "waste": stock_length - sum(c*w for c, w in zip(pattern, part_lengths))
+            })
+        return patterns, entry["x_values"], entry["x_int"]
+
+    def put(self, required_parts, stocks, unit_scale, strategy, patterns, x_values, x_int):
+        required_parts, stocks = as_part_table(required_parts), as_stock_table(stocks)
+        key = self.make_key(required_parts, stocks, unit_scale, strategy)
+        part_order, stock_order = self.canonical_order(required_parts, stocks)
+        stock_pos = {k: pos for pos, k in enumerate(stock_order)}
+        entry = {
+            "patterns": [
+                [stock_pos[p["stock_index"]], [int(p["pattern"][i]) for i in part_order]]
+                for p in patterns
+            ],
+            "x_values": None if x_values is None else [float(x) for x in x_values],
+            "x_int": None if x_int is None else [int(x) for x in x_int],
+        }
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, separators=(",", ":"))
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        self.evict(keep=key)
+        return key
+
+    # ---------------------------
+    # LRU eviction (berdasarkan mtime, dibatasi total ukuran)
+    # ---------------------------
+    def evict(self, keep=None):
+        """Hapus entry paling lama dipakai sampai total ukuran <= max_bytes (kecuali `keep`)."""
+        entries = []
+        total = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json") or name.startswith(".tmp-"):
+                continue
+            try:
+                st = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue  # sudah dihapus proses lain
+            entries.append((st.st_mtime, st.st_size, name))
+            total += st.st_size
+
+        entries.sort()
+        for _, size, name in entries:
+            if total <= self.max_bytes:
+                break
+            if keep is not None and name == f"{keep}.json":
+                continue
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
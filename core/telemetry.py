@@ -0,0 +1,145 @@
+"""
+telemetry.py
+Event stream untuk instrumentasi solver (pengganti print di dalam algoritma).
+
+Strategy memanggil telemetry.emit("nama_event", **field); setiap event adalah dict:
+    {"event": ..., "time": epoch detik, "elapsed": detik sejak start, **field}
+lalu diteruskan ke semua subscriber (callable(dict)).
+
+Subscriber bawaan:
+- EventRecorder   : simpan semua event (trace yang bisa dibaca mesin, bisa ditulis JSONL)
+- ConsoleReporter : cetak ringkasan per iterasi ke console (opsional, tidak aktif default)
+
+Event ColumnGeneration:
+- "start"           : parts, stocks, columns (pattern trivial), dp_capacity / dp_capacity_raw
+                      (kapasitas tabel DP pricing setelah / sebelum compress_capacity)
+- "lp_iteration"    : iteration, objective, lower_bound (Farley), master_time, pricing_time,
+                      columns_added, best_reduced_cost, columns, patterns (pattern baru),
+                      alpha (dual smoothing), mispricings (pricing ulang di duals RMP)
+- "lp_done"         : iterations, objective, lower_bound, integer_target (ceil bound dalam
+                      kelipatan cost batang), columns, converged, reason
+                      ("optimal" / "bound" / "time_limit" / "max_iterations")
+- "integer_attempt" : attempt, columns (sebelum solve integer master)
+- "integer_result"  : attempt, status, feasible, objective, integer_time, columns_added
+                      (status "Heuristic" = hasil residual rounding, integer_mode="rounding")
+- "done"            : status, lp_objective, integer_objective, lower_bound, gap_abs, gap_rel,
+                      elapsed_total
+
+Portfolio meneruskan event tiap strategy dengan field tambahan "strategy" (index), plus
+"portfolio_result" (strategy, name, status, objective, elapsed) per strategy yang selesai,
+dan "done" sendiri di akhir (dengan field winner).
+"""
+
+import json
+import sys
+import time
+
+
+class Telemetry:
+    def __init__(self, subscribers=()):
+        self.subscribers = [s for s in subscribers if s is not None]
+        self.started = time.perf_counter()
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        self.subscribers.remove(callback)
+
+    def start(self):
+        self.started = time.perf_counter()
+
+    def emit(self, event, **fields):
+        if not self.subscribers:
+            return None
+        record = {"event": event, "time": time.time(),
+                  "elapsed": time.perf_counter() - self.started, **fields}
+        for callback in self.subscribers:
+            callback(record)
+        return record
+
+    # Telemetry juga bisa dipakai sebagai subscriber (fan-out ke beberapa callback)
+    def __call__(self, record):
+        for callback in self.subscribers:
+            callback(record)
+
+
+class EventRecorder:
+    """Subscriber yang menyimpan semua event; bisa dipilih per nama event."""
+
+    def __init__(self, events=None):
+        self.only = set(events) if events else None
+        self.events = []
+
+    def __call__(self, record):
+        if self.only is None or record["event"] in self.only:
+            self.events.append(record)
+
+    def by_event(self, event):
+        return [e for e in self.events if e["event"] == event]
+
+    def to_jsonl(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for record in self.events:
+                f.write(json.dumps(record, default=_json_default) + "\n")
+
+
+LP_STOP_MESSAGES = {
+    "optimal": "LP relaxation optimal ✅",
+    "bound": "LP stopped: lower bound reaches LP objective (rounded up) ✅",
+    "time_limit": "LP stopped: time limit reached ⏱️",
+    "max_iterations": "Reached LP max iterations.",
+}
+
+
+class ConsoleReporter:
+    """Subscriber yang mencetak progress ke console (stdout default)."""
+
+    def __init__(self, stream=None, verbose=False):
+        self.stream = stream
+        self.verbose = verbose  # verbose: cetak juga pattern yang ditambahkan
+
+    def _print(self, text):
+        print(text, file=self.stream or sys.stdout)
+
+    def __call__(self, record):
+        event = record["event"]
+        if event == "lp_iteration":
+            reduced = record["best_reduced_cost"]
+            self._print(f"Iteration {record['iteration']}: LP Objective = {record['objective']:.6f} | "
+                        f"master {record['master_time']:.3f}s | pricing {record['pricing_time']:.3f}s | "
+                        f"+{record['columns_added']} columns "
+                        f"(best reduced cost {'-' if reduced is None else f'{reduced:.6g}'})")
+            if self.verbose:
+                for pattern in record.get("patterns", ()):
+                    self._print(f"  Added new pattern: {pattern}")
+        elif event == "lp_done":
+            reason = record.get("reason") or ("optimal" if record["converged"] else "max_iterations")
+            state = LP_STOP_MESSAGES.get(reason, f"LP stopped ({reason}).")
+            self._print(f"{state} objective = {record['objective']:.6f}, {record['columns']} columns")
+        elif event == "integer_result":
+            if record["feasible"]:
+                self._print(f"[Integer Phase] Attempt {record['attempt']}: feasible ✅ "
+                            f"(status={record['status']}, {record['integer_time']:.3f}s)")
+            else:
+                self._print(f"[Integer Phase] Attempt {record['attempt']}: infeasible ❌ "
+                            f"(status={record['status']}), +{record['columns_added']} columns")
+        elif event == "done":
+            if record["status"] != "feasible":
+                self._print("⚠️ Integer phase ended without feasible solution.")
+            elif record.get("gap_rel") is None:
+                self._print(f"Integer objective = {record['integer_objective']:g}")
+            else:
+                self._print(f"Integer objective = {record['integer_objective']:g} | "
+                            f"lower bound = {record['lower_bound']:g} | "
+                            f"gap = {100 * record['gap_rel']:.2f}%")
+
+
+def _json_default(value):
+    # numpy scalar / tuple pattern dll.
+    if hasattr(value, "item"):
+        return value.item()
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
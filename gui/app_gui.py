@@ -1,9 +1,14 @@
+import queue
+import threading
+import traceback
 import tkinter as tk
 from tkinter import ttk
 from tkinter import filedialog, messagebox
 from core import csv_repository
 from core.optimizer_service import OptimizerService
+from core.optimizer_strategy import OptimizationCancelled
 from gui.style_manager import StyleManager
+from gui.virtual_views import VirtualTreeview, BarDiagram
 
 class CuttingListApp:
     def __init__(self):
@@ -18,9 +23,19 @@ class CuttingListApp:
         self.scale = 1
         self.stocks = None
         self.result = None
+        self.solution = None  # (patterns, x_values, x_int) hasil optimasi terakhir
 
         self.optimizer = OptimizerService()
 
+        # Optimasi jalan di worker thread; progress dikirim lewat queue dan dibaca
+        # di main thread dengan root.after (Tk tidak thread-safe)
+        self.progress_queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.worker = None
+        self.polling = False
+        self.export_future = None  # Future export background terakhir (dicek di _poll_progress)
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+
         self.btn_frame = ttk.Frame(self.mainframe)
         self.btn_frame.grid(row=0, column=0, pady=10)
 
@@ -30,12 +45,18 @@ class CuttingListApp:
         ttk.Button(self.btn_frame, text="Import Stocks",
                    command=self.import_stocks
                    ).grid(row=0, column=1)
-        ttk.Button(self.btn_frame, text="Optimize",
-                   command=self.optimize
-                   ).grid(row=0, column=2)
+        self.btn_optimize = ttk.Button(self.btn_frame, text="Optimize",
+                                       command=self.optimize)
+        self.btn_optimize.grid(row=0, column=2)
+        self.btn_cancel = ttk.Button(self.btn_frame, text="Cancel",
+                                     command=self.cancel_optimize, state=tk.DISABLED)
+        self.btn_cancel.grid(row=0, column=3)
         ttk.Button(self.btn_frame, text="Export Result",
                    command=self.export_csv
-                   ).grid(row=0, column=3)
+                   ).grid(row=0, column=4)
+
+        self.status_var = tk.StringVar(value="Ready")
+        ttk.Label(self.mainframe, textvariable=self.status_var).grid(row=2, column=0, sticky=tk.W, padx=8)
         
         self.data_frame = ttk.Frame(self.mainframe)
         self.data_frame.grid(row=1, column=0)
@@ -43,54 +64,158 @@ class CuttingListApp:
         # DATA FRAME
         ttk.Label(self.data_frame, text="Required Parts:").grid(row=0, column=0)
         self.columns_part = ("_i", "Type", "Length", "Quantity")
-        self.tree_required_parts = ttk.Treeview(self.data_frame, columns=self.columns_part, show="headings")
+        # view virtual: hanya baris terlihat yang jadi item widget; sort (klik heading) dan
+        # filter (entry di atas tabel) dikerjakan pada array
+        self.tree_required_parts = VirtualTreeview(self.data_frame, self.columns_part)
         self.tree_required_parts.grid(row=1, column=0, padx=8, pady=4)
-        for col in self.columns_part:
-            self.tree_required_parts.heading(col, text=col.capitalize())
-            self.tree_required_parts.column(col, width=100, anchor="center")
 
         ttk.Label(self.data_frame, text="Stocks:").grid(row=0, column=1)
         self.columns_stock = ("_k", "Length", "Quantity")
-        self.tree_stocks = ttk.Treeview(self.data_frame, columns=self.columns_stock, show="headings")
+        self.tree_stocks = VirtualTreeview(self.data_frame, self.columns_stock)
         self.tree_stocks.grid(row=1, column=1, padx=8, pady=4)
-        for col in self.columns_stock:
-            self.tree_stocks.heading(col, text=col.capitalize())
-            self.tree_stocks.column(col, width=100, anchor="center")
 
         ttk.Label(self.data_frame, text="Result:").grid(row=0, column=2)
-        self.listbox = tk.Listbox(self.data_frame, width=80, height=30)
-        self.listbox.grid(row=1, column=2, padx=8, pady=4)
+        self.result_tabs = ttk.Notebook(self.data_frame)
+        self.result_tabs.grid(row=1, column=2, padx=8, pady=4)
+        self.columns_result = ("Pattern", "Stock", "Bars", "Waste", "Cuts")
+        self.tree_result = VirtualTreeview(self.result_tabs, self.columns_result, column_width=80)
+        self.tree_result.tree.column("Cuts", width=300, anchor="w")
+        self.result_tabs.add(self.tree_result, text="Patterns")
+        self.bar_diagram = BarDiagram(self.result_tabs, width=600, height=420)
+        self.result_tabs.add(self.bar_diagram, text="Diagram")
 
     
     def import_required_parts(self):  
         filename = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
         if filename:
-            self.required_parts, self.scale = csv_repository.load_required_parts_aggreageted(filename)
+            self.required_parts, self.scale = csv_repository.load_required_parts_table(filename)
             messagebox.showinfo("Info", f"{len(self.required_parts)} required part loaded")
         if self.required_parts:
-            for i in self.tree_required_parts.get_children():
-                self.tree_required_parts.delete(i)
-            for i, part in enumerate(self.required_parts):
-                self.tree_required_parts.insert("", tk.END, values=(i, part.part_type, part.length, part.quantity))
+            parts = self.required_parts  # PartTable: kolom langsung jadi data view
+            self.tree_required_parts.set_data({
+                "_i": range(len(parts)),
+                "Type": parts.part_types(),
+                "Length": parts.length,
+                "Quantity": parts.quantity,
+            })
         
 
     def import_stocks(self):
         filename = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
         if filename:
-            self.stocks = csv_repository.load_stocks_aggregated(filename, 1)
+            self.stocks = csv_repository.load_stocks_table(filename, 1)
             messagebox.showinfo("Info", f"{len(self.stocks)} stocks loaded")
         if self.stocks:
-            for k in self.tree_stocks.get_children():
-                self.tree_stocks.delete(k)
-            for k, stock in enumerate(self.stocks):
-                self.tree_stocks.insert("", tk.END, values=(k, stock.length, stock.quantity))
+            self.tree_stocks.set_data({
+                "_k": range(len(self.stocks)),
+                "Length": self.stocks.length,
+                "Quantity": self.stocks.quantity,  # -1 = tanpa batas (UNLIMITED)
+            })
 
     def optimize(self):
         if not self.required_parts or not self.stocks:
             messagebox.showerror("Error", "Import Required Parts dan stocks dulu")
             return
-        self.result = self.optimizer.run(self.required_parts, self.stocks)
-        self.show_result()
+        if self.worker is not None and self.worker.is_alive():
+            return
+
+        self.cancel_event.clear()
+        self.btn_optimize.config(state=tk.DISABLED)
+        self.btn_cancel.config(state=tk.NORMAL)
+        self.status_var.set("Optimizing...")
+        self.worker = threading.Thread(
+            target=self._optimize_worker,
+            args=(self.required_parts, self.stocks),  # tabel read-only, tidak perlu disalin
+            daemon=True,
+        )
+        self.worker.start()
+        if not self.polling:
+            self.polling = True
+            self.root.after(100, self._poll_progress)
+
+    def _optimize_worker(self, required_parts, stocks):
+        """Jalan di worker thread: jangan sentuh widget Tk di sini, cukup kirim ke queue."""
+        try:
+            # export ke output/ lewat writer thread: hasil tampil tanpa menunggu tulis file
+            self.optimizer.run(required_parts, stocks,
+                               progress_callback=lambda event: self.progress_queue.put(("progress", event)),
+                               cancel_event=self.cancel_event, export_mode="background")
+            self.progress_queue.put(("done", (self.optimizer.last_solution, self.optimizer.last_export)))
+        except OptimizationCancelled:
+            self.progress_queue.put(("cancelled", None))
+        except Exception:
+            self.progress_queue.put(("error", traceback.format_exc()))
+
+    def _poll_progress(self):
+        """Dipanggil di main thread via root.after; ambil semua pesan dari worker."""
+        finished = False
+        try:
+            while True:
+                kind, payload = self.progress_queue.get_nowait()
+                if kind == "progress":
+                    if payload["event"] == "lp_iteration":
+                        self.status_var.set(f"LP iteration {payload['iteration']}: "
+                                            f"objective = {payload['objective']:.2f} | "
+                                            f"columns = {payload['columns']}")
+                    elif payload["event"] == "integer_attempt":
+                        self.status_var.set(f"Integer phase attempt {payload['attempt']} | "
+                                            f"columns = {payload['columns']}")
+                elif kind == "done":
+                    finished = True
+                    self.solution, self.export_future = payload
+                    self.result = self.solution[0]
+                    self.show_result()
+                    self.status_var.set(f"Done: {len(self.result)} patterns | exporting...")
+                elif kind == "cancelled":
+                    finished = True
+                    self.status_var.set("Optimization cancelled")
+                else:
+                    finished = True
+                    self.status_var.set("Optimization failed")
+                    messagebox.showerror("Error", payload)
+        except queue.Empty:
+            pass
+
+        if finished:
+            self.btn_optimize.config(state=tk.NORMAL)
+            self.btn_cancel.config(state=tk.DISABLED)
+        # loop jalan terus selama optimasi atau export background belum selesai
+        running = self.worker is not None and self.worker.is_alive() or not self.progress_queue.empty()
+        exporting = self._check_export()
+        if running or exporting:
+            self.root.after(100, self._poll_progress)
+        else:
+            self.polling = False
+
+    def _check_export(self):
+        """Status export background (writer thread) ke status bar; return True bila masih jalan."""
+        future = self.export_future
+        if future is None:
+            return False
+        if not future.done():
+            return True
+        self.export_future = None
+        error = future.exception()
+        if error is not None:
+            self.status_var.set(f"Done: {len(self.result)} patterns | export failed: {error}")
+        else:
+            self.status_var.set(f"Done: {len(self.result)} patterns | exported to output/")
+        return False
+
+    def close(self):
+        """Tutup window: tunggu export background selesai dan hentikan writer thread."""
+        self.cancel_event.set()
+        try:
+            self.optimizer.close()
+        except Exception:
+            traceback.print_exc()  # error export sudah tampil di status bar
+        self.root.destroy()
+
+    def cancel_optimize(self):
+        # berhenti di batas iterasi berikutnya (solve LP/CBC yang sedang jalan diselesaikan dulu)
+        self.cancel_event.set()
+        self.btn_cancel.config(state=tk.DISABLED)
+        self.status_var.set("Cancelling...")
     
     def export_csv(self):
         if not self.result:
@@ -101,10 +226,29 @@ class CuttingListApp:
             csv_repository.save_result([b["pieces"] for b in self.result], filename, self.scale)
 
     def show_result(self):
-        self.listbox.delete(0, tk.END)
-        for i, b in enumerate(self.result):
-            # used = sum(p.length for p in b["pieces"])
-            self.listbox.insert(tk.END, f"stock length: {b["stock_length"]} | pattern: {b["pattern"]} | waste: {b["waste"]}")
+        """Pattern aktif (x > 0) ke tabel hasil dan diagram batang; keduanya virtual."""
+        from core.plan_export import CutPlan
+        patterns, x_values, x_int = self.solution
+        rows = CutPlan(patterns, x_int if x_int else x_values, self.required_parts).pattern_rows()
+        self.tree_result.set_data({
+            "Pattern": [r["pattern_id"] for r in rows],
+            "Stock": [r["stock_length"] for r in rows],
+            "Bars": [r["bars"] for r in rows],
+            "Waste": [r["waste"] for r in rows],
+            "Cuts": [" + ".join(f"{label} x{n}" for label, n in _count_cuts(r["cuts"])) for r in rows],
+        })
+        self.bar_diagram.set_plan(rows)
 
     def run(self):
-        self.root.mainloop()
\ No newline at end of file
+        self.root.mainloop()
+
+
+def _count_cuts(cuts):
+    """[(label, length), ...] urut potong → [(label, jumlah)] per label berurutan."""
+    counts = []
+    for label, _ in cuts:
+        if counts and counts[-1][0] == label:
+            counts[-1][1] += 1
+        else:
+            counts.append([label, 1])
+    return counts
\ No newline at end of file
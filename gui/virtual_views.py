@@ -0,0 +1,239 @@
+"""
+virtual_views.py
+View Tk untuk BOM dan plan besar yang hanya menggambar bagian yang terlihat (virtualized).
+
+- TableModel      : data tabel sebagai kolom numpy; sort dan filter dikerjakan pada array
+                    (urutan tampilan = array index baris), bukan pada item widget.
+- VirtualTreeview : ttk.Treeview dengan item sebanyak tinggi view saja; scroll / sort / filter
+                    hanya mengganti values item tersebut dari window model yang terlihat.
+- BarDiagram      : Canvas diagram batang plan (satu baris per batang fisik); hanya batang
+                    di area terlihat yang digambar ulang saat scroll / resize.
+
+Widget tidak tahu jumlah baris sebenarnya, jadi posisi scrollbar dihitung sendiri
+(scroll_window) dari jumlah baris model dan tinggi view.
+"""
+
+import numpy as np
+import tkinter as tk
+from tkinter import ttk
+
+FILTER_DELAY_MS = 150  # tunggu ketikan berhenti sebelum filter dijalankan
+PART_COLORS = ("#8ecae6", "#ffb703", "#90be6d", "#f4a261", "#cdb4db", "#a8dadc", "#e9c46a", "#b7e4c7")
+WASTE_COLOR = "#e63946"
+
+
+def scroll_window(first, total, visible, *args):
+    """
+    Baris pertama baru dari perintah scrollbar Tk: ("moveto", fraction) atau
+    ("scroll", n, "units" / "pages"); dibatasi supaya window tetap di dalam data.
+    """
+    if args[0] == "moveto":
+        first = int(round(float(args[1]) * total))
+    elif args[0] == "scroll":
+        first += int(args[1]) * (max(1, visible - 1) if args[2] == "pages" else 1)
+    return max(0, min(first, total - visible))
+
+
+def _bind_wheel(widget, callback):
+    """callback(step) untuk mouse wheel (Windows/macOS: <MouseWheel>, X11: Button-4/5)."""
+    widget.bind("<MouseWheel>", lambda e: callback(-1 if e.delta > 0 else 1) or "break")
+    widget.bind("<Button-4>", lambda e: callback(-1) or "break")
+    widget.bind("<Button-5>", lambda e: callback(1) or "break")
+
+
+class TableModel:
+    def __init__(self, columns, data=None):
+        self.columns = tuple(columns)
+        self.set_data(data or {c: [] for c in self.columns})
+
+    def set_data(self, data):
+        """data: dict kolom -> sequence (panjang sama). Sort dan filter di-reset."""
+        self.data = {c: np.asarray(data[c]) for c in self.columns}
+        self.size = len(self.data[self.columns[0]]) if self.columns else 0
+        self._text = {}  # kolom -> string lowercase (cache untuk filter)
+        self.sort_column = None
+        self.descending = False
+        self.query = ""
+        self.view = np.arange(self.size)
+
+    def __len__(self):
+        return len(self.view)
+
+    def sort(self, column, descending=None):
+        """Sort stabil per kolom; descending None = toggle bila kolom sama."""
+        if descending is None:
+            descending = not self.descending if column == self.sort_column else False
+        self.sort_column, self.descending = column, descending
+        self._refresh()
+
+    def filter(self, query):
+        """Tampilkan baris yang salah satu kolomnya mengandung query (case-insensitive)."""
+        self.query = query.strip().lower()
+        self._refresh()
+
+    def _lower(self, column):
+        if column not in self._text:
+            values = self.data[column]
+            # kolom angka tidak perlu lower(); np.strings (ufunc numpy 2) jauh lebih cepat dari np.char
+            text = values.astype(str)
+            self._text[column] = text if values.dtype.kind in "iuf" else np.strings.lower(text)
+        return self._text[column]
+
+    def _refresh(self):
+        view = np.arange(self.size)
+        if self.query:
+            mask = np.zeros(self.size, dtype=bool)
+            for column in self.columns:
+                mask |= np.strings.find(self._lower(column), self.query) >= 0
+            view = view[mask]
+        if self.sort_column is not None:
+            keys = self.data[self.sort_column][view]
+            if self.descending:
+                # argsort stabil dari urutan terbalik: baris dengan key sama tetap urut asli
+                order = len(keys) - 1 - np.argsort(keys[::-1], kind="stable")[::-1]
+            else:
+                order = np.argsort(keys, kind="stable")
+            view = view[order]
+        self.view = view
+
+    def rows(self, start, stop):
+        """Baris view[start:stop] sebagai list tuple (nilai Python)."""
+        index = self.view[start:stop]
+        return list(zip(*(self.data[c][index].tolist() for c in self.columns)))
+
+
+class VirtualTreeview(ttk.Frame):
+    def __init__(self, parent, columns, height=20, column_width=100, filter_box=True):
+        super().__init__(parent)
+        self.model = TableModel(columns)
+        self.height = height
+        self.first = 0
+        self._filter_job = None
+
+        row = 0
+        if filter_box:
+            self.filter_var = tk.StringVar()
+            ttk.Entry(self, textvariable=self.filter_var).grid(row=0, column=0, columnspan=2, sticky=tk.EW)
+            self.filter_var.trace_add("write", lambda *_: self._schedule_filter())
+            row = 1
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", height=height)
+        self.tree.grid(row=row, column=0, sticky=tk.NSEW)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.scrollbar.grid(row=row, column=1, sticky=tk.NS)
+        for col in columns:
+            self.tree.heading(col, text=col.capitalize(), command=lambda c=col: self.sort(c))
+            self.tree.column(col, width=column_width, anchor="center")
+        _bind_wheel(self.tree, lambda step: self.yview("scroll", step, "units"))
+        self._items = []
+
+    def set_data(self, data):
+        """Ganti isi tabel (dict kolom -> sequence); hanya window terlihat yang di-render."""
+        self.model.set_data(data)
+        self.first = 0
+        self.render()
+
+    def sort(self, column):
+        self.model.sort(column)
+        self.first = 0
+        self.render()
+
+    def _schedule_filter(self):
+        if self._filter_job is not None:
+            self.after_cancel(self._filter_job)
+        self._filter_job = self.after(FILTER_DELAY_MS, self._apply_filter)
+
+    def _apply_filter(self):
+        self._filter_job = None
+        self.model.filter(self.filter_var.get())
+        self.first = 0
+        self.render()
+
+    def yview(self, *args):
+        self.first = scroll_window(self.first, len(self.model), self.height, *args)
+        self.render()
+
+    def render(self):
+        rows = self.model.rows(self.first, self.first + self.height)
+        # item Treeview sebanyak baris terlihat saja; dipakai ulang antar scroll
+        while len(self._items) < len(rows):
+            self._items.append(self.tree.insert("", tk.END))
+        while len(self._items) > len(rows):
+            self.tree.delete(self._items.pop())
+        for item, values in zip(self._items, rows):
+            self.tree.item(item, values=values)
+        total = max(1, len(self.model))
+        self.scrollbar.set(self.first / total, min(1.0, (self.first + self.height) / total))
+
+
+def bar_window(bar_ends, first, count):
+    """(nomor batang, index row) untuk batang first..first+count-1; bar_ends = cumsum batang per row."""
+    total = int(bar_ends[-1]) if len(bar_ends) else 0
+    bars = np.arange(first, min(first + count, total))
+    return list(zip(bars.tolist(), np.searchsorted(bar_ends, bars, side="right").tolist()))
+
+
+class BarDiagram(ttk.Frame):
+    BAR_HEIGHT = 18
+    BAR_GAP = 6
+    MARGIN = 8
+    LABEL_WIDTH = 80
+
+    def __init__(self, parent, width=600, height=400):
+        super().__init__(parent)
+        self.canvas = tk.Canvas(self, width=width, height=height, background="white", highlightthickness=0)
+        self.canvas.grid(row=0, column=0, sticky=tk.NSEW)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.scrollbar.grid(row=0, column=1, sticky=tk.NS)
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+        self.canvas.bind("<Configure>", lambda e: self.redraw())
+        _bind_wheel(self.canvas, lambda step: self.yview("scroll", step, "units"))
+        self.set_plan([])
+
+    def set_plan(self, rows):
+        """rows: CutPlan.pattern_rows(); batang digambar berurutan per pattern."""
+        self.rows = [row for row in rows if row["bars"] > 0]
+        self.bar_ends = np.cumsum([row["bars"] for row in self.rows], dtype=np.int64)
+        self.max_length = max((row["stock_length"] for row in self.rows), default=1) or 1
+        self.colors = {}
+        for row in self.rows:
+            for label, _ in row["cuts"]:
+                self.colors.setdefault(label, PART_COLORS[len(self.colors) % len(PART_COLORS)])
+        self.first = 0
+        self.redraw()
+
+    @property
+    def n_bars(self):
+        return int(self.bar_ends[-1]) if len(self.bar_ends) else 0
+
+    def visible_bars(self):
+        height = max(self.canvas.winfo_height(), int(self.canvas["height"]))
+        return max(1, (height - 2 * self.MARGIN) // (self.BAR_HEIGHT + self.BAR_GAP) + 1)
+
+    def yview(self, *args):
+        self.first = scroll_window(self.first, self.n_bars, self.visible_bars(), *args)
+        self.redraw()
+
+    def redraw(self):
+        canvas = self.canvas
+        canvas.delete("all")
+        visible = self.visible_bars()
+        width = max(canvas.winfo_width(), int(canvas["width"]))
+        scale = (width - self.LABEL_WIDTH - 2 * self.MARGIN) / self.max_length
+        for n, (bar, r) in enumerate(bar_window(self.bar_ends, self.first, visible)):
+            row = self.rows[r]
+            y = self.MARGIN + n * (self.BAR_HEIGHT + self.BAR_GAP)
+            canvas.create_text(self.MARGIN, y + self.BAR_HEIGHT / 2, anchor=tk.W,
+                               text=f"{bar + 1}  {row['pattern_id']}")
+            x0 = x = self.MARGIN + self.LABEL_WIDTH
+            for label, length in row["cuts"]:
+                w = length * scale
+                canvas.create_rectangle(x, y, x + w, y + self.BAR_HEIGHT, fill=self.colors[label])
+                if w > 8 * len(str(label)):
+                    canvas.create_text(x + w / 2, y + self.BAR_HEIGHT / 2, text=label)
+                x += w
+            end = x0 + row["stock_length"] * scale
+            if end - x > 0.5:
+                canvas.create_rectangle(x, y, end, y + self.BAR_HEIGHT, fill=WASTE_COLOR, stipple="gray50")
+        total = max(1, self.n_bars)
+        self.scrollbar.set(self.first / total, min(1.0, (self.first + visible) / total))
@@ -0,0 +1,99 @@
+import json
+import os
+import shutil
+import ezdxf
+import pytest
+from core import cad_generator
+from core.cad_generator import (CADGenerator, clear_template_cache, generate_plan_drawing, generate_plan_sheets,
+                                paginate_plan)
+from core.entities import Parts
+from core.optimizer_strategy.pattern_pool import PatternPool
+
+
+@pytest.fixture
+def template(tmp_path):
+    path = tmp_path / "template.dxf"
+    doc = ezdxf.new()
+    doc.modelspace().add_line((0, 0), (10, 0))
+    doc.saveas(path)
+    clear_template_cache()
+    yield str(path)
+    clear_template_cache()
+
+
+def test_template_parsed_once_per_file_version(template, monkeypatch):
+    calls = []
+    readfile = ezdxf.readfile
+    monkeypatch.setattr(cad_generator.ezdxf, "readfile", lambda path: calls.append(path) or readfile(path))
+
+    first = CADGenerator(template)
+    first.msp.add_line((0, 0), (1, 1))
+    second = CADGenerator(template)
+    assert len(calls) == 1
+    assert len(second.msp) == 1  # salinan sendiri, tidak ikut berubah
+
+    # file template berubah → parse ulang
+    doc = ezdxf.readfile(template)
+    doc.modelspace().add_circle((0, 0), 5)
+    doc.saveas(template)
+    os.utime(template, ns=(os.stat(template).st_atime_ns, os.stat(template).st_mtime_ns + 10**9))
+    assert len(CADGenerator(template).msp) == 2
+    assert len(calls) == 3  # readfile di test + parse ulang
+
+
+def test_patterns_become_blocks_with_one_insert_per_bar(template, tmp_path):
+    parts = [Parts("A", 1450, 8), Parts("B", 900, 3)]
+    pool = PatternPool([1450, 900], [5800])
+    pool.add(0, (4, 0))
+    pool.add(0, (0, 6))
+    pool.add(0, (2, 3))
+    output = tmp_path / "out" / "plan.dxf"
+
+    generate_plan_drawing(pool, [2, 0, 1], parts, str(output), template_path=template)
+
+    doc = ezdxf.readfile(output)
+    inserts = doc.modelspace().query("INSERT")
+    assert sorted(i.dxf.name for i in inserts) == ["PATTERN_P1", "PATTERN_P1", "PATTERN_P3"]
+    assert "PATTERN_P2" not in doc.blocks  # pattern dengan x = 0 tidak digambar
+    block = doc.blocks.get("PATTERN_P3")
+    assert len(block.query("LWPOLYLINE")) == 1 + 5  # outline batang + 5 potongan
+    assert {"STOCK", "PARTS", "TEXT", "WASTE"} <= {layer.dxf.name for layer in doc.layers}
+
+
+def test_paginate_plan_splits_by_stock_length_and_bar_count():
+    rows = [{"pattern_id": "P1", "stock_length": 4000, "cuts": [], "bars": 5},
+            {"pattern_id": "P2", "stock_length": 6000, "cuts": [], "bars": 3},
+            {"pattern_id": "P3", "stock_length": 4000, "cuts": [], "bars": 0}]
+
+    sheets = paginate_plan(rows, bars_per_sheet=2)
+    assert [s["stock_length"] for s in sheets] == [6000, 6000, 4000, 4000, 4000]
+    assert [[(r["pattern_id"], r["bars"]) for r in s["rows"]] for s in sheets] == [
+        [("P2", 2)], [("P2", 1)], [("P1", 2)], [("P1", 2)], [("P1", 1)]]
+
+    mixed = paginate_plan(rows, bars_per_sheet=4, by_stock_length=False)
+    assert [[(r["pattern_id"], r["bars"]) for r in s["rows"]] for s in mixed] == [
+        [("P1", 4)], [("P1", 1), ("P2", 3)]]
+    assert mixed[1]["stock_length"] is None
+
+
+def test_plan_sheets_written_in_parallel_with_manifest(template, tmp_path):
+    parts = [Parts("A", 1450, 20), Parts("B", 900, 9)]
+    pool = PatternPool([1450, 900], [5800, 4000])
+    pool.add(0, (4, 0))
+    pool.add(1, (0, 4))
+    pool.add(0, (2, 3))
+    output = tmp_path / "sheets"
+
+    manifest = generate_plan_sheets(pool, [4, 1.5, 2], parts, str(output), bars_per_sheet=3,
+                                    workers=2, template_path=template, project_name="Demo")
+
+    assert manifest["total_bars"] == 8
+    assert [(s["stock_length"], s["bars"], s["first_bar"], s["last_bar"]) for s in manifest["sheets"]] == [
+        (5800, 3, 1, 3), (5800, 3, 4, 6), (4000, 2, 7, 8)]
+    assert manifest["sheets"][1]["patterns"] == [{"pattern_id": "P1", "bars": 1}, {"pattern_id": "P3", "bars": 2}]
+    assert json.loads((output / "sheets.json").read_text()) == manifest
+    for sheet in manifest["sheets"]:
+        doc = ezdxf.readfile(output / sheet["file"])
+        assert len(doc.modelspace().query("INSERT")) == sheet["bars"]
+        assert len(doc.modelspace().query("LINE")) == 1  # isi template ikut di tiap sheet
+        assert "Sheet %d of 3" % sheet["sheet"] in doc.layouts
@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+from core.cli import main
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+DATA_DIR = os.path.join(ROOT, "test_data")
+
+def test_cli_solve_writes_output(tmp_path, capsys):
+    out_dir = tmp_path / "out"
+    code = main(["solve",
+                 os.path.join(DATA_DIR, "test_solver_required_parts.csv"),
+                 os.path.join(DATA_DIR, "test_solver_stocks.csv"),
+                 "--out", str(out_dir)])
+    assert code == 0
+    assert (out_dir / "pattern_summary.csv").exists()
+    assert (out_dir / "cut_trace_detail.csv").exists()
+    assert "bars" in capsys.readouterr().out
+
+def test_cli_import_is_headless_and_lazy():
+    """Import entry point CLI tidak boleh menarik tkinter, pandas, atau pulp."""
+    code = "import sys, core.cli; print(sorted(m for m in ('tkinter', 'pandas', 'pulp', 'numpy') if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+def test_cli_writes_event_trace(tmp_path):
+    trace = tmp_path / "trace.jsonl"
+    main(["solve",
+          os.path.join(DATA_DIR, "test_solver_required_parts.csv"),
+          os.path.join(DATA_DIR, "test_solver_stocks.csv"),
+          "--out", str(tmp_path / "out"), "--trace", str(trace)])
+    lines = trace.read_text().splitlines()
+    assert '"event": "start"' in lines[0]
+    assert '"event": "done"' in lines[-1]
+
+def test_cli_ffd_strategy(tmp_path, capsys):
+    out_dir = tmp_path / "out"
+    code = main(["solve",
+                 os.path.join(DATA_DIR, "8SW_cutting_list.csv"),
+                 os.path.join(DATA_DIR, "8SW_stock.csv"),
+                 "--out", str(out_dir), "--strategy", "ffd"])
+    assert code == 0
+    assert (out_dir / "pattern_summary.csv").exists()
+    assert "gap to lower bound" in capsys.readouterr().out
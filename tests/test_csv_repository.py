@@ -79,3 +79,43 @@ def test_load_stocks_quantity_multiple(data_dir):
     assert all(s.length == 1000 for s in stocks)
     assert all(s.quantity == 1 for s in stocks)
 
+
+def test_load_required_parts_columns_stays_aggregated(data_dir):
+    """Loader kolom: satu baris per part, quantity tidak di-expand, length sudah di-scale."""
+    from core.csv_repository import load_required_parts_columns
+    part_types, lengths, quantities, unit_scale = load_required_parts_columns(
+        os.path.join(data_dir, "test_basic.csv"))
+    assert unit_scale == 10
+    assert part_types == ["A", "B"]
+    assert lengths.tolist() == [10, 25]
+    assert quantities.tolist() == [2, 1]
+
+@pytest.mark.parametrize("engine", ["csv", "pandas"])
+def test_chunked_load_matches_single_read(tmp_path, engine):
+    """Skala ditentukan dari seluruh file, walau desimal terpanjang ada di chunk terakhir."""
+    from core.csv_repository import load_required_parts_aggreageted
+    path = tmp_path / "bom.csv"
+    rows = [f"P{i},{100 + i},{i % 3 + 1}" for i in range(10)] + ["Q,12.25,4"]
+    path.write_text("part_type,length,quantity\n" + "\n".join(rows) + "\n")
+
+    full = load_required_parts_aggreageted(str(path), engine=engine)
+    chunked = load_required_parts_aggreageted(str(path), engine=engine, chunksize=3)
+    assert chunked == full
+    parts, unit_scale = full
+    assert unit_scale == 100
+    assert parts[0].length == 10000
+    assert parts[-1].length == 1225
+
+def test_table_loaders_match_aggregated_loaders(tmp_path):
+    from core.csv_repository import (load_required_parts_aggreageted, load_required_parts_table,
+                                     load_stocks_aggregated, load_stocks_table)
+    parts_csv = tmp_path / "bom.csv"
+    parts_csv.write_text("part_type,length,quantity\nA,1.5,2\nB,2.25,1\nA,3,4\n")
+    stocks_csv = tmp_path / "stocks.csv"
+    stocks_csv.write_text("length,quantity\n6,10\n4.5,3\n")
+
+    parts, unit_scale = load_required_parts_aggreageted(str(parts_csv))
+    table, table_scale = load_required_parts_table(str(parts_csv))
+    assert table_scale == unit_scale
+    assert table.to_parts() == parts
+    assert load_stocks_table(str(stocks_csv), unit_scale).to_stocks() == load_stocks_aggregated(str(stocks_csv), unit_scale)
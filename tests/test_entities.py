@@ -0,0 +1,60 @@
+import pickle
+import pytest
+import numpy as np
+from core.entities import Parts, PartTable, Stock, StockTable, UNLIMITED, as_part_table, as_stock_table
+
+
+def test_part_table_interns_types_and_adapts_to_parts():
+    parts = [Parts("B", 900, 3), Parts("A", 1450, 2), Parts("B", 600, 5)]
+    table = as_part_table(parts)
+    assert table.types.tolist() == ["B", "A"]  # urutan kemunculan pertama
+    assert table.type_code.tolist() == [0, 1, 0]
+    assert len(table) == 3 and table[1] == Parts("A", 1450, 2)
+    assert list(table) == parts and table.to_parts() == parts
+    assert as_part_table(table) is table
+
+    subset = table[table.length < 1000]
+    assert isinstance(subset, PartTable) and subset.part_types() == ["B", "B"]
+    assert subset == PartTable.from_columns(["B", "B"], [900, 600], [3, 5])
+    assert hash(subset) == hash(PartTable.from_columns(["B", "B"], [900, 600], [3, 5]))
+    assert subset != PartTable.from_columns(["B", "C"], [900, 600], [3, 5])
+
+
+def test_tables_are_read_only_and_pickle_as_columns():
+    lengths = np.array([900, 1450])
+    table = PartTable.from_columns(["A", "B"], lengths, [1, 2])
+    assert not table.length.flags.writeable
+    lengths[0] = 1  # array milik caller tidak ikut dikunci
+    restored = pickle.loads(pickle.dumps(table))
+    assert restored == table and not restored.quantity.flags.writeable
+
+
+def test_stock_table_keeps_unlimited_quantity():
+    stocks = [Stock(6000, None), Stock(4000, 3)]
+    table = as_stock_table(stocks)
+    assert table.quantity.tolist() == [UNLIMITED, 3]
+    assert table.limits() == [None, 3]
+    assert table.cost.tolist() == [6000, 4000]  # cost default = panjang stock
+    assert list(table) == stocks and table[0] == Stock(6000, None)
+    assert table[1:] == StockTable([4000], [3])
+    assert pickle.loads(pickle.dumps(table)) == table
+
+
+def test_column_generation_accepts_tables():
+    from core.optimizer_strategy import ColumnGeneration
+    parts = [Parts("A", 1450, 5), Parts("B", 900, 7), Parts("C", 600, 4)]
+    stocks = [Stock(6000, None), Stock(4000, 2)]
+    from_list = ColumnGeneration().optimize(parts, stocks)
+    from_table = ColumnGeneration().optimize(as_part_table(parts), as_stock_table(stocks))
+    assert list(from_table[2]) == list(from_list[2])
+    assert from_table[0].matrix.tolist() == from_list[0].matrix.tolist()
+
+
+def test_tables_reject_non_integral_values():
+    with pytest.raises(ValueError):
+        PartTable.from_parts([Parts("A", 14.5, 2)])
+    with pytest.raises(ValueError):
+        StockTable([6000.25], [1])
+    with pytest.raises(ValueError):
+        PartTable.from_columns(["A"], [float("nan")], [1])
+    assert PartTable.from_columns(["A"], np.array([14.0]), [2])[0] == Parts("A", 14, 2)
@@ -0,0 +1,73 @@
+import random
+import numpy as np
+import pytest
+from core.entities import Parts, Stock
+from core.optimizer_strategy import ModifiedFirstFitDecreasing, OptimizationCancelled, OptimizerStrategy
+from core.optimizer_strategy.modified_first_fit_decreasing import ResidualTree
+
+
+def _first_fit_linear(lengths, capacity):
+    """Referensi FFD per unit dengan scan linear."""
+    residuals = []
+    for length in sorted(lengths, reverse=True):
+        for b, residual in enumerate(residuals):
+            if residual >= length:
+                residuals[b] -= length
+                break
+        else:
+            residuals.append(capacity - length)
+    return len(residuals)
+
+
+def test_residual_tree_first_fit_and_grow():
+    tree = ResidualTree(capacity=2)
+    for residual in (3, 8, 5):  # bar ketiga memaksa tree tumbuh
+        tree.open(residual)
+    assert tree.first_fit(4) == 1
+    assert tree.first_fit(9) is None
+    tree.update(1, 2)
+    assert tree.first_fit(4) == 2
+
+
+def test_matches_linear_first_fit_decreasing():
+    rng = random.Random(7)
+    parts = [Parts(f"P{i}", rng.randint(50, 700), rng.randint(1, 9)) for i in range(60)]
+    strategy = ModifiedFirstFitDecreasing()
+    assert isinstance(strategy, OptimizerStrategy)
+    pool, x_values, x_int = strategy.optimize(parts, [Stock(1000, None)])
+
+    np.testing.assert_array_equal(np.asarray(x_int) @ pool.matrix, [p.quantity for p in parts])
+    expanded = [p.length for p in parts for _ in range(p.quantity)]
+    assert sum(x_int) == _first_fit_linear(expanded, 1000)
+    assert x_values == [float(x) for x in x_int]
+
+
+def test_multiple_stocks_respect_limits_and_downsize():
+    parts = [Parts("A", 450, 6), Parts("B", 200, 3)]
+    stocks = [Stock(1000, 2), Stock(600, 10)]
+    strategy = ModifiedFirstFitDecreasing()
+    pool, _, x_int = strategy.optimize(parts, stocks)
+    x_int = np.asarray(x_int)
+
+    np.testing.assert_array_equal(x_int @ pool.matrix, [6, 3])
+    assert x_int[pool.stock_index == 0].sum() <= 2
+    # batang yang isinya muat di stock 600 dipindah ke stock 600
+    used = pool.stock_lengths[pool.stock_index] - pool.waste
+    assert np.all(used[pool.stock_index == 0] > 600)
+    assert strategy.last_stats["integer_objective"] >= strategy.last_stats["lower_bound"]
+
+
+def test_raises_when_stock_runs_out_or_part_too_long():
+    with pytest.raises(ValueError):
+        ModifiedFirstFitDecreasing().optimize([Parts("A", 600, 3)], [Stock(1000, 2)])
+    with pytest.raises(ValueError):
+        ModifiedFirstFitDecreasing().optimize([Parts("A", 1200, 1)], [Stock(1000, 5)])
+
+
+def test_cancel_event_stops_packing():
+    import threading
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(OptimizationCancelled):
+        ModifiedFirstFitDecreasing().optimize([Parts("A", 100, 5)], [Stock(1000, None)],
+                                               cancel_event=cancel)
@@ -0,0 +1,113 @@
+import os
+import pytest
+from core.optimizer_service import OptimizerService, BatchJob
+from core.entities import Parts, Stock
+
+@pytest.fixture
+def data_dir():
+    base_dir = os.path.dirname(__file__)
+    return os.path.join(base_dir, "..", "test_data")
+
+def test_run_batch_keeps_order_and_isolates_failures(tmp_path, data_dir):
+    good = BatchJob.from_csv(os.path.join(data_dir, "test_solver_required_parts.csv"),
+                             os.path.join(data_dir, "test_solver_stocks.csv"))
+    small = BatchJob([Parts("A", 3, 4), Parts("B", 5, 2)], [Stock(10, 3)], name="small")
+    # part lebih panjang dari stock → ValueError di strategy, job lain tetap jalan
+    bad = BatchJob([Parts("A", 15, 1)], [Stock(10, 1)], name="bad")
+
+    results = OptimizerService().run_batch([good, bad, small], workers=2, output_root=str(tmp_path))
+
+    assert [r.name for r in results] == ["test_solver_required_parts", "bad", "small"]
+    assert results[0].ok and results[2].ok
+    assert not results[1].ok
+    assert "ValueError" in results[1].error
+    for r in (results[0], results[2]):
+        assert r.output_folder == os.path.join(str(tmp_path), r.name)
+        assert os.path.exists(os.path.join(r.output_folder, "pattern_summary.csv"))
+        assert os.path.exists(os.path.join(r.output_folder, "cut_trace_detail.csv"))
+    assert sum(results[2].x_int) == 3
+
+
+def test_service_selects_integer_mode():
+    service = OptimizerService(integer_mode="rounding")
+    assert service.strategy.get_params()["integer_mode"] == "rounding"
+    patterns, x_values, x_int = service.solve([Parts("A", 40, 5)], [Stock(100, 10)])
+    assert service.strategy.last_stats["integer_mode"] == "rounding"
+    assert sum(x_int) == 3
+
+    service.set_integer_mode("mip")
+    assert service.strategy.integer_mode == "mip"
+    with pytest.raises(ValueError):
+        service.set_integer_mode("fast")
+
+
+def test_run_export_modes(tmp_path):
+    parts, stocks = [Parts("A", 40, 5)], [Stock(100, 10)]
+    service = OptimizerService(export_mode="none")
+
+    patterns = service.run(parts, stocks, output_folder=str(tmp_path / "none"))
+    assert not (tmp_path / "none").exists()
+    assert service.last_solution[0] is patterns and sum(service.last_solution[2]) == 3
+
+    # sync: folder bertingkat yang belum ada dibuat
+    service.run(parts, stocks, output_folder=str(tmp_path / "sync" / "nested"), export_mode="sync")
+    assert (tmp_path / "sync" / "nested" / "cut_trace_detail.csv").exists()
+
+    service.run(parts, stocks, output_folder=str(tmp_path / "bg1"), export_mode="background")
+    service.run(parts, stocks, output_folder=str(tmp_path / "bg2"), export_mode="background",
+                trace_format="csv.gz")
+    paths = service.flush_exports()
+    assert [os.path.basename(p["cut_trace_detail"]) for p in paths] == ["cut_trace_detail.csv",
+                                                                        "cut_trace_detail.csv.gz"]
+    assert (tmp_path / "bg2" / "pattern_summary.csv").exists()
+    assert service.flush_exports() == []
+    service.close()
+
+
+def test_background_export_error_surfaces_on_flush(tmp_path):
+    service = OptimizerService(export_mode="background")
+    service.run([Parts("A", 40, 5)], [Stock(100, 10)], output_folder=str(tmp_path), trace_format="xlsx")
+    with pytest.raises(ValueError):
+        service.close()
+    with pytest.raises(ValueError):
+        OptimizerService(export_mode="later")
+
+
+def test_solve_does_not_cache_plan_that_misses_demand(tmp_path):
+    from core.solution_cache import SolutionCache
+
+    class ZeroPlan:
+        """Strategy palsu yang mengembalikan plan nol (mis. CBC infeasible)."""
+        calls = 0
+
+        def get_params(self):
+            return {}
+
+        def optimize(self, required_parts, stocks, progress_callback=None, cancel_event=None):
+            ZeroPlan.calls += 1
+            pattern = {"stock_index": 0, "stock_length": 10, "pattern": (3,), "waste": 1}
+            return [pattern], [0.0], [0]
+
+    parts, stocks = [Parts("A", 3, 4)], [Stock(10, None)]
+    service = OptimizerService(strategy=ZeroPlan(), cache=SolutionCache(tmp_path))
+    service.solve(parts, stocks)
+    service.solve(parts, stocks)
+    assert ZeroPlan.calls == 2
+
+    feasible = OptimizerService(cache=SolutionCache(tmp_path / "ok"))
+    feasible.solve(parts, stocks)
+    assert feasible.cache.get(parts, stocks, 1, feasible.strategy) is not None
+    patterns, _, x_int = feasible.solve(parts, stocks)
+    assert OptimizerService.covers_demand(patterns, x_int, parts)
+
+
+def test_run_batch_gives_same_named_jobs_their_own_folder(tmp_path):
+    parts, stocks = [Parts("A", 3, 4), Parts("B", 5, 2)], [Stock(10, 3)]
+    # mis. a/8SW_cutting_list.csv dan b/8SW_cutting_list.csv
+    jobs = [BatchJob(parts, stocks, name="8SW"), BatchJob(parts, stocks, name="8SW")]
+    results = OptimizerService().run_batch(jobs, workers=1, output_root=str(tmp_path))
+
+    assert [r.output_folder for r in results] == [str(tmp_path / "8SW"), str(tmp_path / "8SW_2")]
+    assert all(os.path.exists(os.path.join(r.output_folder, "pattern_summary.csv")) for r in results)
+    # job milik caller tidak diubah
+    assert jobs[0].output_folder is None and jobs[0].required_parts is parts and jobs[1].stocks is stocks
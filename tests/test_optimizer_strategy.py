@@ -1,5 +1,6 @@
 import pytest
 from core.optimizer_strategy import ColumnGeneration
+from core.optimizer_strategy.bounds import cost_granularity, round_up_cost
 from core.entities import Parts, Stock  # Adjust import path as needed
 
 @pytest.fixture
@@ -46,7 +47,7 @@ def test_optimize_simple_case(simple_parts_and_stocks):
     parts, stocks = simple_parts_and_stocks
     # Ensure a fresh optimizer instance for each test run to avoid overlapping constraint names in PuLP
     cg = ColumnGeneration()
-    patterns = cg.optimize(parts, stocks)
+    patterns, x_values, x_int = cg.optimize(parts, stocks)
     assert any(p['pattern'] == (3, 0) for p in patterns)
     assert any(p['pattern'] == (0, 2) for p in patterns)
     for p in patterns:
@@ -55,6 +56,72 @@ def test_optimize_simple_case(simple_parts_and_stocks):
         assert 'pattern' in p
         assert 'waste' in p
 
+@pytest.mark.parametrize("capacity", [1, 7, 58, 97])
+def test_solve_unbounded_knapsack_engines_agree(capacity):
+    # Engine NumPy harus memberi best_value yang sama dengan DP Python referensi
+    values = [0.31, 0.52, 0.0, 0.77, 1.4]
+    weights = [3, 5, 4, 8, 13]
+    best_py, _ = ColumnGeneration(pricing_engine="python").solve_unbounded_knapsack(values, weights, capacity)
+    best_np, counts = ColumnGeneration(pricing_engine="numpy").solve_unbounded_knapsack(values, weights, capacity)
+    assert best_np == pytest.approx(best_py)
+    assert all(isinstance(c, int) and c >= 0 for c in counts)
+    assert sum(v * c for v, c in zip(values, counts)) == pytest.approx(best_np)
+    assert sum(w * c for w, c in zip(weights, counts)) <= capacity
+
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+def test_solve_unbounded_knapsack_multi_matches_single(engine):
+    # Satu tabel DP sampai max(capacity) harus memberi jawaban yang sama per kapasitas
+    from core.optimizer_strategy.knapsack import solve_unbounded_knapsack, solve_unbounded_knapsack_multi
+    values = [0.31, 0.52, 0.77, 1.4]
+    weights = [3, 5, 8, 13]
+    capacities = [12, 40, 29, 7]
+    shared = solve_unbounded_knapsack_multi(values, weights, capacities, engine=engine)
+    for cap, (best_val, counts) in zip(capacities, shared):
+        single_val, _ = solve_unbounded_knapsack(values, weights, cap, engine=engine)
+        assert best_val == pytest.approx(single_val)
+        assert sum(w * c for w, c in zip(weights, counts)) <= cap
+        assert sum(v * c for v, c in zip(values, counts)) == pytest.approx(best_val)
+
+def test_unknown_pricing_engine_raises():
+    with pytest.raises(ValueError):
+        ColumnGeneration(pricing_engine="fortran")
+
+@pytest.mark.parametrize("backend", ["cbc", "highs"])
+def test_restricted_master_add_column_resolves(backend):
+    from core.optimizer_strategy import restricted_master
+    if backend == "highs" and not restricted_master.highs_available():
+        pytest.skip("highspy not installed")
+    master = restricted_master.RestrictedMaster([4, 2], [10], [10], backend=backend)
+    master.add_column(0, (1, 0))
+    master.add_column(0, (0, 1))
+    assert master.solve() == pytest.approx(60.0)
+    # kolom baru ditambahkan ke model yang sama, lalu re-solve
+    master.add_column(0, (3, 0))
+    assert master.solve() == pytest.approx(10 * (4 / 3 + 2))
+    assert len(master.x_values) == 3
+    assert len(master.duals) == 2
+
+def test_price_patterns_returns_multiple_improving_columns():
+    cg = ColumnGeneration(columns_per_iteration=4)
+    duals = [0.35, 0.6, 0.9]
+    part_lengths = [3, 5, 8]
+    stock_lengths = [10, 12]
+    stock_costs = [1.0, 1.2]
+    new_patterns = cg.price_patterns(duals, part_lengths, stock_lengths, stock_costs, max_columns=4)
+    assert 1 < len(new_patterns) <= 4
+    keys = {(p["stock_index"], p["pattern"]) for p in new_patterns}
+    assert len(keys) == len(new_patterns)
+    for p in new_patterns:
+        used = sum(c * w for c, w in zip(p["pattern"], part_lengths))
+        assert used <= p["stock_length"]
+        assert p["waste"] == p["stock_length"] - used
+        # semua kolom yang ditambahkan harus punya reduced cost negatif
+        value = sum(c * d for c, d in zip(p["pattern"], duals))
+        assert stock_costs[p["stock_index"]] - value < 0
+    # single-column mode tetap memilih pattern dengan reduced cost terbaik
+    best = cg.price_patterns(duals, part_lengths, stock_lengths, stock_costs, max_columns=1)
+    assert best == new_patterns[:1]
+
 def test_generate_trivial_patterns_no_possible_pattern():
     cg = ColumnGeneration()
     parts = [Parts(part_type="A", length=15, quantity=1)]
@@ -68,3 +135,259 @@ def test_optimize_raises_on_no_trivial_patterns():
     stocks = [Stock(length=10, quantity=1)]
     with pytest.raises(ValueError):
         cg.optimize(parts, stocks)
+
+def test_optimize_reports_progress_per_iteration(simple_parts_and_stocks):
+    parts, stocks = simple_parts_and_stocks
+    events = []
+    ColumnGeneration().optimize(parts, stocks, progress_callback=events.append)
+    lp_events = [e for e in events if e["event"] == "lp_iteration"]
+    assert [e["iteration"] for e in lp_events] == list(range(1, len(lp_events) + 1))
+    assert all(e["columns"] >= 2 for e in lp_events)
+    assert events[0]["event"] == "start"
+    assert events[-1]["event"] == "done" and events[-1]["status"] == "feasible"
+
+def test_optimize_stops_when_cancelled(simple_parts_and_stocks):
+    import threading
+    from core.optimizer_strategy import OptimizationCancelled
+    parts, stocks = simple_parts_and_stocks
+    cancel_event = threading.Event()
+    events = []
+
+    def on_progress(event):
+        events.append(event)
+        cancel_event.set()  # cancel setelah iterasi pertama
+
+    with pytest.raises(OptimizationCancelled):
+        ColumnGeneration().optimize(parts, stocks, progress_callback=on_progress, cancel_event=cancel_event)
+    assert len(events) == 1
+
+def test_farley_bound_is_valid_lower_bound():
+    """Bound Farley di setiap iterasi tidak boleh melebihi objective LP optimal."""
+    from core.telemetry import EventRecorder
+    parts = [Parts("A", 45, 9), Parts("B", 36, 7), Parts("C", 31, 12), Parts("D", 14, 5)]
+    stocks = [Stock(100, 50)]
+    recorder = EventRecorder()
+    cg = ColumnGeneration()
+    cg.optimize(parts, stocks, progress_callback=recorder)
+    lp_optimum = recorder.by_event("lp_done")[0]["objective"]
+    for e in recorder.by_event("lp_iteration"):
+        assert e["lower_bound"] <= lp_optimum + 1e-6
+    stats = cg.last_stats
+    assert stats["stop_reason"] == "optimal"
+    assert stats["lower_bound"] == ColumnGeneration.round_up_cost(lp_optimum, 100)
+    assert stats["integer_objective"] >= stats["lower_bound"]
+    assert stats["gap_abs"] == stats["integer_objective"] - stats["lower_bound"]
+
+def test_bound_stop_keeps_solution_quality():
+    parts = [Parts("A", 45, 9), Parts("B", 36, 7), Parts("C", 31, 12), Parts("D", 14, 5)]
+    stocks = [Stock(100, 50)]
+    _, _, x_full = ColumnGeneration().optimize(parts, stocks)
+    cg = ColumnGeneration(bound_stop=True)
+    _, _, x_bound = cg.optimize(parts, stocks)
+    assert sum(x_bound) == sum(x_full)
+    assert cg.last_stats["stop_reason"] in ("bound", "optimal")
+
+def test_time_limit_returns_plan_with_gap(simple_parts_and_stocks):
+    parts, stocks = simple_parts_and_stocks
+    cg = ColumnGeneration(time_limit=0.001)
+    patterns, _, x_int = cg.optimize(parts, stocks)
+    assert sum(x_int) >= 3
+    assert cg.last_stats["stop_reason"] in ("time_limit", "optimal")
+    assert cg.last_stats["gap_rel"] is not None
+
+def test_cost_granularity_and_round_up():
+    assert cost_granularity([6000, 4000]) == 2000
+    assert round_up_cost(4000.0000001, 2000) == 4000
+    assert round_up_cost(4001, 2000) == 6000
+    assert cost_granularity([10.5]) is None
+    assert ColumnGeneration.round_up_cost is round_up_cost
+
+def test_rounded_incumbent_is_feasible_and_trimmed():
+    from core.optimizer_strategy.pattern_pool import PatternPool
+    pool = PatternPool([3, 5], [10])
+    pool.add(0, (3, 0))
+    pool.add(0, (0, 2))
+    pool.add(0, (1, 1))
+    # LP: 1.2 x (3,0) + 0.4 x (0,2) + 1.1 x (1,1) → ceil (2,1,2) punya surplus
+    x = ColumnGeneration.rounded_incumbent(pool, [1.2, 0.4, 1.1], [4, 2], [10])
+    counts = x @ pool.matrix
+    assert (counts >= [4, 2]).all()
+    assert x.sum() < 5
+    assert ColumnGeneration.rounded_incumbent(pool, [1.2, 0.4, 1.1], [4, 2], [2]) is None
+
+def test_integer_master_returns_incumbent_when_cbc_finds_nothing(monkeypatch, simple_parts_and_stocks):
+    import core.optimizer_strategy.column_generation as cg_module
+    parts, stocks = simple_parts_and_stocks
+    cg = ColumnGeneration()
+    patterns = cg.generate_trivial_patterns(parts, stocks)
+    monkeypatch.setattr(cg_module, "_solve_cbc", lambda prob, **kwargs: ("Not Solved", None))
+    x_int, status = cg.solve_integer_master(patterns, [3, 5], [4, 2], [10], [3], [10],
+                                            x_lp=[4 / 3, 1.0], time_limit=0.1, warm_start=True)
+    assert status == "Integer Feasible"
+    assert x_int == [2, 1]
+
+@pytest.mark.parametrize("status", ["Infeasible", "Undefined"])
+def test_time_limited_integer_master_keeps_incumbent_on_any_status(monkeypatch, simple_parts_and_stocks, status):
+    import core.optimizer_strategy.column_generation as cg_module
+    parts, stocks = simple_parts_and_stocks
+    cg = ColumnGeneration()
+    patterns = cg.generate_trivial_patterns(parts, stocks)
+    monkeypatch.setattr(cg_module, "_solve_cbc", lambda prob, **kwargs: (status, None))
+    x_int, result = cg.solve_integer_master(patterns, [3, 5], [4, 2], [10], [3], [10],
+                                            x_lp=[4 / 3, 1.0], time_limit=0.1, warm_start=True)
+    assert (x_int, result) == ([2, 1], "Integer Feasible")
+
+def test_expired_time_limit_gives_cbc_minimum_budget(monkeypatch, simple_parts_and_stocks):
+    import core.optimizer_strategy.column_generation as cg_module
+    parts, stocks = simple_parts_and_stocks
+    budgets = []
+    solve = cg_module._solve_cbc
+
+    def spy(prob, **kwargs):
+        budgets.append(kwargs["time_limit"])
+        return solve(prob, **kwargs)
+
+    monkeypatch.setattr(cg_module, "_solve_cbc", spy)
+    cg = ColumnGeneration(time_limit=1e-6)
+    _, _, x_int = cg.optimize(parts, stocks)
+    assert budgets and all(b >= 1.0 for b in budgets)
+    assert sum(x_int) >= 3
+
+def test_integer_master_reports_bound(simple_parts_and_stocks):
+    parts, stocks = simple_parts_and_stocks
+    cg = ColumnGeneration()
+    patterns = cg.generate_trivial_patterns(parts, stocks)
+    x_int, status = cg.solve_integer_master(patterns, [3, 5], [4, 2], [10], [3], [10],
+                                            x_lp=[4 / 3, 1.0], time_limit=5, gap_rel=0.0, warm_start=True)
+    assert status == "Optimal"
+    assert cg.last_integer_bound == 30
+
+def test_kept_warm_start_files_do_not_rename_problem(monkeypatch, tmp_path):
+    import os
+    import pulp
+    import core.optimizer_strategy.column_generation as cg_module
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(os, "name", "nt")  # jalur Windows: keepFiles=True
+    prob = pulp.LpProblem("Master", pulp.LpMinimize)
+    x = pulp.LpVariable("x", lowBound=0, cat="Integer")
+    prob += 3 * x
+    prob += x >= 2
+    x.setInitialValue(2)
+    names, solve = [], prob.solve
+    monkeypatch.setattr(prob, "solve", lambda solver: names.append(prob.name) or solve(solver))
+    status, bound = cg_module._solve_cbc(prob, warm_start=True)
+    assert (status, bound) == ("Optimal", 6)
+    assert names == ["Master"] and prob.name == "Master"
+    assert list(tmp_path.iterdir()) == []
+
+
+
+def test_solve_bounded_knapsack_respects_bounds():
+    from core.optimizer_strategy.knapsack import solve_bounded_knapsack
+    # unbounded: 3x item 0 (nilai 9); dengan batas 1 → 1x item 0 + 2x item 1
+    best_value, counts = solve_bounded_knapsack([3, 2], [3, 2], [1, 5], 7)
+    assert counts == [1, 2]
+    assert best_value == pytest.approx(7)
+    assert solve_bounded_knapsack([3], [3], [0], 7) == (0.0, [0])
+
+
+def test_residual_rounding_covers_demand_without_cbc(monkeypatch):
+    import numpy as np
+    from core.optimizer_strategy import column_generation
+
+    def no_cbc(*args, **kwargs):
+        raise AssertionError("CBC must not be called in rounding mode")
+
+    monkeypatch.setattr(column_generation, "_solve_cbc", no_cbc)
+    parts = [Parts(chr(65 + i), length, q) for i, (length, q)
+             in enumerate([(45, 9), (36, 7), (31, 12), (14, 5), (27, 8), (22, 6), (19, 11), (53, 4)])]
+    stocks = [Stock(100, None), Stock(80, None)]
+    cg = ColumnGeneration(integer_mode="rounding")
+    patterns, x_values, x_int = cg.optimize(parts, stocks)
+
+    produced = np.asarray(x_int) @ patterns.matrix
+    assert np.all(produced >= [p.quantity for p in parts])
+    assert cg.last_stats["integer_mode"] == "rounding"
+    assert cg.last_stats["integer_objective"] >= cg.last_stats["lower_bound"]
+    # heuristik: paling banyak beberapa batang di atas ceil(LP)
+    assert cg.last_stats["gap_abs"] <= 2 * stocks[0].length
+
+
+def test_residual_rounding_respects_stock_limits():
+    import numpy as np
+    parts = [Parts("A", 40, 5), Parts("B", 30, 4)]
+    stocks = [Stock(100, 2), Stock(70, 10)]
+    cg = ColumnGeneration(integer_mode="rounding")
+    patterns, _, x_int = cg.optimize(parts, stocks)
+    x_int = np.asarray(x_int)
+    assert np.all(x_int @ patterns.matrix >= [5, 4])
+    assert x_int[patterns.stock_index == 0].sum() <= 2
+
+
+def test_unknown_integer_mode_raises():
+    with pytest.raises(ValueError):
+        ColumnGeneration(integer_mode="exact")
+
+
+def test_capacity_compression_is_exact():
+    from core.optimizer_strategy.knapsack import CapacityCompression, reachable_floor
+    assert reachable_floor([4, 6], [9, 13, 3]) == [8, 12, 0]
+
+    compression = CapacityCompression([1250, 2000, 3500], [5800, 6000])
+    assert compression.unit == 250
+    assert compression.weights == [5, 8, 14]
+    assert compression.capacities == [23, 24]  # floor(5800/250) = 23, dan 23 bisa dibentuk (5+5+5+8)
+    assert (compression.raw_capacity, compression.capacity) == (6000, 24)
+
+
+@pytest.mark.parametrize("integer_mode", ["mip", "rounding"])
+def test_compressed_pricing_gives_identical_plan(integer_mode):
+    import numpy as np
+    # panjang dengan unit halus (input 1 desimal, scale x10)
+    parts = [Parts("A", 14500, 9), Parts("B", 9000, 14), Parts("C", 21250, 5)]
+    stocks = [Stock(58000, None), Stock(40000, 6)]
+    plain = ColumnGeneration(compress_capacity=False, integer_mode=integer_mode)
+    compressed = ColumnGeneration(integer_mode=integer_mode)
+    pool_a, _, x_a = plain.optimize(parts, stocks)
+    pool_b, _, x_b = compressed.optimize(parts, stocks)
+    assert np.array_equal(pool_a.matrix, pool_b.matrix) and list(x_a) == list(x_b)
+    assert compressed.last_stats["capacity_unit"] == 250
+    assert compressed.last_stats["dp_capacity"] == 232  # vs 58000
+    assert plain.last_stats["dp_capacity"] == plain.last_stats["dp_capacity_raw"] == 58000
+
+
+@pytest.mark.parametrize("dual_smoothing", ["auto", 0.7])
+def test_dual_smoothing_keeps_lp_optimum(dual_smoothing):
+    from core.telemetry import EventRecorder
+    parts = [Parts(chr(65 + i), length, q) for i, (length, q)
+             in enumerate([(45, 9), (36, 7), (31, 12), (14, 5), (27, 8), (22, 6), (19, 11), (53, 4)])]
+    stocks = [Stock(100, None), Stock(80, None)]
+    plain = ColumnGeneration(dual_smoothing=None)
+    plain.optimize(parts, stocks)
+    recorder = EventRecorder()
+    smoothed = ColumnGeneration(dual_smoothing=dual_smoothing)
+    smoothed.optimize(parts, stocks, progress_callback=recorder)
+
+    stats = smoothed.last_stats
+    assert stats["stop_reason"] == "optimal"
+    assert stats["lp_objective"] == pytest.approx(plain.last_stats["lp_objective"])
+    assert stats["pricing_calls"] == stats["lp_iterations"] + stats["mispricings"]
+    for e in recorder.by_event("lp_iteration"):
+        assert e["lower_bound"] <= stats["lp_objective"] + 1e-6
+    assert plain.last_stats["mispricings"] == 0
+    assert plain.last_stats["pricing_calls"] == plain.last_stats["lp_iterations"]
+
+
+def test_adjust_smoothing_alpha_follows_subgradient():
+    pattern = {"stock_index": 0, "pattern": (1, 0)}
+    # subgradient (demands - n_bars * pattern) = (-1, 2); duals RMP searah → alpha turun
+    assert ColumnGeneration.adjust_smoothing_alpha(0.5, [0.0, 1.0], [0.0, 0.0], [1, 2], pattern, 2) == pytest.approx(0.4)
+    # berlawanan arah → smoothing dipertahankan / diperkuat
+    assert ColumnGeneration.adjust_smoothing_alpha(0.5, [1.0, 0.0], [0.0, 0.0], [1, 2], pattern, 2) == pytest.approx(0.55)
+
+
+def test_invalid_dual_smoothing_raises():
+    assert ColumnGeneration().dual_smoothing is None  # opt-in
+    for value in (1.0, -0.1, "wentges"):
+        with pytest.raises(ValueError):
+            ColumnGeneration(dual_smoothing=value)
@@ -0,0 +1,34 @@
+import numpy as np
+from core.optimizer_strategy.pattern_pool import PatternPool
+
+def test_pattern_pool_add_and_dict_view():
+    pool = PatternPool(part_lengths=[3, 5], stock_lengths=[10, 12], capacity=1)
+    assert pool.add(0, (3, 0)) == 0
+    assert pool.add(1, (1, 1)) == 1  # memaksa pool tumbuh (capacity awal 1)
+    assert len(pool) == 2
+    assert pool[0] == {"stock_index": 0, "stock_length": 10, "pattern": (3, 0), "waste": 1}
+    assert pool[-1] == {"stock_index": 1, "stock_length": 12, "pattern": (1, 1), "waste": 4}
+    assert all(isinstance(c, int) for c in pool[0]["pattern"])
+    np.testing.assert_array_equal(pool.matrix, [[3, 0], [1, 1]])
+    np.testing.assert_array_equal(pool.waste, [1, 4])
+    np.testing.assert_array_equal(pool.costs([10, 12]), [10.0, 12.0])
+
+def test_pattern_pool_duplicate_detection():
+    pool = PatternPool(part_lengths=[3, 5], stock_lengths=[10, 12])
+    pool.add(0, (1, 1))
+    # pattern sama di stock yang sama → duplikat; di stock lain → kolom berbeda
+    assert pool.add(0, [1, 1]) is None
+    assert pool.find(0, (1, 1)) == 0
+    assert pool.add(1, (1, 1)) == 1
+    assert pool.find(0, (2, 0)) is None
+    assert len(pool) == 2
+
+def test_pattern_pool_from_dict_list_keeps_indices():
+    patterns = [
+        {"stock_index": 0, "stock_length": 10, "pattern": (3, 0), "waste": 1},
+        {"stock_index": 0, "stock_length": 10, "pattern": (3, 0), "waste": 1},
+        {"stock_index": 0, "stock_length": 10, "pattern": (0, 2), "waste": 0},
+    ]
+    pool = PatternPool.from_patterns(patterns, part_lengths=[3, 5])
+    assert len(pool) == 3
+    assert pool == patterns
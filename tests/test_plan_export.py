@@ -0,0 +1,88 @@
+import csv
+import gzip
+import numpy as np
+import pytest
+from core.entities import Parts
+from core.compatible_export import export_pattern_summary
+from core.optimizer_strategy.pattern_pool import PatternPool
+from core.plan_export import CutPlan, TRACE_COLUMNS, iter_cut_trace_arrays, write_cut_trace
+
+
+@pytest.fixture
+def plan_inputs():
+    parts = [Parts("A", 300, 9), Parts('B,"x"', 250, 4), Parts("C", 120, 7)]
+    pool = PatternPool([300, 250, 120], [1000, 800])
+    pool.add(0, (3, 0, 0))
+    pool.add(0, (1, 2, 1))
+    pool.add(1, (0, 1, 4))
+    pool.add(1, (2, 0, 1))  # x = 0 → tidak diekspor
+    return pool, [2, 1.5, 3, 0], parts
+
+
+def _reference_rows(pool, x_values, parts):
+    """Layout lama (loop pattern x instance x quantity), termasuk quirk leftover per part type."""
+    rows = []
+    for j, x in enumerate(x_values):
+        p = pool[j]
+        n, frac = int(np.floor(x)), x - np.floor(x)
+        source = "main" if p["stock_index"] == 0 else f"stock_{p['stock_index']}"
+        used = [i for i, q in enumerate(p["pattern"]) if q]
+        for inst in range(n):
+            for i in used:
+                for q in range(p["pattern"][i]):
+                    rows.append([f"P{j+1}", f"P{j+1}_{inst+1}", source, p["stock_length"], parts[i].part_type,
+                                 parts[i].length, p["waste"] if q == p["pattern"][i] - 1 else 0])
+        if frac > 1e-6:
+            for i in used:
+                rows.append([f"P{j+1}_frac", f"P{j+1}_frac", source, p["stock_length"], parts[i].part_type,
+                             parts[i].length, p["waste"]])
+    return [[str(v) for v in row] for row in rows]
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 5, 65536])
+def test_csv_trace_keeps_legacy_layout(tmp_path, plan_inputs, chunk_rows):
+    pool, x_values, parts = plan_inputs
+    paths = export_pattern_summary(None, pool, x_values, parts, str(tmp_path), chunk_rows=chunk_rows)
+    with open(paths["cut_trace_detail"], newline="") as f:
+        raw = f.read()
+    assert raw.count("\r\n") == raw.count("\n")  # line terminator csv.writer
+    rows = list(csv.reader(raw.splitlines()))
+    assert rows[0] == list(TRACE_COLUMNS)
+    assert rows[1:] == _reference_rows(pool, x_values, parts)
+    assert CutPlan(pool, x_values, parts).n_rows() == len(rows) - 1
+
+
+def test_gzip_csv_matches_plain_csv(tmp_path, plan_inputs):
+    plan = CutPlan(*plan_inputs)
+    plain = write_cut_trace(plan, str(tmp_path), "csv")
+    packed = write_cut_trace(plan, str(tmp_path), "csv.gz", chunk_rows=3)
+    with open(plain, "rb") as f, gzip.open(packed, "rb") as g:
+        assert f.read() == g.read()
+
+
+def test_array_chunks_are_bounded(plan_inputs):
+    plan = CutPlan(*plan_inputs)
+    chunks = list(iter_cut_trace_arrays(plan, chunk_rows=4))
+    assert len(chunks) > 1
+    assert all(len(c["leftover"]) <= 4 + 5 for c in chunks)  # blok satu batang tidak dipecah
+    assert sum(len(c["leftover"]) for c in chunks) == plan.n_rows()
+
+
+@pytest.mark.parametrize("trace_format", ["parquet", "arrow"])
+def test_columnar_export_matches_csv(tmp_path, plan_inputs, trace_format):
+    pa = pytest.importorskip("pyarrow")
+    plan = CutPlan(*plan_inputs)
+    path = write_cut_trace(plan, str(tmp_path), trace_format, chunk_rows=4)
+    if trace_format == "parquet":
+        import pyarrow.parquet as pq
+        table = pq.read_table(path)
+    else:
+        table = pa.ipc.open_file(path).read_all()
+    assert table.column_names == list(TRACE_COLUMNS)
+    rows = [[str(v) for v in row] for row in zip(*(table.column(c).to_pylist() for c in TRACE_COLUMNS))]
+    assert rows == _reference_rows(*plan_inputs)
+
+
+def test_unknown_trace_format_raises(tmp_path, plan_inputs):
+    with pytest.raises(ValueError):
+        write_cut_trace(CutPlan(*plan_inputs), str(tmp_path), "xlsx")
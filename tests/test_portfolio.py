@@ -0,0 +1,129 @@
+import os
+import subprocess
+import sys
+import textwrap
+import time
+import numpy as np
+import pytest
+from core.entities import Parts, Stock
+from core.optimizer_service import OptimizerService
+from core.optimizer_strategy import (
+    ColumnGeneration, ModifiedFirstFitDecreasing, OptimizationCancelled, OptimizerStrategy, Portfolio
+)
+from core.telemetry import EventRecorder
+
+
+class SlowStrategy(OptimizerStrategy):
+    """Tidak pernah selesai sendiri; hanya berhenti lewat cancel_event."""
+
+    def optimize(self, required_parts_aggregated, stocks_aggregated,
+                 progress_callback=None, cancel_event=None):
+        while not cancel_event.is_set():
+            time.sleep(0.01)
+        raise OptimizationCancelled("cancelled")
+
+
+class FailingStrategy(OptimizerStrategy):
+    def optimize(self, required_parts_aggregated, stocks_aggregated,
+                 progress_callback=None, cancel_event=None):
+        raise RuntimeError("boom")
+
+
+def test_portfolio_picks_cheapest_plan_and_stops_at_optimal():
+    # FFD 15 batang, CG + rounding 14 batang = ceil(LP) → CG menang dan terbukti optimal
+    parts = [Parts("A", 21, 13), Parts("B", 38, 7), Parts("C", 47, 9), Parts("D", 33, 6), Parts("E", 18, 10)]
+    stocks = [Stock(100, None)]
+    recorder = EventRecorder(["portfolio_result", "done"])
+    portfolio = Portfolio([ModifiedFirstFitDecreasing(), ColumnGeneration(integer_mode="rounding"),
+                           SlowStrategy()])
+    patterns, x_values, x_int = portfolio.optimize(parts, stocks, progress_callback=recorder)
+
+    stats = portfolio.last_stats
+    assert stats["winner_name"] == "ColumnGeneration"
+    assert stats["stop_reason"] == "optimal"
+    assert stats["results"][2]["status"] == "cancelled"
+    assert np.all(np.asarray(x_int) @ patterns.matrix >= [p.quantity for p in parts])
+    assert stats["integer_objective"] == min(r["objective"] for r in stats["results"] if r["objective"])
+    assert recorder.events[-1]["event"] == "done"
+    portfolio.last_reaper.join(timeout=5)
+    assert not portfolio.last_reaper.is_alive()
+
+
+def test_portfolio_time_limit_returns_finished_strategies():
+    # 3 batang vs lower bound panjang 2 batang: tidak pernah "optimal", jadi time_limit yang menghentikan
+    parts, stocks = [Parts("A", 600, 3)], [Stock(1000, None)]
+    portfolio = Portfolio([SlowStrategy(), FailingStrategy(), ModifiedFirstFitDecreasing()], time_limit=1.0)
+    patterns, _, x_int = portfolio.optimize(parts, stocks)
+    statuses = [r["status"] for r in portfolio.last_stats["results"]]
+    assert statuses == ["cancelled", "error", "ok"]
+    assert portfolio.last_stats["winner"] == 2
+    assert portfolio.last_stats["stop_reason"] == "time_limit"
+    assert sum(x_int) == 3
+
+
+def test_portfolio_without_feasible_plan_raises():
+    with pytest.raises(RuntimeError):
+        Portfolio([FailingStrategy()]).optimize([Parts("A", 400, 1)], [Stock(1000, None)])
+
+
+def test_service_portfolio_mode():
+    service = OptimizerService()
+    portfolio = service.set_portfolio(time_limit=5)
+    assert service.strategy is portfolio
+    assert [name for name, _ in portfolio.get_params()["strategies"]] == [
+        "ColumnGeneration", "ColumnGeneration", "ModifiedFirstFitDecreasing"]
+    _, _, x_int = service.solve([Parts("A", 400, 5)], [Stock(1000, None)])
+    assert sum(x_int) == 3
+
+
+LOSER_WITH_CHILD = textwrap.dedent("""
+    import os, subprocess, sys, time
+    from core.entities import Parts, Stock
+    from core.optimizer_strategy import ModifiedFirstFitDecreasing, OptimizerStrategy, Portfolio
+
+    PIDFILE = sys.argv[1]
+
+    class SolverWithChild(OptimizerStrategy):
+        # seperti CBC: child process yang masih jalan saat strategy kalah
+        def optimize(self, parts, stocks, progress_callback=None, cancel_event=None):
+            child = subprocess.Popen(["sleep", "27"])
+            with open(PIDFILE, "w") as f:
+                f.write(str(child.pid))
+            child.wait()
+
+    class FFDAfterChild(ModifiedFirstFitDecreasing):
+        def optimize(self, *args, **kwargs):
+            while not os.path.exists(PIDFILE):
+                time.sleep(0.01)
+            return super().optimize(*args, **kwargs)
+
+    portfolio = Portfolio([SolverWithChild(), FFDAfterChild()])
+    portfolio.optimize([Parts("A", 500, 2)], [Stock(1000, None)])
+    assert portfolio.last_stats["stop_reason"] == "optimal"
+""")
+
+
+def _running(pid):
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"  # zombie = sudah selesai
+    except OSError:
+        return False
+
+
+@pytest.mark.skipif(not hasattr(os, "killpg") or not os.path.isdir("/proc"), reason="POSIX process groups")
+def test_loser_solver_child_does_not_outlive_interpreter(tmp_path):
+    """Exit langsung setelah optimize (reaper belum selesai) tidak boleh meninggalkan child strategy kalah."""
+    script, pidfile = tmp_path / "run.py", tmp_path / "child.pid"
+    script.write_text(LOSER_WITH_CHILD)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root)
+    subprocess.run([sys.executable, str(script), str(pidfile)], env=env, check=True, timeout=60)
+    pid = int(pidfile.read_text())
+    deadline = time.perf_counter() + 5
+    while _running(pid) and time.perf_counter() < deadline:
+        time.sleep(0.05)
+    alive = _running(pid)
+    if alive:
+        os.kill(pid, 9)
+    assert not alive
@@ -0,0 +1,66 @@
+import os
+import pytest
+from core.solution_cache import SolutionCache
+from core.optimizer_strategy import ColumnGeneration
+from core.entities import Parts, Stock
+
+@pytest.fixture
+def parts_and_stocks():
+    parts = [
+        Parts(part_type="A", length=3, quantity=4),
+        Parts(part_type="B", length=5, quantity=2),
+    ]
+    stocks = [
+        Stock(length=10, quantity=3),
+        Stock(length=12, quantity=5),
+    ]
+    patterns = [
+        {"stock_index": 0, "stock_length": 10, "pattern": (3, 0), "waste": 1},
+        {"stock_index": 1, "stock_length": 12, "pattern": (1, 1), "waste": 4},
+    ]
+    return parts, stocks, patterns
+
+def test_cache_hit_across_instances(tmp_path, parts_and_stocks):
+    """Hasil yang disimpan harus terbaca lagi dari instance cache baru (restart proses)."""
+    parts, stocks, patterns = parts_and_stocks
+    strategy = ColumnGeneration()
+    SolutionCache(tmp_path).put(parts, stocks, 1, strategy, patterns, [1.5, 2.0], [2, 2])
+
+    cached = SolutionCache(tmp_path).get(parts, stocks, 1, strategy)
+    assert cached is not None
+    cached_patterns, x_values, x_int = cached
+    assert cached_patterns == patterns
+    assert x_values == [1.5, 2.0]
+    assert x_int == [2, 2]
+
+def test_cache_hit_on_reordered_input(tmp_path, parts_and_stocks):
+    """Urutan parts/stocks berbeda → key sama, pattern dipetakan ke urutan pemanggil."""
+    parts, stocks, patterns = parts_and_stocks
+    strategy = ColumnGeneration()
+    cache = SolutionCache(tmp_path)
+    cache.put(parts, stocks, 1, strategy, patterns, [1.5, 2.0], [2, 2])
+
+    parts_rev = list(reversed(parts))
+    stocks_rev = list(reversed(stocks))
+    cached_patterns, _, x_int = cache.get(parts_rev, stocks_rev, 1, strategy)
+    assert x_int == [2, 2]
+    assert cached_patterns[0] == {"stock_index": 1, "stock_length": 10, "pattern": (0, 3), "waste": 1}
+    assert cached_patterns[1] == {"stock_index": 0, "stock_length": 12, "pattern": (1, 1), "waste": 4}
+
+def test_cache_miss_on_different_params(tmp_path, parts_and_stocks):
+    parts, stocks, patterns = parts_and_stocks
+    cache = SolutionCache(tmp_path)
+    cache.put(parts, stocks, 1, ColumnGeneration(), patterns, [1.5, 2.0], [2, 2])
+    assert cache.get(parts, stocks, 10, ColumnGeneration()) is None
+    assert cache.get(parts, stocks, 1, ColumnGeneration(columns_per_iteration=5)) is None
+
+def test_cache_evicts_least_recently_used(tmp_path, parts_and_stocks):
+    parts, stocks, patterns = parts_and_stocks
+    strategy = ColumnGeneration()
+    cache = SolutionCache(tmp_path, max_bytes=1)
+    cache.put(parts, stocks, 1, strategy, patterns, [1.5, 2.0], [2, 2])
+    cache.put(parts, stocks, 10, strategy, patterns, [1.5, 2.0], [2, 2])
+    # batas ukuran sangat kecil → hanya entry terbaru yang tersisa
+    assert len([n for n in os.listdir(tmp_path) if n.endswith(".json")]) == 1
+    assert cache.get(parts, stocks, 1, strategy) is None
+    assert cache.get(parts, stocks, 10, strategy) is not None
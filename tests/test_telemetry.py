@@ -0,0 +1,51 @@
+import json
+from core.optimizer_strategy import ColumnGeneration
+from core.telemetry import Telemetry, EventRecorder, ConsoleReporter
+from core.entities import Parts, Stock
+
+def _solve(callback=None):
+    parts = [Parts("A", 3, 4), Parts("B", 5, 2)]
+    stocks = [Stock(10, 3), Stock(12, 5)]
+    return ColumnGeneration().optimize(parts, stocks, progress_callback=callback)
+
+def test_optimize_is_silent_without_subscribers(capsys):
+    _solve()
+    assert capsys.readouterr().out == ""
+
+def test_event_stream_has_timestamps_and_phase_metrics(tmp_path):
+    recorder = EventRecorder()
+    _solve(Telemetry([recorder]))
+
+    elapsed = [e["elapsed"] for e in recorder.events]
+    assert elapsed == sorted(elapsed)
+    iterations = recorder.by_event("lp_iteration")
+    assert iterations
+    for e in iterations:
+        assert e["master_time"] >= 0 and e["pricing_time"] >= 0
+        assert e["columns_added"] == len(e["patterns"])
+    # iterasi terakhir tidak menemukan pattern improving
+    assert iterations[-1]["best_reduced_cost"] is None
+    assert all(e["best_reduced_cost"] < 0 for e in iterations[:-1])
+    assert recorder.by_event("lp_done")[0]["converged"]
+    assert recorder.by_event("integer_result")[-1]["feasible"]
+
+    path = tmp_path / "trace.jsonl"
+    recorder.to_jsonl(path)
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [e["event"] for e in lines] == [e["event"] for e in recorder.events]
+
+def test_console_reporter_is_opt_in(capsys):
+    _solve(ConsoleReporter())
+    out = capsys.readouterr().out
+    assert "Iteration 1: LP Objective" in out
+    assert "feasible" in out
+
+def test_console_reporter_names_lp_stop_reason(capsys):
+    reporter = ConsoleReporter()
+    for reason, converged in [("optimal", True), ("bound", True), ("time_limit", False), ("max_iterations", False)]:
+        reporter({"event": "lp_done", "objective": 12.0, "columns": 4, "converged": converged, "reason": reason})
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].startswith("LP relaxation optimal")
+    assert "lower bound" in lines[1]
+    assert "time limit" in lines[2]
+    assert lines[3].startswith("Reached LP max iterations.")
@@ -0,0 +1,69 @@
+import numpy as np
+from core.entities import Parts
+from core.optimizer_strategy.pattern_pool import PatternPool
+from core.plan_export import CutPlan
+from gui.virtual_views import TableModel, bar_window, scroll_window
+
+
+def test_table_model_sorts_and_filters_on_arrays():
+    model = TableModel(("_i", "Type", "Length"), {
+        "_i": range(5),
+        "Type": ["Beam", "post", "BEAM-2", "rail", "beam"],
+        "Length": [900, 1200, 900, 300, 1450],
+    })
+    assert model.rows(0, 2) == [(0, "Beam", 900), (1, "post", 1200)]
+
+    model.sort("Length")
+    assert [r[0] for r in model.rows(0, 5)] == [3, 0, 2, 1, 4]
+    model.sort("Length")  # klik kedua: descending, baris dengan panjang sama tetap urut asli
+    assert [r[0] for r in model.rows(0, 5)] == [4, 1, 0, 2, 3]
+
+    model.filter("beam")  # case-insensitive, sort tetap berlaku
+    assert [r[0] for r in model.rows(0, 10)] == [4, 0, 2]
+    model.filter("900")   # kolom numerik juga bisa dicari
+    assert len(model) == 2
+    model.filter("")
+    assert len(model) == 5
+
+
+def test_scroll_window_stays_inside_data():
+    assert scroll_window(0, 1000, 20, "scroll", 3, "units") == 3
+    assert scroll_window(10, 1000, 20, "scroll", -1, "pages") == 0
+    assert scroll_window(0, 1000, 20, "moveto", "0.5") == 500
+    assert scroll_window(0, 1000, 20, "moveto", "1.0") == 980
+    assert scroll_window(0, 5, 20, "scroll", 1, "units") == 0
+
+
+def test_bar_window_maps_visible_bars_to_patterns():
+    parts = [Parts("A", 400, 7), Parts("B", 300, 4)]
+    pool = PatternPool([400, 300], [1000])
+    pool.add(0, (2, 0))
+    pool.add(0, (0, 3))
+    pool.add(0, (1, 2))
+    rows = CutPlan(pool, [3, 0, 1.5], parts).pattern_rows()
+    assert [(r["pattern_id"], r["bars"], r["waste"]) for r in rows] == [("P1", 3, 200), ("P3", 2, 0)]
+    assert rows[1]["cuts"] == [("A", 400), ("B", 300), ("B", 300)]
+
+    ends = np.cumsum([r["bars"] for r in rows])
+    assert bar_window(ends, 2, 10) == [(2, 0), (3, 1), (4, 1)]
+    assert bar_window(ends, 5, 10) == []
+
+
+def test_background_export_error_reaches_status_bar():
+    from concurrent.futures import Future
+    from gui.app_gui import CuttingListApp
+
+    class Var:  # pengganti tk.StringVar (test tanpa display)
+        value = ""
+        def set(self, value): self.value = value
+        def get(self): return self.value
+
+    app = CuttingListApp.__new__(CuttingListApp)  # tanpa Tk root
+    app.status_var, app.result = Var(), [{}, {}]
+    app.export_future = Future()
+    assert app._check_export() is True  # writer thread masih jalan
+
+    app.export_future.set_exception(OSError("disk full"))
+    assert app._check_export() is False
+    assert app.status_var.get() == "Done: 2 patterns | export failed: disk full"
+    assert app.export_future is None